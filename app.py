@@ -1,16 +1,48 @@
+import os
 from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
 from config import Config
 from models import db, init_models
 from schemas import ma
 
-def create_app():
+def verifier_migrations():
+    """Avertit si la base n'est pas à la dernière révision Alembic"""
+    try:
+        from alembic.config import Config as AlembicConfig
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+    except ImportError:
+        print("[WARNING] Alembic non installé : version du schéma non vérifiée")
+        return
+    
+    racine = os.path.dirname(os.path.abspath(__file__))
+    alembic_cfg = AlembicConfig(os.path.join(racine, 'alembic.ini'))
+    alembic_cfg.set_main_option('script_location', os.path.join(racine, 'migrations'))
+    attendues = set(ScriptDirectory.from_config(alembic_cfg).get_heads())
+    
+    with db.engine.connect() as connexion:
+        actuelles = set(MigrationContext.configure(connexion).get_current_heads())
+    
+    if actuelles != attendues:
+        print(f"[WARNING] Schéma à la révision {sorted(actuelles) or 'aucune'}, "
+              f"attendu {sorted(attendues)} : lancer 'alembic upgrade head'")
+    else:
+        print("✅ Base de données à jour (migrations Alembic)")
+
+def create_app(config=None):
+    """config : valeurs qui remplacent celles de Config (tests, scripts)"""
     app = Flask(__name__, static_folder='static', static_url_path='')
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
     
     # Activer CORS pour les requêtes frontend
     CORS(app)
     
+    # Pool de connexions (DB_POOL_*), sauf si SQLALCHEMY_ENGINE_OPTIONS est fourni
+    from services.db_pool import options_moteur, instrumenter
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', options_moteur(app.config))
+    
     # Initialiser les extensions
     db.init_app(app)
     ma.init_app(app)
@@ -19,13 +51,56 @@ def create_app():
     with app.app_context():
         # Importer les modèles AVANT de créer les tables
         init_models()
-        db.create_all()
-        print("✅ Base de données initialisée")
+        instrumenter(db.engine)
+        
+        # Latences, statuts, requêtes en cours et SQL par route -> /metrics
+        from services import metrics
+        metrics.init_app(app, db.engine)
+        
+        # Garde-fou N+1 : nombre d'instructions SQL par requête (@budget_requetes)
+        from services.utils import query_budget
+        query_budget.init_app(app, db.engine)
+        
+        if app.config['DB_AUTO_CREATE']:
+            db.create_all()
+            
+            # Index plein texte des candidats (tsvector/GIN ou FTS5)
+            from services.search_service import SearchService
+            SearchService.initialiser()
+            
+            # Compteurs de suppressions des tables (ETag des listes)
+            from services.utils.etag import initialiser_versions
+            initialiser_versions()
+            print("✅ Base de données initialisée")
+        else:
+            # Production : le schéma est créé et mis à jour par les migrations Alembic
+            verifier_migrations()
     
     # Enregistrer les blueprints APRÈS l'initialisation des modèles
     from routes import register_blueprints
     register_blueprints(app)
     
+    # Sans jeton, les routes d'exploitation ne sont ouvertes qu'hors production
+    from services.utils.acces_interne import jeton_requis
+    if jeton_requis(app.config) and not app.config['INTERNAL_STATS_TOKEN']:
+        print("[WARNING]  INTERNAL_STATS_TOKEN vide : /api/internal/* et /metrics désactivés")
+    
+    # Commande `flask seed` : données synthétiques pour les tests de charge
+    from services import seed_service
+    seed_service.init_app(app)
+    
+    # Commande `flask recalculer-scores` : scores des candidatures existantes
+    from services import match_score_service
+    match_score_service.init_app(app)
+    
+    # Commande `flask indexer-competences` : reconstruction de l'index des compétences
+    from services import skill_index_service
+    skill_index_service.init_app(app)
+    
+    # File des jobs d'analyse (JOBS_*) et commande `flask jobs-worker`
+    from services import analysis_jobs
+    analysis_jobs.init_app(app)
+    
     # ========== GESTIONNAIRES D'ERREURS ==========
     @app.errorhandler(404)
     def not_found(error):
@@ -77,10 +152,26 @@ def create_app():
             "status": "running",
             "endpoints": {
                 "POST /api/candidates": "Créer un candidat",
+                "GET /api/candidates/search?q=": "Recherche plein texte des candidats",
+                "GET /api/candidates/<id>/recommended-offers": "Offres recommandées pour un candidat",
                 "POST /api/offers": "Créer une offre",
                 "POST /api/apply": "Soumettre une candidature",
                 "GET /api/offers/<id>/candidates": "Liste des candidats d'une offre",
-                "POST /api/offers/<id>/analyze-match": "Analyser compatibilité avec IA"
+                "GET /api/offers/stats": "Statistiques agrégées des offres (comptes, histogrammes)",
+                "GET /api/offers/<id>/stats": "Statistiques d'une offre (candidatures par jour, scores)",
+                "GET /api/offers/<id>/suggested-candidates": "Candidats suggérés par compétences",
+                "GET /api/offers/<id>/similar-candidates": "Candidats les plus proches (TF-IDF)",
+                "POST /api/offers/<id>/analyze-match": "Analyser compatibilité avec IA",
+                "POST /api/offers/<id>/analyze-batch": "Analyser plusieurs candidats en parallèle",
+                "POST /api/offers/<id>/analyze-match?async=1": "Analyse en arrière-plan (202 + job)",
+                "GET /api/jobs/<id>": "Statut et résultat d'un job d'analyse",
+                "POST /api/offers/<id>/rank-candidates": "Classer tous les candidats d'une offre",
+                "GET /api/ai/cache/stats": "Statistiques du cache d'analyses IA",
+                "GET /api/ai/breaker": "État du disjoncteur Gemini",
+                "GET /api/ai/tfidf": "État du moteur TF-IDF",
+                "GET /api/internal/db/pool": "État et métriques du pool de connexions",
+                "GET /metrics": "Métriques Prometheus (latences, statuts, SQL, sources IA)",
+                "GET /api/export/<entity>": "Export en flux NDJSON/CSV (candidates, offers, candidatures)"
             }
         }), 200
     
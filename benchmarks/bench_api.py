@@ -0,0 +1,369 @@
+"""
+Benchmark de toutes les routes de l'API (candidats, offres, candidatures)
+
+Construit l'application avec create_app sur une base SQLite temporaire (ou
+la base de --database-url, PostgreSQL compris), la remplit par paliers
+(1k, 100k, 1M candidats ; 10 fois moins d'offres ; données de
+SeedService, comme `flask seed`) et mesure pour chaque route p50/p95/p99 et requêtes/s, ainsi
+que AIService._fallback_analysis seul. Les résultats sont écrits en JSON ;
+avec --reference, un p95 plus lent que la référence de plus de --seuil
+est une régression (code de sortie 1).
+
+Les requêtes passent par le client de test Flask (pas de réseau) : la
+mesure couvre routage, SQL, sérialisation, sans serveur WSGI.
+
+Usage :
+  python -m benchmarks.bench_api --tailles 1000,100000 --sortie bench.json
+  python -m benchmarks.bench_api --reference bench.json --seuil 0.2
+  python -m benchmarks.bench_api --database-url postgresql://... --tailles 1000000
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# ========== Données ==========
+
+def remplir(actuel, cible, graine=42):
+    """
+    Ajoute cible - actuel candidats (et 10 fois moins d'offres) avec
+    SeedService, à la suite des lignes existantes. Retourne les plages
+    d'identifiants créées : (candidats, offres)
+    """
+    from services.seed_service import SeedService
+
+    candidats = cible - actuel
+    offres = max(cible // 10, 1) - (max(actuel // 10, 1) if actuel else 0)
+    stats = SeedService.peupler(candidats, offres, graine)
+    premier_candidat, premier_offre = stats["premiers_ids"]
+    plages = range(premier_candidat, premier_candidat + candidats), range(premier_offre, premier_offre + offres)
+    verifier_plages(*plages)
+    return plages
+
+
+def verifier_plages(candidats, offres):
+    """
+    Chaque identifiant des plages remplies doit exister : un palier dont les
+    ids chevauchent des lignes créées ou supprimées par les scénarios
+    mesurerait des 404 au lieu des routes.
+    """
+    from sqlalchemy import func
+    from models import db
+    from models.candidat import Candidat
+    from models.offre_emploi import OffreEmploi
+
+    for modele, plage in ((Candidat, candidats), (OffreEmploi, offres)):
+        if not plage:
+            continue
+        trouves = db.session.query(func.count(modele.id)).filter(
+            modele.id >= plage.start, modele.id < plage.stop
+        ).scalar()
+        if trouves != len(plage):
+            raise RuntimeError(
+                f"{modele.__tablename__} : {trouves} lignes dans les ids {plage.start}..{plage.stop - 1}, "
+                f"{len(plage)} attendues"
+            )
+
+
+def tirage(rng, plages):
+    """Identifiant tiré uniformément parmi des plages d'identifiants (lignes remplies)"""
+    tailles = [len(plage) for plage in plages]
+    return lambda: rng.choice(rng.choices(plages, weights=tailles)[0])
+
+
+# ========== Routes mesurées ==========
+
+def scenarios(candidats_remplis, offres_remplies, compteur):
+    """
+    (nom, méthode, url(i, ids), corps(i, ids), preparation) pour chaque route
+    des trois blueprints. `preparation(client)` crée, avant la mesure, une
+    ligne par itération (PUT, DELETE, candidatures) et renvoie son id :
+    chaque itération travaille sur sa propre ligne et réussit.
+    """
+    rng = random.Random(7)
+    candidat = tirage(rng, candidats_remplis)
+    offre = tirage(rng, offres_remplies)
+
+    def nouveau_candidat(*_):
+        return {
+            "nom": "Candidat Bench", "email": f"bench{next(compteur)}@exemple.com",
+            "bio": "Développeuse Python Flask Docker, cinq ans d'expérience en API REST",
+            "diplome": "Master en Informatique"
+        }
+
+    def nouvelle_offre(*_):
+        return {
+            "titre": "Développeur Python", "description": "Équipe produit, API REST et déploiement continu",
+            "competences": ["Python", "Flask", "Docker"], "salaire": 900000
+        }
+
+    def creer_candidat(client):
+        return client.post('/api/candidates', json=nouveau_candidat()).get_json()["candidat"]["id"]
+
+    def creer_offre(client):
+        return client.post('/api/offers', json=nouvelle_offre()).get_json()["offre"]["id"]
+
+    return [
+        # candidat_routes
+        ("GET /api/candidates", 'GET', lambda i, ids: '/api/candidates', None, None),
+        ("GET /api/candidates?total=1", 'GET', lambda i, ids: '/api/candidates?total=1', None, None),
+        ("GET /api/candidates?fields=id,nom", 'GET',
+         lambda i, ids: '/api/candidates?fields=id,nom&limit=200', None, None),
+        ("GET /api/candidates/search", 'GET', lambda i, ids: '/api/candidates/search?q=python docker', None, None),
+        ("GET /api/candidates/<id>", 'GET', lambda i, ids: f'/api/candidates/{candidat()}', None, None),
+        ("GET /api/candidates/<id>/recommended-offers", 'GET',
+         lambda i, ids: f'/api/candidates/{candidat()}/recommended-offers', None, None),
+        ("POST /api/candidates", 'POST', lambda i, ids: '/api/candidates', nouveau_candidat, None),
+        ("PUT /api/candidates/<id>", 'PUT', lambda i, ids: f'/api/candidates/{ids[i]}',
+         lambda i, ids: {"bio": f"Profil mis à jour {i} : Python, Kubernetes et AWS"}, creer_candidat),
+        ("DELETE /api/candidates/<id>", 'DELETE', lambda i, ids: f'/api/candidates/{ids[i]}', None, creer_candidat),
+        ("POST /api/candidates/bulk (100)", 'POST', lambda i, ids: '/api/candidates/bulk',
+         lambda i, ids: [nouveau_candidat() for _ in range(100)], None),
+        # offre_routes
+        ("GET /api/offers", 'GET', lambda i, ids: '/api/offers', None, None),
+        ("GET /api/offers?total=1", 'GET', lambda i, ids: '/api/offers?total=1', None, None),
+        ("GET /api/offers/<id>", 'GET', lambda i, ids: f'/api/offers/{offre()}', None, None),
+        ("GET /api/offers/<id>/candidates", 'GET', lambda i, ids: f'/api/offers/{offre()}/candidates', None, None),
+        ("GET /api/offers/<id>/suggested-candidates", 'GET',
+         lambda i, ids: f'/api/offers/{offre()}/suggested-candidates?k=2', None, None),
+        ("GET /api/offers/<id>/similar-candidates", 'GET',
+         lambda i, ids: f'/api/offers/{offre()}/similar-candidates', None, None),
+        ("POST /api/offers/<id>/analyze-match", 'POST', lambda i, ids: f'/api/offers/{offre()}/analyze-match',
+         lambda i, ids: {"candidat_id": candidat()}, None),
+        ("POST /api/offers/<id>/analyze-batch (20)", 'POST', lambda i, ids: f'/api/offers/{offre()}/analyze-batch',
+         lambda i, ids: {"candidat_ids": [candidat() for _ in range(20)]}, None),
+        ("POST /api/offers/<id>/rank-candidates", 'POST', lambda i, ids: f'/api/offers/{offre()}/rank-candidates',
+         lambda i, ids: {"top": 50}, None),
+        ("POST /api/offers", 'POST', lambda i, ids: '/api/offers', nouvelle_offre, None),
+        ("PUT /api/offers/<id>", 'PUT', lambda i, ids: f'/api/offers/{ids[i]}',
+         lambda i, ids: {"competences": ["Python", "Go", "Terraform"]}, creer_offre),
+        ("DELETE /api/offers/<id>", 'DELETE', lambda i, ids: f'/api/offers/{ids[i]}', None, creer_offre),
+        ("POST /api/offers/bulk (100)", 'POST', lambda i, ids: '/api/offers/bulk',
+         lambda i, ids: [nouvelle_offre() for _ in range(100)], None),
+        # candidature_routes : un candidat neuf par itération (pas de doublon)
+        ("POST /api/apply", 'POST', lambda i, ids: '/api/apply',
+         lambda i, ids: {"candidat_id": ids[i], "offre_id": offre()}, creer_candidat),
+        ("POST /api/offers/<id>/apply", 'POST', lambda i, ids: f'/api/offers/{offre()}/apply',
+         lambda i, ids: {"candidat_id": ids[i]}, creer_candidat),
+    ]
+
+
+def percentiles(durees):
+    quantiles = statistics.quantiles(durees, n=100, method='inclusive')
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "moyenne_ms": round(statistics.fmean(durees) * 1000, 3),
+        "max_ms": round(max(durees) * 1000, 3)
+    }
+
+
+def mesurer_route(client, methode, url, corps, preparation, requetes, echauffement):
+    # Lignes propres à la route, créées avant la mesure (non chronométrées)
+    ids = [preparation(client) for _ in range(requetes + echauffement)] if preparation else []
+
+    durees = []
+    statuts = {}
+    for i in range(requetes + echauffement):
+        chemin = url(i, ids)
+        donnees = corps(i, ids) if corps is not None else None
+        debut = time.perf_counter()
+        reponse = client.open(chemin, method=methode, json=donnees)
+        duree = time.perf_counter() - debut
+        if i >= echauffement:
+            durees.append(duree)
+            statuts[reponse.status_code] = statuts.get(reponse.status_code, 0) + 1
+
+    return {
+        **percentiles(durees),
+        "requetes_par_s": round(len(durees) / sum(durees), 1),
+        "requetes": len(durees),
+        "statuts": {str(code): nombre for code, nombre in sorted(statuts.items())}
+    }
+
+
+def mesurer_fallback(repetitions):
+    """AIService._fallback_analysis seul, avec et sans profil d'offre pré-calculé"""
+    from benchmarks.bench_fallback import generer_donnees
+    from services.ai_service import AIService
+
+    offre, candidats = generer_donnees(repetitions)
+    profil = AIService._preparer_offre(offre)
+    resultats = {}
+    for nom, fonction in (
+        ("_fallback_analysis", lambda c: AIService._fallback_analysis(offre, c, deterministe=True)),
+        ("_fallback_analysis (profil_offre)",
+         lambda c: AIService._fallback_analysis(offre, c, profil, deterministe=True)),
+    ):
+        durees = []
+        for candidat in candidats:
+            debut = time.perf_counter()
+            fonction(candidat)
+            durees.append(time.perf_counter() - debut)
+        resultats[nom] = {
+            **percentiles(durees),
+            "requetes_par_s": round(len(durees) / sum(durees), 1),
+            "requetes": len(durees)
+        }
+    return resultats
+
+
+# ========== Comparaison ==========
+
+def regressions(resultats, reference, seuil):
+    """(palier, route, p95 de référence, p95 actuel) plus lents que la référence de plus de seuil"""
+    groupes = {**resultats["paliers"], "scoring_local": resultats["scoring_local"]}
+    references = {**reference.get("paliers", {}), "scoring_local": reference.get("scoring_local", {})}
+    trouvees = []
+    for palier, routes in groupes.items():
+        for route, mesure in routes.items():
+            ancienne = references.get(palier, {}).get(route)
+            if ancienne and mesure["p95_ms"] > ancienne["p95_ms"] * (1 + seuil):
+                trouvees.append((palier, route, ancienne["p95_ms"], mesure["p95_ms"]))
+    return trouvees
+
+
+def erreurs(resultats):
+    """(palier, route, statuts) des routes ayant répondu autrement que 2xx"""
+    return [
+        (palier, route, mesure["statuts"])
+        for palier, routes in resultats["paliers"].items()
+        for route, mesure in routes.items()
+        if any(not code.startswith('2') for code in mesure["statuts"])
+    ]
+
+
+def meta(url):
+    import sqlalchemy
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.utcnow().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "base": url.split(':', 1)[0],
+        "machine": platform.machine()
+    }
+
+
+def lire_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark des routes de l'API")
+    parser.add_argument('--tailles', default='1000,100000',
+                        help="Paliers de candidats, croissants (ex: 1000,100000,1000000)")
+    parser.add_argument('--requetes', type=int, default=200, help="Requêtes mesurées par route")
+    parser.add_argument('--echauffement', type=int, default=10, help="Requêtes non mesurées par route")
+    parser.add_argument('--routes', default='', help="Ne mesurer que les routes contenant ce texte")
+    parser.add_argument('--database-url', default=None,
+                        help="Base à utiliser (vidée !) ; défaut : SQLite temporaire")
+    parser.add_argument('--sortie', default=None, help="Fichier JSON des résultats")
+    parser.add_argument('--reference', default=None, help="Résultats JSON d'un run précédent")
+    parser.add_argument('--seuil', type=float, default=0.20,
+                        help="Régression si p95 > référence x (1 + seuil)")
+    return parser.parse_args()
+
+
+def main():
+    arguments = lire_arguments()
+    tailles = sorted(int(taille) for taille in arguments.tailles.split(','))
+
+    url = arguments.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ['DATABASE_URL'] = url
+    os.environ['AI_SCORING_DETERMINISTE'] = 'true'
+    os.environ['QUERY_BUDGET_MODE'] = 'off'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ['TFIDF_INDEX_PATH'] = os.path.join(tempfile.mkdtemp(), 'tfidf.npz')
+    # Pas d'appel réseau : scoring local uniquement
+    os.environ['GEMINI_API_KEY'] = ''
+
+    from app import create_app
+    from models import db
+    from services.search_service import SearchService
+
+    app = create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        if arguments.database_url:
+            # Base fournie : repartir d'un schéma vide
+            SearchService.supprimer_index(db.session.connection())
+            db.session.commit()
+            db.drop_all()
+            db.create_all()
+            SearchService.initialiser()
+
+    resultats = {"meta": meta(url), "paliers": {}}
+    compteur = iter(range(10 ** 9))
+    actuel = 0
+    # Identifiants remplis par SeedService (les scénarios créent et suppriment d'autres lignes)
+    candidats_remplis, offres_remplies = [], []
+
+    for taille in tailles:
+        debut = time.perf_counter()
+        with app.app_context():
+            candidats, offres = remplir(actuel, taille)
+        candidats_remplis.append(candidats)
+        offres_remplies.append(offres)
+        actuel = taille
+        print(f"\n{'=' * 92}\nPALIER {taille} candidats (remplissage {time.perf_counter() - debut:.1f} s)\n{'=' * 92}")
+        print(f"{'route':48} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>9}  statuts")
+
+        palier = {}
+        routes = scenarios(candidats_remplis, offres_remplies, compteur)
+        for nom, methode, chemin, corps, preparation in routes:
+            if arguments.routes and arguments.routes not in nom:
+                continue
+            with app.app_context():
+                mesure = mesurer_route(
+                    client, methode, chemin, corps, preparation, arguments.requetes, arguments.echauffement
+                )
+            palier[nom] = mesure
+            print(f"{nom:48} {mesure['p50_ms']:8.2f} {mesure['p95_ms']:8.2f} {mesure['p99_ms']:8.2f} "
+                  f"{mesure['requetes_par_s']:9.1f}  {mesure['statuts']}")
+        resultats["paliers"][str(taille)] = palier
+
+    resultats["scoring_local"] = mesurer_fallback(max(arguments.requetes, 1000))
+    print(f"\n{'=' * 92}\nSCORING LOCAL\n{'=' * 92}")
+    for nom, mesure in resultats["scoring_local"].items():
+        print(f"{nom:48} {mesure['p50_ms']:8.3f} {mesure['p95_ms']:8.3f} {mesure['p99_ms']:8.3f} "
+              f"{mesure['requetes_par_s']:9.1f}")
+
+    if arguments.sortie:
+        with open(arguments.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump(resultats, fichier, indent=2, ensure_ascii=False)
+        print(f"\nRésultats écrits dans {arguments.sortie}")
+
+    en_erreur = erreurs(resultats)
+    for palier, route, statuts in en_erreur:
+        print(f"[WARNING] {palier:>8} {route:48} statuts {statuts} : mesure non valide")
+    if en_erreur:
+        sys.exit(1)
+
+    if arguments.reference:
+        with open(arguments.reference, encoding='utf-8') as fichier:
+            reference = json.load(fichier)
+        trouvees = regressions(resultats, reference, arguments.seuil)
+        print(f"\n{'-' * 92}")
+        for palier, route, ancien, nouveau in trouvees:
+            print(f"[WARNING] {palier:>8} {route:48} p95 {ancien:.2f} -> {nouveau:.2f} ms "
+                  f"(+{(nouveau / ancien - 1) * 100:.0f} %)")
+        if trouvees:
+            print(f"{len(trouvees)} régression(s) au-delà de {arguments.seuil * 100:.0f} %")
+            sys.exit(1)
+        print(f"Aucune régression au-delà de {arguments.seuil * 100:.0f} %")
+
+
+if __name__ == '__main__':
+    main()
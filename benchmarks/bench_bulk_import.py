@@ -0,0 +1,71 @@
+"""
+Benchmark de l'import en masse des candidats
+
+Compare le débit (lignes par seconde) entre POST /api/candidates ligne
+par ligne et POST /api/candidates/bulk, sur une base SQLite temporaire.
+
+Usage : python -m benchmarks.bench_bulk_import [nombre_de_lignes]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+def generer_candidats(nombre, prefixe):
+    return [
+        {
+            "nom": f"Candidat {prefixe}{i}",
+            "email": f"{prefixe}{i}@exemple.com",
+            "bio": f"Développeur Python avec {i % 10 + 1} ans d'expérience, passionné et autonome",
+            "diplome": "Master en Informatique"
+        }
+        for i in range(nombre)
+    ]
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    dossier = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+
+    from app import create_app
+    app = create_app()
+    client = app.test_client()
+
+    print("=" * 60)
+    print(f"BENCHMARK IMPORT EN MASSE - {nombre} candidats")
+    print("=" * 60)
+
+    # Ligne par ligne (échantillon plus petit : l'endpoint est lent)
+    echantillon = generer_candidats(max(1, nombre // 10), "unitaire")
+    debut = time.perf_counter()
+    for candidat in echantillon:
+        assert client.post('/api/candidates', json=candidat).status_code == 201
+    debit_unitaire = len(echantillon) / (time.perf_counter() - debut)
+
+    # Tableau JSON
+    lot = generer_candidats(nombre, "json")
+    debut = time.perf_counter()
+    reponse = client.post('/api/candidates/bulk', json=lot)
+    debit_json = nombre / (time.perf_counter() - debut)
+    assert reponse.get_json()["crees"] == nombre, reponse.get_json()["erreurs"][:3]
+
+    # Flux NDJSON
+    flux = "\n".join(json.dumps(c) for c in generer_candidats(nombre, "ndjson"))
+    debut = time.perf_counter()
+    reponse = client.post('/api/candidates/bulk', data=flux, content_type='application/x-ndjson')
+    debit_ndjson = nombre / (time.perf_counter() - debut)
+    assert reponse.get_json()["crees"] == nombre
+
+    print(f"POST /api/candidates        : {debit_unitaire:>10.0f} lignes/s")
+    print(f"POST /api/candidates/bulk   : {debit_json:>10.0f} lignes/s (x{debit_json / debit_unitaire:.1f})")
+    print(f"  - en NDJSON               : {debit_ndjson:>10.0f} lignes/s (x{debit_ndjson / debit_unitaire:.1f})")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
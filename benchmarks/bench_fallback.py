@@ -0,0 +1,104 @@
+"""
+Micro-benchmark du scoring local (AIService._fallback_analysis)
+
+Compare le débit (paires offre/candidat par seconde) entre :
+- la version de référence : un test `in` par mot-clé et par paire
+- la version actuelle : profil d'offre pré-calculé + automate multi-motifs
+
+Usage : python -m benchmarks.bench_fallback [nombre_de_paires]
+"""
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from benchmarks.reference_scoring import fallback_analysis_reference
+from services.ai_service import AIService
+from services.utils import keyword_matcher
+
+VOCABULAIRE = (
+    "développeur développeuse python flask django react docker kubernetes "
+    "postgresql git linux api rest cloud aws équipe projet gestion analyse "
+    "données agile scrum senior junior expert confirmé stage passionné motivé "
+    "dynamique autonome rigoureux polyvalent 3 ans 5 ans dix ans un an "
+    "backend frontend mobile sécurité réseau qualité tests"
+).split()
+REMPLISSAGE = "le la les des un une avec pour dans sur au et en de du".split()
+
+
+def generer_bio(rng, longueur=2000):
+    mots = []
+    taille = 0
+    while taille < longueur:
+        mot = rng.choice(VOCABULAIRE if rng.random() < 0.3 else REMPLISSAGE)
+        mots.append(mot)
+        taille += len(mot) + 1
+    return " ".join(mots)[:longueur]
+
+
+def generer_donnees(nombre_candidats, graine=42):
+    rng = random.Random(graine)
+    offre = SimpleNamespace(
+        titre="Développeur Python Senior Backend",
+        description="Nous recherchons un développeur Python expérimenté",
+        competences=["Python", "Flask", "PostgreSQL", "Docker", "Git", "Kubernetes", "AWS"],
+        salaire=500000
+    )
+    diplomes = ["Master en Informatique", "Licence Pro", "BTS Informatique", "Ingénieur", "Bac+2"]
+    candidats = [
+        SimpleNamespace(
+            nom=f"Candidat {i}",
+            bio=generer_bio(rng, rng.randint(300, 2000)),
+            diplome=rng.choice(diplomes)
+        )
+        for i in range(nombre_candidats)
+    ]
+    return offre, candidats
+
+
+def mesurer(fonction, repetitions=3):
+    meilleur = None
+    resultats = None
+    for _ in range(repetitions):
+        random.seed(0)  # Même variation aléatoire pour chaque méthode
+        debut = time.perf_counter()
+        resultats = fonction()
+        duree = time.perf_counter() - debut
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    return meilleur, resultats
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    offre, candidats = generer_donnees(nombre)
+
+    print("=" * 60)
+    print(f"BENCHMARK SCORING LOCAL - {nombre} paires")
+    print("=" * 60)
+    if keyword_matcher.ahocorasick is None:
+        print("[WARNING]  pyahocorasick absent : repli sur les tests `in`")
+
+    duree_avant, resultats_avant = mesurer(
+        lambda: [fallback_analysis_reference(offre, c) for c in candidats]
+    )
+
+    def lot_actuel():
+        # Même découpage que AIService.classer_candidats, sans le tri final
+        profil_offre = AIService._preparer_offre(offre)
+        return [AIService._fallback_analysis(offre, c, profil_offre) for c in candidats]
+
+    duree_apres, resultats_apres = mesurer(lot_actuel)
+
+    identiques = resultats_avant == resultats_apres
+
+    print(f"Avant : {nombre / duree_avant:>10.0f} paires/s ({duree_avant * 1000:.1f} ms)")
+    print(f"Après : {nombre / duree_apres:>10.0f} paires/s ({duree_apres * 1000:.1f} ms)")
+    print(f"Gain  : x{duree_avant / duree_apres:.2f}")
+    print(f"Résultats identiques : {'oui' if identiques else 'NON'}")
+    print("=" * 60)
+
+    return 0 if identiques else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
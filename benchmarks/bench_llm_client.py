@@ -0,0 +1,122 @@
+"""
+Benchmark du client HTTP du backend LLM contre un serveur local simulé
+
+Le serveur répond au format Gemini après une latence fixe. On mesure le
+débit (analyses par seconde) de AIService.analyser_lot pour plusieurs
+niveaux de concurrence, ainsi que le gain de la session partagée
+(keep-alive) face à un requests.post par appel.
+
+Usage : python -m benchmarks.bench_llm_client [nombre_de_paires] [latence_ms]
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+LATENCE = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive côté serveur
+    wbufsize = 64 * 1024           # En-têtes et corps en un seul envoi (évite l'ACK retardé)
+    connexions = 0
+
+    def setup(self):
+        super().setup()
+        StubGeminiHandler.connexions += 1
+
+    def do_POST(self):
+        longueur = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(longueur)
+        time.sleep(LATENCE)
+
+        texte = json.dumps({"score": 80, "justification": "Réponse simulée"})
+        corps = json.dumps({
+            "candidates": [{"content": {"parts": [{"text": texte}]}}]
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Accepter toutes les connexions concurrentes
+
+
+def demarrer_serveur():
+    serveur = StubServer(("127.0.0.1", 0), StubGeminiHandler)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    serveur = demarrer_serveur()
+
+    # La configuration est lue à l'import : la fixer avant d'importer le service
+    os.environ['AI_API_URL'] = f"http://127.0.0.1:{serveur.server_port}/"
+    os.environ['GEMINI_API_KEY'] = "cle-de-benchmark"
+    os.environ['AI_MAX_CONCURRENCY'] = "64"
+
+    import requests
+    from services import ai_service
+    from services.ai_service import AIService, analysis_cache
+    from services.http_client import fermer_session
+
+    offre = SimpleNamespace(
+        id=1, titre="Développeur Python Senior", description="Poste backend Python",
+        competences=["Python", "Flask"], salaire=500000
+    )
+    paires = [
+        (offre, SimpleNamespace(id=i, nom=f"Candidat {i}", bio=f"Bio numéro {i} python", diplome="Master"))
+        for i in range(nombre)
+    ]
+
+    print("=" * 60)
+    print(f"BENCHMARK CLIENT LLM - {nombre} analyses, latence {LATENCE * 1000:.0f} ms")
+    print("=" * 60)
+
+    # Réduire le bruit des logs du service
+    ai_service.print = lambda *args, **kwargs: None
+
+    def mesurer(concurrence):
+        analysis_cache.vider()
+        debut = time.perf_counter()
+        resultats = AIService.analyser_lot(paires, concurrence=concurrence)
+        duree = time.perf_counter() - debut
+        assert all(r.get("source") == "gemini-ai" for r in resultats), resultats[:1]
+        return duree
+
+    # Sans session partagée : une connexion par appel
+    session_post = requests.Session.post
+    requests.Session.post = lambda self, *a, **kw: requests.post(*a, **kw)
+    StubGeminiHandler.connexions = 0
+    duree = mesurer(1)
+    requests.Session.post = session_post
+    print(f"Sans pool,  concurrence  1 : {nombre / duree:>8.1f} analyses/s, "
+          f"{StubGeminiHandler.connexions} connexions")
+
+    for concurrence in (1, 2, 4, 8, 16, 32):
+        fermer_session()
+        StubGeminiHandler.connexions = 0
+        duree = mesurer(concurrence)
+        print(f"Avec pool,  concurrence {concurrence:>2} : {nombre / duree:>8.1f} analyses/s, "
+              f"{StubGeminiHandler.connexions} connexions")
+
+    print("=" * 60)
+    serveur.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
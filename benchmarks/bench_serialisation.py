@@ -0,0 +1,90 @@
+"""
+Benchmark du chemin de sérialisation des listes
+
+Compare, à 10k et 100k lignes, l'ancien chemin (instances ORM + schéma
+Marshmallow + jsonify) et le chemin rapide (tuples de colonnes +
+sérialiseur précompilé + orjson si installé), et vérifie que les deux
+produisent exactement les mêmes octets.
+
+Usage : python -m benchmarks.bench_serialisation [lignes ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+def mesurer(fonction, repetitions=3):
+    meilleur = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        duree = time.perf_counter() - debut
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    return meilleur, resultat
+
+
+def main():
+    tailles = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    dossier = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+
+    from app import create_app
+    app = create_app()
+
+    from flask import jsonify
+    from sqlalchemy import insert
+    from models import db
+    from models.candidat import Candidat
+    from schemas.candidat_schema import candidats_schema, candidat_serialiseur
+    from services.utils.serialisation import orjson, reponse_json
+
+    print("=" * 60)
+    print(f"BENCHMARK SÉRIALISATION - orjson {'installé' if orjson else 'absent'}")
+    print("=" * 60)
+
+    with app.test_request_context():
+        insere = 0
+        for taille in sorted(tailles):
+            maintenant = datetime.utcnow()
+            db.session.execute(insert(Candidat), [
+                {
+                    "nom": f"Candidat {i}",
+                    "email": f"candidat{i}@exemple.com",
+                    "bio": f"Développeur Python avec {i % 10 + 1} ans d'expérience, passionné et autonome",
+                    "diplome": "Master en Informatique",
+                    "date_inscription": maintenant,
+                    "updated_at": maintenant
+                }
+                for i in range(insere, taille)
+            ])
+            db.session.commit()
+            insere = taille
+
+            ordre = (Candidat.date_inscription.desc(), Candidat.id.desc())
+
+            def ancien():
+                candidats = Candidat.query.order_by(*ordre).all()
+                return jsonify({"success": True, "candidats": candidats_schema.dump(candidats)}).get_data()
+
+            def rapide():
+                lignes = db.session.query(*candidat_serialiseur.colonnes).order_by(*ordre).all()
+                return reponse_json({"success": True, "candidats": candidat_serialiseur.dump(lignes)}).get_data()
+
+            duree_ancien, octets_ancien = mesurer(ancien)
+            db.session.expunge_all()
+            duree_rapide, octets_rapide = mesurer(rapide)
+            assert octets_ancien == octets_rapide, "Les sorties diffèrent"
+
+            print(f"{taille:>7} lignes : ORM + Marshmallow {duree_ancien * 1000:>8.0f} ms | "
+                  f"tuples + précompilé {duree_rapide * 1000:>7.0f} ms (x{duree_ancien / duree_rapide:.1f})")
+
+    print("Sorties identiques octet pour octet")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,4 +7,79 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JSON_SORT_KEYS = False
\ No newline at end of file
+    JSON_SORT_KEYS = False
+    
+    # Environnement : en production le schéma est géré par Alembic (alembic upgrade head)
+    APP_ENV = os.getenv('APP_ENV', 'development')
+    # create_all() + index plein texte au démarrage (développement uniquement par défaut)
+    DB_AUTO_CREATE = os.getenv('DB_AUTO_CREATE', str(APP_ENV != 'production')).lower() == 'true'
+    
+    # Budget d'instructions SQL par route (@budget_requetes) : off, log (pile d'appels) ou raise
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'off' if APP_ENV == 'production' else 'log')
+    # Budget des routes sans décorateur (vide = pas de contrôle)
+    QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT')) if os.getenv('QUERY_BUDGET_DEFAULT') else None
+    
+    # Pool de connexions, par worker (total = workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW))
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))          # secondes d'attente d'une connexion
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))        # secondes avant reconnexion
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))  # PostgreSQL, 0 = aucun
+    # Métriques Prometheus exposées sur /metrics (prometheus_client)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    # Jeton des routes /api/internal/* et /metrics (vide : accès libre, sauf en production où elles sont désactivées)
+    INTERNAL_STATS_TOKEN = os.getenv('INTERNAL_STATS_TOKEN', '')
+    
+    # Pagination des listes (keyset)
+    API_DEFAULT_PAGE_SIZE = int(os.getenv('API_DEFAULT_PAGE_SIZE', 50))
+    API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 200))
+    # Offres présélectionnées par l'index avant rescoring (recommandations)
+    RECO_SHORTLIST_SIZE = int(os.getenv('RECO_SHORTLIST_SIZE', 200))
+    # Rétro-indexation des nouvelles compétences sur les bios : thread du processus
+    # web (false : seulement `flask indexer-competences --en-attente`)
+    SKILL_RETRO_INDEX_THREAD = os.getenv('SKILL_RETRO_INDEX_THREAD', 'true').lower() == 'true'
+    SKILL_RETRO_INDEX_INTERVAL = int(os.getenv('SKILL_RETRO_INDEX_INTERVAL', 60))   # secondes entre deux reprises
+    # Nombre maximum de lignes par import en masse
+    API_MAX_BULK_ROWS = int(os.getenv('API_MAX_BULK_ROWS', 50000))
+    
+    # Statistiques des offres (GET /api/offers/stats) : durée de cache courte, 0 = pas de cache
+    OFFER_STATS_CACHE_TTL = int(os.getenv('OFFER_STATS_CACHE_TTL', 30))   # secondes
+    OFFER_STATS_CACHE_SIZE = int(os.getenv('OFFER_STATS_CACHE_SIZE', 1000))
+    
+    # Cache des analyses de compatibilité
+    AI_CACHE_MAX_SIZE = int(os.getenv('AI_CACHE_MAX_SIZE', 5000))
+    AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', 24 * 3600))  # secondes
+    # Scoring local sans variation aléatoire
+    AI_SCORING_DETERMINISTE = os.getenv('AI_SCORING_DETERMINISTE', 'false').lower() == 'true'
+    # Moteur de scoring par défaut : auto (Gemini puis local) ou tfidf (numpy/scipy)
+    AI_SCORING_ENGINE = os.getenv('AI_SCORING_ENGINE', 'auto')
+    # Vocabulaire, IDF et matrice TF-IDF persistés entre les redémarrages
+    TFIDF_INDEX_PATH = os.getenv('TFIDF_INDEX_PATH', 'instance/tfidf_index.npz')
+    # Relecture des candidats écrits par les autres workers (secondes)
+    TFIDF_SYNC_INTERVAL = int(os.getenv('TFIDF_SYNC_INTERVAL', '30'))
+    
+    # Analyses asynchrones (?async=1) : pool de threads du processus (memoire)
+    # ou table analysis_jobs (base), lue par des threads de chaque processus web
+    # et/ou par `flask jobs-worker`
+    JOBS_BACKEND = os.getenv('JOBS_BACKEND', 'memoire')
+    JOBS_WORKERS = int(os.getenv('JOBS_WORKERS', 2))                  # threads d'exécution
+    JOBS_WEB_THREADS = int(os.getenv('JOBS_WEB_THREADS', 1))          # base : threads par processus web (0 : jobs-worker seul)
+    JOBS_QUEUE_SIZE = int(os.getenv('JOBS_QUEUE_SIZE', 100))          # jobs en attente, au-delà : 503
+    JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', 3))
+    JOBS_RETRY_DELAY = float(os.getenv('JOBS_RETRY_DELAY', 2))        # secondes, doublé à chaque tentative
+    JOBS_RESULT_TTL = int(os.getenv('JOBS_RESULT_TTL', 3600))         # secondes de conservation des jobs terminés
+    JOBS_STALE_TIMEOUT = int(os.getenv('JOBS_STALE_TIMEOUT', 300))    # job en cours abandonné (base)
+    JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', 1))    # secondes entre deux lectures (base)
+    
+    # Backend LLM (Gemini via OpenRouter)
+    AI_API_URL = os.getenv('AI_API_URL', 'https://openrouter.ai/api/v1')
+    AI_HTTP_TIMEOUT = float(os.getenv('AI_HTTP_TIMEOUT', 15))         # secondes
+    AI_HTTP_POOL_SIZE = int(os.getenv('AI_HTTP_POOL_SIZE', 10))       # connexions keep-alive
+    AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', 8))      # appels LLM en parallèle
+    
+    # Disjoncteur du backend LLM
+    AI_BREAKER_FAILURE_THRESHOLD = int(os.getenv('AI_BREAKER_FAILURE_THRESHOLD', 5))  # échecs consécutifs
+    AI_BREAKER_RECOVERY_TIMEOUT = float(os.getenv('AI_BREAKER_RECOVERY_TIMEOUT', 30))  # secondes
+    AI_BREAKER_QUOTA_COOLDOWN = float(os.getenv('AI_BREAKER_QUOTA_COOLDOWN', 60))      # après un 429
+    AI_BREAKER_AUTH_COOLDOWN = float(os.getenv('AI_BREAKER_AUTH_COOLDOWN', 3600))      # après un 403
@@ -0,0 +1,33 @@
+# Configuration gunicorn : gunicorn -c gunicorn.conf.py "app:create_app()"
+import os
+import shutil
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# Analyses asynchrones (?async=1) : la file en mémoire est propre à chaque
+# worker, GET /api/jobs/<id> arriverait sur un worker qui n'a pas le job.
+# Table analysis_jobs par défaut, consommée par JOBS_WEB_THREADS threads de
+# chaque worker (`flask jobs-worker` en plus, facultatif)
+if workers > 1:
+    os.environ.setdefault('JOBS_BACKEND', 'base')
+
+# Métriques Prometheus agrégées sur tous les workers (fichiers partagés)
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(os.getcwd(), 'instance', 'prometheus'))
+
+
+def on_starting(server):
+    # JOBS_BACKEND=memoire explicite avec plusieurs workers (-w compris) : refusé
+    from services.analysis_jobs import verifier_backend
+    verifier_backend(server.cfg.workers)
+
+    # Valeurs d'un démarrage précédent : à effacer avant de lancer les workers
+    dossier = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(dossier, ignore_errors=True)
+    os.makedirs(dossier, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from services.metrics import worker_termine
+    worker_termine(worker.pid)
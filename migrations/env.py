@@ -0,0 +1,62 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from config import Config
+from models import db, init_models
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Métadonnées de tous les modèles (pour --autogenerate)
+init_models()
+target_metadata = db.metadata
+
+
+def include_object(objet, nom, type_, reflete, compare_to):
+    # Index plein texte (candidats_fts*, search_vector) gérés par SearchService, hors modèles
+    if type_ == 'table' and reflete and nom.startswith('candidats_fts'):
+        return False
+    if type_ in ('column', 'index') and reflete and nom in ('search_vector', 'ix_candidats_search_vector'):
+        return False
+    return True
+
+
+def url_base():
+    # Une URL passée par alembic.command (scripts) prime sur DATABASE_URL
+    return config.attributes.get('url') or Config.SQLALCHEMY_DATABASE_URI
+
+
+def run_migrations_offline():
+    """Génère le SQL sans connexion (alembic upgrade --sql)"""
+    context.configure(
+        url=url_base(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(url_base(), poolclass=pool.NullPool)
+    with engine.connect() as connexion:
+        context.configure(
+            connection=connexion,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite ne sait pas modifier une table en place : mode batch
+            render_as_batch=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,58 @@
+"""Schéma initial : candidats, offres d'emploi et candidatures
+
+Correspond aux tables créées par db.create_all() avant l'introduction des
+migrations. Sur une base existante : alembic stamp 0001 puis alembic upgrade head.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'candidats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nom', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('bio', sa.Text(), nullable=False),
+        sa.Column('diplome', sa.String(length=200), nullable=False),
+        sa.Column('date_inscription', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    op.create_table(
+        'offres_emploi',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('titre', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('competences', sa.JSON(), nullable=False),
+        sa.Column('salaire', sa.Float(), nullable=False),
+        sa.Column('date_creation', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'candidatures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('candidat_id', sa.Integer(), nullable=False),
+        sa.Column('offre_id', sa.Integer(), nullable=False),
+        sa.Column('date_depot', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['candidat_id'], ['candidats.id']),
+        sa.ForeignKeyConstraint(['offre_id'], ['offres_emploi.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('candidat_id', 'offre_id', name='unique_candidature')
+    )
+
+
+def downgrade():
+    op.drop_table('candidatures')
+    op.drop_table('offres_emploi')
+    op.drop_table('candidats')
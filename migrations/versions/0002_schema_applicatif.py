@@ -0,0 +1,97 @@
+"""Colonnes updated_at, scores persistés et index des compétences
+
+Les tables ajoutées depuis le schéma initial ont pu être créées par
+db.create_all() au démarrage : elles ne sont créées ici que si elles manquent.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Table -> colonne de date de création, reprise comme première valeur de updated_at
+TABLES_DATEES = {
+    'candidats': 'date_inscription',
+    'offres_emploi': 'date_creation',
+    'candidatures': 'date_depot'
+}
+
+
+def upgrade():
+    inspecteur = sa.inspect(op.get_bind())
+    tables = set(inspecteur.get_table_names())
+
+    for table, colonne_date in TABLES_DATEES.items():
+        colonnes = {colonne['name'] for colonne in inspecteur.get_columns(table)}
+        if 'updated_at' not in colonnes:
+            op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+            op.execute(f"UPDATE {table} SET updated_at = {colonne_date}")
+
+    if 'match_scores' not in tables:
+        op.create_table(
+            'match_scores',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('candidature_id', sa.Integer(), nullable=False),
+            sa.Column('offre_id', sa.Integer(), nullable=False),
+            sa.Column('candidat_id', sa.Integer(), nullable=False),
+            sa.Column('score', sa.Integer(), nullable=False),
+            sa.Column('justification', sa.String(length=200), nullable=False),
+            sa.Column('source', sa.String(length=50), nullable=False),
+            sa.Column('scorer_version', sa.String(length=20), nullable=False),
+            sa.Column('input_hash', sa.String(length=64), nullable=False),
+            sa.Column('computed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['candidature_id'], ['candidatures.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['offre_id'], ['offres_emploi.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['candidat_id'], ['candidats.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('candidature_id')
+        )
+        op.create_index('ix_match_scores_offre_score', 'match_scores', ['offre_id', 'score'])
+        op.create_index('ix_match_scores_candidat', 'match_scores', ['candidat_id'])
+
+    if 'competences' not in tables:
+        op.create_table(
+            'competences',
+            sa.Column('terme', sa.String(length=100), nullable=False),
+            sa.PrimaryKeyConstraint('terme')
+        )
+
+    if 'candidat_competences' not in tables:
+        op.create_table(
+            'candidat_competences',
+            sa.Column('terme', sa.String(length=100), nullable=False),
+            sa.Column('candidat_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['terme'], ['competences.terme'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['candidat_id'], ['candidats.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('terme', 'candidat_id')
+        )
+        op.create_index('ix_candidat_competences_candidat', 'candidat_competences', ['candidat_id'])
+
+    if 'offre_competences' not in tables:
+        op.create_table(
+            'offre_competences',
+            sa.Column('terme', sa.String(length=100), nullable=False),
+            sa.Column('offre_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['terme'], ['competences.terme'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['offre_id'], ['offres_emploi.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('terme', 'offre_id')
+        )
+        op.create_index('ix_offre_competences_offre', 'offre_competences', ['offre_id'])
+
+
+def downgrade():
+    op.drop_table('offre_competences')
+    op.drop_table('candidat_competences')
+    op.drop_table('competences')
+    op.drop_table('match_scores')
+
+    for table in TABLES_DATEES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column('updated_at')
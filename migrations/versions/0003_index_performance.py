@@ -0,0 +1,43 @@
+"""Index des requêtes fréquentes et index plein texte
+
+- pagination par clé (date, id) des listes de candidats et d'offres
+- max(updated_at) pour les ETag des listes
+- candidats d'une offre triés par date de dépôt
+- recherche plein texte (tsvector/GIN sous PostgreSQL, FTS5 sous SQLite)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+from services.search_service import SearchService
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# (nom, table, colonnes) : mêmes noms que dans les modèles
+INDEX = [
+    ('ix_candidats_date_inscription_id', 'candidats', ['date_inscription', 'id']),
+    ('ix_candidats_updated_at', 'candidats', ['updated_at']),
+    ('ix_offres_date_creation_id', 'offres_emploi', ['date_creation', 'id']),
+    ('ix_offres_updated_at', 'offres_emploi', ['updated_at']),
+    ('ix_candidatures_offre_date_depot', 'candidatures', ['offre_id', 'date_depot']),
+]
+
+
+def upgrade():
+    for nom, table, colonnes in INDEX:
+        # if_not_exists : index déjà créés par create_all sur une base récente
+        op.create_index(nom, table, colonnes, if_not_exists=True)
+
+    SearchService.creer_index(op.get_bind())
+
+
+def downgrade():
+    SearchService.supprimer_index(op.get_bind())
+
+    for nom, table, _ in reversed(INDEX):
+        op.drop_index(nom, table_name=table, if_exists=True)
@@ -0,0 +1,45 @@
+"""Table des jobs d'analyse asynchrones (JOBS_BACKEND=base)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Table déjà créée par db.create_all() sur une base de développement
+    if 'analysis_jobs' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        'analysis_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('offre_id', sa.Integer(), nullable=False),
+        sa.Column('candidat_ids', sa.JSON(), nullable=False),
+        sa.Column('deterministe', sa.Boolean(), nullable=True),
+        sa.Column('moteur', sa.String(length=20), nullable=True),
+        sa.Column('empreinte', sa.String(length=64), nullable=False),
+        sa.Column('statut', sa.String(length=20), nullable=False),
+        sa.Column('tentatives', sa.Integer(), nullable=False),
+        sa.Column('resultat', sa.JSON(), nullable=True),
+        sa.Column('erreur', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('disponible_a', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_analysis_jobs_statut_disponible', 'analysis_jobs', ['statut', 'disponible_a'])
+    op.create_index('ix_analysis_jobs_empreinte', 'analysis_jobs', ['empreinte'])
+
+
+def downgrade():
+    op.drop_table('analysis_jobs')
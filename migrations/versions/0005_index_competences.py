@@ -0,0 +1,40 @@
+"""Mots de titre hors du vocabulaire des bios et indexation des données existantes
+
+Les candidats et offres créés avant l'index des compétences n'y figuraient
+pas : l'index est reconstruit ici, par lots (SkillIndexService.reconstruire).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from services.skill_index_service import SkillIndexService
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not context.is_offline_mode():
+        colonnes = {colonne['name'] for colonne in sa.inspect(op.get_bind()).get_columns('competences')}
+        if 'indexe_bios' in colonnes:
+            return
+
+    op.add_column('competences', sa.Column('indexe_bios', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+    # Reprise des données : sans connexion (--sql), lancer ensuite flask indexer-competences
+    if context.is_offline_mode():
+        return
+
+    # Seules les compétences d'offres redeviennent recherchées dans les bios
+    op.execute(sa.text("UPDATE competences SET indexe_bios = :faux").bindparams(faux=False))
+    SkillIndexService.reconstruire(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('competences') as batch:
+        batch.drop_column('indexe_bios')
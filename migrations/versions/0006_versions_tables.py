@@ -0,0 +1,36 @@
+"""Compteurs de suppressions pour la version des tables (ETag des listes)
+
+La version d'une table (max id, max updated_at, suppressions) se lit dans
+des index : plus de count(id) à chaque GET de liste, même en 304.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from services.utils.etag import creer_compteurs, supprimer_compteurs
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Table déjà créée par db.create_all() sur une base de développement
+    if 'versions_tables' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'versions_tables',
+            sa.Column('nom', sa.String(length=50), nullable=False),
+            sa.Column('suppressions', sa.Integer(), server_default='0', nullable=False),
+            sa.PrimaryKeyConstraint('nom')
+        )
+
+    creer_compteurs(op.get_bind())
+
+
+def downgrade():
+    supprimer_compteurs(op.get_bind())
+    op.drop_table('versions_tables')
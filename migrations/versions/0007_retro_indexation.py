@@ -0,0 +1,33 @@
+"""Rétro-indexation des nouvelles compétences hors de la requête
+
+Une compétence introduite par une offre est marquée en attente
+(retro_indexe faux) ; les bios existantes sont parcourues en arrière-plan.
+Les compétences existantes sont déjà indexées : vrai par défaut.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Colonne déjà créée par db.create_all() sur une base de développement
+    if not context.is_offline_mode():
+        colonnes = {colonne['name'] for colonne in sa.inspect(op.get_bind()).get_columns('competences')}
+        if 'retro_indexe' in colonnes:
+            return
+
+    op.add_column('competences', sa.Column('retro_indexe', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+
+def downgrade():
+    with op.batch_alter_table('competences') as batch:
+        batch.drop_column('retro_indexe')
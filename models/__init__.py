@@ -7,4 +7,8 @@ db = SQLAlchemy()
 def init_models():
     from models.candidat import Candidat
     from models.offre_emploi import OffreEmploi
-    from models.candidature import Candidature
\ No newline at end of file
+    from models.candidature import Candidature
+    from models.match_score import MatchScore
+    from models.competence import Competence, CandidatCompetence, OffreCompetence
+    from models.analysis_job import AnalysisJob
+    from models.version_table import VersionTable
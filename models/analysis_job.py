@@ -0,0 +1,33 @@
+from models import db
+from datetime import datetime
+
+class AnalysisJob(db.Model):
+    __tablename__ = 'analysis_jobs'
+
+    # Identifiant opaque (uuid hex) renvoyé au client
+    id = db.Column(db.String(32), primary_key=True)
+    # Pas de clé étrangère : le job garde son résultat si l'offre est supprimée
+    offre_id = db.Column(db.Integer, nullable=False)
+    candidat_ids = db.Column(db.JSON, nullable=False)
+    deterministe = db.Column(db.Boolean, nullable=True)
+    moteur = db.Column(db.String(20), nullable=True)
+    # Empreinte (offre, candidats, options) : déduplication des jobs en attente
+    empreinte = db.Column(db.String(64), nullable=False)
+    statut = db.Column(db.String(20), nullable=False)
+    tentatives = db.Column(db.Integer, nullable=False, default=0)
+    resultat = db.Column(db.JSON, nullable=True)
+    erreur = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Prochaine exécution possible (délai entre deux tentatives)
+    disponible_a = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Prochain job à exécuter et jobs en attente d'une même empreinte
+        db.Index('ix_analysis_jobs_statut_disponible', 'statut', 'disponible_a'),
+        db.Index('ix_analysis_jobs_empreinte', 'empreinte'),
+    )
+
+    def __repr__(self):
+        return f'<AnalysisJob {self.id} ({self.statut})>'
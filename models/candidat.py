@@ -10,9 +10,17 @@ class Candidat(db.Model):
     bio = db.Column(db.Text, nullable=False)
     diplome = db.Column(db.String(200), nullable=False)
     date_inscription = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Utiliser lazy='dynamic' et back_populates
     candidatures = db.relationship('Candidature', back_populates='candidat', lazy='dynamic', cascade='all, delete-orphan')
     
+    # Index composite pour la pagination par clé (date_inscription, id)
+    __table_args__ = (
+        db.Index('ix_candidats_date_inscription_id', 'date_inscription', 'id'),
+        # max(updated_at) pour la version de la table (ETag des listes)
+        db.Index('ix_candidats_updated_at', 'updated_at'),
+    )
+    
     def __repr__(self):
         return f'<Candidat {self.nom}>'
\ No newline at end of file
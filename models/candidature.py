@@ -8,14 +8,18 @@ class Candidature(db.Model):
     candidat_id = db.Column(db.Integer, db.ForeignKey('candidats.id'), nullable=False)
     offre_id = db.Column(db.Integer, db.ForeignKey('offres_emploi.id'), nullable=False)
     date_depot = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Utiliser back_populates au lieu de backref
     candidat = db.relationship('Candidat', back_populates='candidatures')
     offre = db.relationship('OffreEmploi', back_populates='candidatures')
+    match_score = db.relationship('MatchScore', back_populates='candidature', uselist=False, cascade='all, delete-orphan')
     
     # Contrainte d'unicité
     __table_args__ = (
         db.UniqueConstraint('candidat_id', 'offre_id', name='unique_candidature'),
+        # Candidats d'une offre triés par date de dépôt
+        db.Index('ix_candidatures_offre_date_depot', 'offre_id', 'date_depot'),
     )
     
     def __repr__(self):
@@ -0,0 +1,46 @@
+from models import db
+
+class Competence(db.Model):
+    """Vocabulaire des compétences indexées (issues des offres)"""
+    __tablename__ = 'competences'
+    
+    terme = db.Column(db.String(100), primary_key=True)
+    # Faux pour un mot de titre d'offre : dans la représentation des offres, pas recherché dans les bios
+    indexe_bios = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+    # Faux tant que les bios existantes n'ont pas été parcourues pour ce terme (rétro-indexation en attente)
+    retro_indexe = db.Column(db.Boolean, nullable=False, server_default=db.true())
+    
+    def __repr__(self):
+        return f'<Competence {self.terme}>'
+
+
+class CandidatCompetence(db.Model):
+    """Index inversé : compétence normalisée -> candidats dont la bio la contient"""
+    __tablename__ = 'candidat_competences'
+    
+    # Clé primaire (terme, candidat_id) : les candidats d'un terme sont contigus
+    terme = db.Column(db.String(100), db.ForeignKey('competences.terme', ondelete='CASCADE'), primary_key=True)
+    candidat_id = db.Column(db.Integer, db.ForeignKey('candidats.id', ondelete='CASCADE'), primary_key=True)
+    
+    __table_args__ = (
+        # Mise à jour/suppression des entrées d'un candidat
+        db.Index('ix_candidat_competences_candidat', 'candidat_id'),
+    )
+    
+    def __repr__(self):
+        return f'<CandidatCompetence {self.terme} -> {self.candidat_id}>'
+
+
+class OffreCompetence(db.Model):
+    """Représentation pré-calculée des offres : compétences normalisées de chaque offre"""
+    __tablename__ = 'offre_competences'
+    
+    terme = db.Column(db.String(100), db.ForeignKey('competences.terme', ondelete='CASCADE'), primary_key=True)
+    offre_id = db.Column(db.Integer, db.ForeignKey('offres_emploi.id', ondelete='CASCADE'), primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_offre_competences_offre', 'offre_id'),
+    )
+    
+    def __repr__(self):
+        return f'<OffreCompetence {self.terme} -> {self.offre_id}>'
@@ -0,0 +1,28 @@
+from models import db
+from datetime import datetime
+
+class MatchScore(db.Model):
+    __tablename__ = 'match_scores'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    candidature_id = db.Column(db.Integer, db.ForeignKey('candidatures.id', ondelete='CASCADE'), nullable=False, unique=True)
+    # Colonnes dénormalisées pour trier/filtrer sans jointure
+    offre_id = db.Column(db.Integer, db.ForeignKey('offres_emploi.id', ondelete='CASCADE'), nullable=False)
+    candidat_id = db.Column(db.Integer, db.ForeignKey('candidats.id', ondelete='CASCADE'), nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    justification = db.Column(db.String(200), nullable=False)
+    source = db.Column(db.String(50), nullable=False)
+    scorer_version = db.Column(db.String(20), nullable=False)
+    input_hash = db.Column(db.String(64), nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    candidature = db.relationship('Candidature', back_populates='match_score')
+    
+    __table_args__ = (
+        # Liste des candidats d'une offre triée par score
+        db.Index('ix_match_scores_offre_score', 'offre_id', 'score'),
+        db.Index('ix_match_scores_candidat', 'candidat_id'),
+    )
+    
+    def __repr__(self):
+        return f'<MatchScore {self.candidat_id} -> {self.offre_id}: {self.score}>'
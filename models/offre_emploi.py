@@ -10,9 +10,17 @@ class OffreEmploi(db.Model):
     competences = db.Column(db.JSON, nullable=False)
     salaire = db.Column(db.Float, nullable=False)
     date_creation = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Utiliser lazy='dynamic' et back_populates
     candidatures = db.relationship('Candidature', back_populates='offre', lazy='dynamic', cascade='all, delete-orphan')
     
+    # Index composite pour la pagination par clé (date_creation, id)
+    __table_args__ = (
+        db.Index('ix_offres_date_creation_id', 'date_creation', 'id'),
+        # max(updated_at) pour la version de la table (ETag des listes)
+        db.Index('ix_offres_updated_at', 'updated_at'),
+    )
+    
     def __repr__(self):
         return f'<OffreEmploi {self.titre}>'
\ No newline at end of file
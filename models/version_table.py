@@ -0,0 +1,15 @@
+from models import db
+
+class VersionTable(db.Model):
+    """
+    Compteur de suppressions d'une table, incrémenté par un trigger
+    (services/utils/etag.py) : avec max(id) et max(updated_at), il donne
+    la version de la table sans la parcourir
+    """
+    __tablename__ = 'versions_tables'
+
+    nom = db.Column(db.String(50), primary_key=True)
+    suppressions = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<VersionTable {self.nom} {self.suppressions}>'
@@ -4,12 +4,24 @@ def register_blueprints(app):
     from routes.candidat_routes import candidat_bp   # Routes des candidats
     from routes.offre_routes import offre_bp         # Routes des offres
     from routes.candidature_routes import candidature_bp  # Routes des candidatures
+    from routes.ai_routes import ai_bp               # Routes du service IA
+    from routes.export_routes import export_bp       # Export en flux
+    from routes.internal_routes import internal_bp   # Routes internes (pool, supervision)
+    from routes.job_routes import job_bp             # Jobs d'analyse asynchrones
     
     app.register_blueprint(candidat_bp, url_prefix='/api')  # Enregistrement candidats
     app.register_blueprint(offre_bp, url_prefix='/api')     # Enregistrement offres
     app.register_blueprint(candidature_bp, url_prefix='/api')  # Enregistrement candidatures
+    app.register_blueprint(ai_bp, url_prefix='/api')           # Enregistrement service IA
+    app.register_blueprint(export_bp, url_prefix='/api')       # Enregistrement export
+    app.register_blueprint(internal_bp, url_prefix='/api')     # Enregistrement routes internes
+    app.register_blueprint(job_bp, url_prefix='/api')          # Enregistrement jobs
     
     print("✅ Routes enregistrées:")
     print("   - GET/POST /api/candidates")
     print("   - GET/POST /api/offers")
     print("   - POST /api/apply")
+    print("   - GET /api/ai/cache/stats")
+    print("   - GET /api/jobs/<id>")
+    print("   - GET /api/export/<entity>")
+    print("   - GET /api/internal/db/pool")
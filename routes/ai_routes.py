@@ -0,0 +1,95 @@
+from flask import Blueprint, jsonify
+from services.ai_service import analysis_cache, gemini_breaker
+from services.tfidf_engine import TfidfEngine, tfidf_engine, reconstruire_moteur
+from services.utils.acces_interne import acces_interne
+
+# Blueprint pour les routes d'administration du service IA
+ai_bp = Blueprint('ai', __name__)
+
+# ========================================
+# GET - Statistiques du cache d'analyses
+# ========================================
+@ai_bp.route('/ai/cache/stats', methods=['GET'])
+def cache_stats():
+    """GET /api/ai/cache/stats - Hits, misses et taille du cache"""
+    return jsonify({
+        "success": True,
+        "cache": analysis_cache.stats()
+    }), 200
+
+# ========================================
+# DELETE - Vider le cache d'analyses
+# ========================================
+@ai_bp.route('/ai/cache', methods=['DELETE'])
+@acces_interne
+def vider_cache():
+    """DELETE /api/ai/cache - Vider le cache d'analyses"""
+    analysis_cache.vider()
+    
+    return jsonify({
+        "success": True,
+        "message": "Cache des analyses vidé"
+    }), 200
+
+
+# ========================================
+# GET - État du disjoncteur Gemini
+# ========================================
+@ai_bp.route('/ai/breaker', methods=['GET'])
+def breaker_stats():
+    """GET /api/ai/breaker - État du disjoncteur (closed, open, half-open)"""
+    return jsonify({
+        "success": True,
+        "breaker": gemini_breaker.stats()
+    }), 200
+
+# ========================================
+# POST - Réarmer le disjoncteur Gemini
+# ========================================
+@ai_bp.route('/ai/breaker/reset', methods=['POST'])
+@acces_interne
+def reset_breaker():
+    """POST /api/ai/breaker/reset - Refermer le circuit (ex: après changement de clé)"""
+    gemini_breaker.reinitialiser()
+    
+    return jsonify({
+        "success": True,
+        "breaker": gemini_breaker.stats()
+    }), 200
+
+# ========================================
+# GET - État du moteur TF-IDF
+# ========================================
+@ai_bp.route('/ai/tfidf', methods=['GET'])
+def tfidf_stats():
+    """GET /api/ai/tfidf - Taille du vocabulaire et de la matrice TF-IDF"""
+    return jsonify({
+        "success": True,
+        "tfidf": tfidf_engine.stats()
+    }), 200
+
+# ========================================
+# POST - Reconstruire le moteur TF-IDF
+# ========================================
+@ai_bp.route('/ai/tfidf/rebuild', methods=['POST'])
+@acces_interne
+def tfidf_rebuild():
+    """POST /api/ai/tfidf/rebuild - Recalcul complet du vocabulaire, de l'IDF et de la matrice"""
+    if not TfidfEngine.disponible():
+        return jsonify({
+            "success": False,
+            "error": "Moteur TF-IDF indisponible : installer numpy et scipy"
+        }), 503
+    
+    try:
+        reconstruire_moteur()
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+    
+    return jsonify({
+        "success": True,
+        "tfidf": tfidf_engine.stats()
+    }), 200
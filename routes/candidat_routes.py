@@ -1,9 +1,24 @@
 from flask import Blueprint, request, jsonify
 from models import db
 from models.candidat import Candidat
-from schemas.candidat_schema import candidat_schema, candidats_schema
+from models.offre_emploi import OffreEmploi
+from schemas.candidat_schema import (
+    CandidatSchema, candidat_schema, candidats_schema, candidats_bulk_schema, candidat_serialiseur
+)
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
+from services.ai_service import AIService
+from services.match_score_service import MatchScoreService
+from services.search_service import SearchService
+from services.skill_index_service import SkillIndexService
+from services.tfidf_engine import notifier_candidats, notifier_suppression
+from services.bulk_import import BulkImportError, lire_lignes, importer
+from services.utils.pagination import PaginationError, lire_limite, paginer_keyset, total_demande
+from services.utils.etag import etag_liste, etag_entite, non_modifie, reponse_304, avec_etag
+from services.utils.serialisation import reponse_json
+from services.utils.champs import ChampsError, lire_champs, schema_restreint
+from services.utils.query_budget import budget_requetes
+from config import Config
 
 # Blueprint pour les routes liées aux candidats
 candidat_bp = Blueprint('candidat', __name__)
@@ -12,17 +27,109 @@ candidat_bp = Blueprint('candidat', __name__)
 # GET - Liste tous les candidats
 # ========================================
 @candidat_bp.route('/candidates', methods=['GET'])
+@budget_requetes(3)
 def get_all_candidates():
-    # Récupérer tous les candidats
+    # Récupérer une page de candidats (?limit=, ?cursor=, ?total=true)
     try:
-        candidats = Candidat.query.order_by(Candidat.date_inscription.desc()).all()
+        limite = lire_limite(request.args)
+        serialiseur = candidat_serialiseur.restreindre(lire_champs(request.args, candidat_serialiseur.noms))
+        
+        # Rien n'a changé dans la table depuis la dernière réponse : 304 sans requête de page
+        etag = etag_liste(Candidat)
+        if non_modifie(etag):
+            return reponse_304(etag)
+        
+        # Tuples des seules colonnes demandées (pas d'instances ORM), sérialiseur précompilé
+        lignes, next_cursor = paginer_keyset(
+            db.session.query(*serialiseur.colonnes_requete(Candidat.date_inscription, Candidat.id)),
+            Candidat.date_inscription,
+            Candidat.id,
+            limite,
+            request.args.get('cursor')
+        )
+        
+        reponse = {
+            "success": True,
+            "candidats": serialiseur.dump(lignes),
+            "limit": limite,
+            "next_cursor": next_cursor
+        }
+        
+        # COUNT(*) uniquement sur demande
+        if total_demande(request.args):
+            reponse["total"] = Candidat.query.count()
+        
+        return avec_etag(reponse_json(reponse), etag), 200
+        
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# GET - Recherche plein texte
+# ========================================
+@candidat_bp.route('/candidates/search', methods=['GET'])
+@budget_requetes(3)
+def rechercher_candidats():
+    """GET /api/candidates/search?q= - Recherche par pertinence sur nom, bio et diplôme"""
+    try:
+        q = request.args.get('q', '').strip()
+        
+        if not q:
+            return jsonify({
+                "success": False,
+                "error": "Paramètre q requis"
+            }), 400
+        
+        limite = lire_limite(request.args)
+        page = request.args.get('page', 1, type=int)
+        
+        if page < 1:
+            return jsonify({
+                "success": False,
+                "error": "page doit être positif"
+            }), 400
+        
+        # ?fields= : sortie limitée (only=) et colonnes non demandées jamais lues (load_only)
+        champs = lire_champs(request.args, candidat_serialiseur.noms)
+        if champs:
+            schema = schema_restreint(CandidatSchema, tuple(champs), many=True)
+            colonnes = [getattr(Candidat, champ) for champ in champs]
+        else:
+            schema, colonnes = candidats_schema, None
+        
+        candidats, total = SearchService.rechercher(q, limite, page, colonnes)
         
         return jsonify({
             "success": True,
-            "candidats": candidats_schema.dump(candidats),
-            "total": len(candidats)
+            "candidats": schema.dump(candidats),
+            "total": total,
+            "page": page,
+            "limit": limite
         }), 200
         
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -33,8 +140,49 @@ def get_all_candidates():
 # GET - Obtenir un candidat par ID
 # ========================================
 @candidat_bp.route('/candidates/<int:id>', methods=['GET'])
+@budget_requetes(1)
 def get_candidate(id):
     # Récupérer un candidat par son ID
+    try:
+        serialiseur = candidat_serialiseur.restreindre(lire_champs(request.args, candidat_serialiseur.noms))
+        ligne = db.session.query(
+            *serialiseur.colonnes_requete(Candidat.id, Candidat.updated_at)
+        ).filter(Candidat.id == id).first()
+        
+        if not ligne:
+            return jsonify({
+                "success": False,
+                "error": "Candidat non trouvé"
+            }), 404
+        
+        # Version déjà connue du client : pas de sérialisation
+        etag = etag_entite(Candidat, ligne)
+        if non_modifie(etag):
+            return reponse_304(etag)
+        
+        return avec_etag(reponse_json({
+            "success": True,
+            "candidat": serialiseur.dump_un(ligne)
+        }), etag), 200
+        
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# GET - Offres recommandées pour un candidat
+# ========================================
+@candidat_bp.route('/candidates/<int:id>/recommended-offers', methods=['GET'])
+@budget_requetes(3)
+def offres_recommandees(id):
+    """GET /api/candidates/<id>/recommended-offers?k= - Top-k des offres les plus adaptées"""
     try:
         candidat = Candidat.query.get(id)
         
@@ -44,9 +192,40 @@ def get_candidate(id):
                 "error": "Candidat non trouvé"
             }), 404
         
+        k = request.args.get('k', 10, type=int)
+        
+        if k < 1 or k > Config.API_MAX_PAGE_SIZE:
+            return jsonify({
+                "success": False,
+                "error": f"k doit être compris entre 1 et {Config.API_MAX_PAGE_SIZE}"
+            }), 400
+        
+        # 1. Présélection par les compétences communes (index inversé)
+        proches = SkillIndexService.offres_proches(id, max(k, Config.RECO_SHORTLIST_SIZE))
+        communes = dict(proches)
+        offres = OffreEmploi.query.filter(OffreEmploi.id.in_(list(communes))).all()
+        
+        # 2. Rescoring de la présélection uniquement, top-k par tas
+        top = AIService.recommander_offres(candidat, offres, k)
+        
         return jsonify({
             "success": True,
-            "candidat": candidat_schema.dump(candidat)
+            "candidat": {
+                "id": candidat.id,
+                "nom": candidat.nom
+            },
+            "offres": [
+                {
+                    "id": offre.id,
+                    "titre": offre.titre,
+                    "salaire": offre.salaire,
+                    "score": analyse["score"],
+                    "justification": analyse["justification"],
+                    "termes_communs": communes[offre.id]
+                }
+                for offre, analyse in top
+            ],
+            "offres_evaluees": len(offres)
         }), 200
         
     except Exception as e:
@@ -92,6 +271,10 @@ def creer_candidat():
         db.session.add(candidat)
         db.session.commit()
         
+        # Indexer les compétences de la bio
+        SkillIndexService.indexer_candidats([candidat.id])
+        notifier_candidats([candidat.id])
+        
         return jsonify({
             "success": True,
             "message": "Candidat créé avec succès",
@@ -134,6 +317,9 @@ def update_candidate(id):
                 "error": "Données JSON requises"
             }), 400
         
+        # Valeurs des champs utilisés par l'analyse IA avant modification
+        avant = AIService.champs_candidat(candidat)
+        
         # Mise à jour des champs autorisés
         if 'nom' in json_data:
             candidat.nom = json_data['nom']
@@ -156,6 +342,13 @@ def update_candidate(id):
         
         db.session.commit()
         
+        # Purger le cache et recalculer les scores si un champ analysé a changé
+        if AIService.champs_candidat(candidat) != avant:
+            AIService.invalider_candidat(candidat.id)
+            MatchScoreService.recalculer_candidat(candidat)
+            SkillIndexService.indexer_candidats([candidat.id])
+            notifier_candidats([candidat.id])
+        
         return jsonify({
             "success": True,
             "message": "Candidat mis à jour",
@@ -185,9 +378,13 @@ def delete_candidate(id):
             }), 404
         
         nom = candidat.nom
+        SkillIndexService.supprimer_candidat(id)
         db.session.delete(candidat)
         db.session.commit()
         
+        AIService.invalider_candidat(id)
+        notifier_suppression(id)
+        
         return jsonify({
             "success": True,
             "message": f"Candidat '{nom}' supprimé avec succès"
@@ -199,3 +396,38 @@ def delete_candidate(id):
             "success": False,
             "error": str(e)
         }), 500
+
+# ========================================
+# POST - Import en masse de candidats
+# ========================================
+@candidat_bp.route('/candidates/bulk', methods=['POST'])
+def import_candidats():
+    """POST /api/candidates/bulk - Import d'un tableau JSON ou d'un flux NDJSON"""
+    try:
+        lignes, erreurs_lecture = lire_lignes(request, Config.API_MAX_BULK_ROWS)
+        
+        ids_crees, erreurs = importer(Candidat, candidats_bulk_schema, lignes, cle_unique='email')
+        SkillIndexService.indexer_candidats(ids_crees)
+        notifier_candidats(ids_crees)
+        erreurs = sorted(erreurs_lecture + erreurs, key=lambda erreur: erreur["ligne"])
+        
+        return jsonify({
+            "success": len(ids_crees) > 0 or not erreurs,
+            "message": f"{len(ids_crees)} candidats créés",
+            "crees": len(ids_crees),
+            "ids": ids_crees,
+            "erreurs": erreurs,
+            "nombre_erreurs": len(erreurs)
+        }), 201 if ids_crees else (400 if erreurs else 200)
+        
+    except BulkImportError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
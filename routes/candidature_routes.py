@@ -4,6 +4,7 @@ from models.candidature import Candidature
 from models.candidat import Candidat
 from models.offre_emploi import OffreEmploi
 from schemas.candidature_schema import candidature_schema
+from services.match_score_service import MatchScoreService
 from sqlalchemy.exc import IntegrityError
 
 candidature_bp = Blueprint('candidature', __name__)
@@ -67,6 +68,10 @@ def soumettre_candidature():
         )
         
         db.session.add(candidature)
+        
+        # Score de compatibilité persisté avec la candidature
+        MatchScoreService.calculer(candidature, offre, candidat)
+        
         db.session.commit()
         
         return jsonify({
@@ -140,6 +145,10 @@ def postuler_offre(offre_id):
         )
         
         db.session.add(candidature)
+        
+        # Score de compatibilité persisté avec la candidature
+        MatchScoreService.calculer(candidature, offre, candidat)
+        
         db.session.commit()
         
         return jsonify({
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from models import db
+from models.candidat import Candidat
+from models.offre_emploi import OffreEmploi
+from models.candidature import Candidature
+from services.utils.champs import ChampsError, lire_champs
+
+# Blueprint pour l'export des données en flux
+export_bp = Blueprint('export', __name__)
+
+# Lignes lues par aller-retour avec le curseur serveur
+TAILLE_LOT = 1000
+
+# Entité exportée -> (colonnes, colonne de date pour ?since=)
+ENTITES = {
+    'candidates': (
+        [Candidat.id, Candidat.nom, Candidat.email, Candidat.bio, Candidat.diplome, Candidat.date_inscription],
+        Candidat.date_inscription
+    ),
+    'offers': (
+        [OffreEmploi.id, OffreEmploi.titre, OffreEmploi.description, OffreEmploi.competences,
+         OffreEmploi.salaire, OffreEmploi.date_creation],
+        OffreEmploi.date_creation
+    ),
+    'candidatures': (
+        [Candidature.id, Candidature.candidat_id, Candidature.offre_id, Candidature.date_depot],
+        Candidature.date_depot
+    )
+}
+
+
+def _valeur(valeur, csv_mode=False):
+    # Conversion d'une valeur de colonne en type sérialisable
+    if isinstance(valeur, datetime):
+        return valeur.isoformat()
+    if csv_mode and isinstance(valeur, list):
+        return json.dumps(valeur, ensure_ascii=False)
+    return valeur
+
+
+def _generer_ndjson(lignes, noms):
+    tampon = []
+    for ligne in lignes:
+        tampon.append(json.dumps(
+            {nom: _valeur(valeur) for nom, valeur in zip(noms, ligne)},
+            ensure_ascii=False
+        ))
+        if len(tampon) >= TAILLE_LOT:
+            yield "\n".join(tampon) + "\n"
+            tampon = []
+    if tampon:
+        yield "\n".join(tampon) + "\n"
+
+
+def _generer_csv(lignes, noms):
+    tampon = io.StringIO()
+    writer = csv.writer(tampon)
+    writer.writerow(noms)
+
+    for i, ligne in enumerate(lignes, start=1):
+        writer.writerow([_valeur(valeur, csv_mode=True) for valeur in ligne])
+        if i % TAILLE_LOT == 0:
+            yield tampon.getvalue()
+            tampon.seek(0)
+            tampon.truncate(0)
+
+    yield tampon.getvalue()
+
+
+# ========================================
+# GET - Export en flux NDJSON ou CSV
+# ========================================
+@export_bp.route('/export/<entity>', methods=['GET'])
+def exporter(entity):
+    """GET /api/export/<entity>?format=ndjson|csv&since=<date ISO>&fields= - Export en flux"""
+    if entity not in ENTITES:
+        return jsonify({
+            "success": False,
+            "error": f"Entité inconnue, valeurs possibles : {', '.join(ENTITES)}"
+        }), 404
+
+    format_export = request.args.get('format', 'ndjson')
+    if format_export not in ('ndjson', 'csv'):
+        return jsonify({
+            "success": False,
+            "error": "format doit valoir 'ndjson' ou 'csv'"
+        }), 400
+
+    colonnes, colonne_date = ENTITES[entity]
+    colonne_id = colonnes[0]
+    
+    # ?fields= : seules les colonnes demandées sont lues et exportées
+    try:
+        champs = lire_champs(request.args, [colonne.key for colonne in colonnes])
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    if champs:
+        colonnes = [colonne for colonne in colonnes if colonne.key in champs]
+    
+    query = db.session.query(*colonnes)
+
+    since = request.args.get('since')
+    if since:
+        try:
+            query = query.filter(colonne_date >= datetime.fromisoformat(since))
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error": "since doit être une date ISO 8601"
+            }), 400
+
+    # Curseur côté serveur : les lignes arrivent par lots, jamais toutes en mémoire
+    lignes = query.order_by(colonne_id).yield_per(TAILLE_LOT)
+    noms = [colonne.key for colonne in colonnes]
+
+    if format_export == 'csv':
+        generateur = _generer_csv(lignes, noms)
+        mimetype = 'text/csv'
+    else:
+        generateur = _generer_ndjson(lignes, noms)
+        mimetype = 'application/x-ndjson'
+
+    return Response(
+        stream_with_context(generateur),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={entity}.{format_export}"}
+    )
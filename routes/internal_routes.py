@@ -0,0 +1,40 @@
+from flask import Blueprint, jsonify
+from models import db
+from services.db_pool import pool_metrics, stats_pool
+from services.utils.acces_interne import refuser_acces_interne
+
+# Blueprint des routes internes d'exploitation (dimensionnement, supervision)
+internal_bp = Blueprint('internal', __name__)
+
+
+@internal_bp.before_request
+def verifier_jeton():
+    # Jeton X-Internal-Token exigé si défini ; sans jeton, routes désactivées en production
+    return refuser_acces_interne()
+
+# ========================================
+# GET - État du pool de connexions
+# ========================================
+@internal_bp.route('/internal/db/pool', methods=['GET'])
+def pool_stats():
+    """
+    GET /api/internal/db/pool - Connexions ouvertes, empruntées, overflow,
+    attentes au checkout (histogramme) et timeouts du worker courant
+    """
+    return jsonify({
+        "success": True,
+        "pool": stats_pool(db.engine)
+    }), 200
+
+# ========================================
+# POST - Remettre les compteurs à zéro
+# ========================================
+@internal_bp.route('/internal/db/pool/reset', methods=['POST'])
+def pool_reset():
+    """POST /api/internal/db/pool/reset - Remise à zéro des compteurs (pas du pool)"""
+    pool_metrics.reinitialiser()
+    
+    return jsonify({
+        "success": True,
+        "pool": stats_pool(db.engine)
+    }), 200
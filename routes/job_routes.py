@@ -0,0 +1,49 @@
+from flask import Blueprint, jsonify
+from services.analysis_jobs import EN_ATTENTE, EN_COURS, file_jobs
+
+# Blueprint des jobs d'analyse asynchrones (?async=1 sur analyze-match / analyze-batch)
+job_bp = Blueprint('job', __name__)
+
+# Secondes conseillées au client entre deux lectures d'un job actif
+RETRY_AFTER_JOB_ACTIF = 2
+
+# ========================================
+# GET - État de la file des jobs
+# ========================================
+@job_bp.route('/jobs/stats', methods=['GET'])
+def jobs_stats():
+    """GET /api/jobs/stats - Jobs en file, par statut, refus (file pleine) et déduplications"""
+    return jsonify({
+        "success": True,
+        "jobs": file_jobs().stats()
+    }), 200
+
+# ========================================
+# GET - Statut et résultat d'un job
+# ========================================
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """GET /api/jobs/<id> - Statut (en_attente, en_cours, termine, echec) et résultat"""
+    try:
+        job = file_jobs().obtenir(job_id)
+        
+        if job is None:
+            return jsonify({
+                "success": False,
+                "error": "Job non trouvé (inconnu ou expiré)"
+            }), 404
+        
+        entetes = {}
+        if job["statut"] in (EN_ATTENTE, EN_COURS):
+            entetes["Retry-After"] = str(RETRY_AFTER_JOB_ACTIF)
+        
+        return jsonify({
+            "success": True,
+            "job": job
+        }), 200, entetes
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
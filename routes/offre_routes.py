@@ -3,28 +3,169 @@ from models import db
 from models.offre_emploi import OffreEmploi
 from models.candidat import Candidat
 from models.candidature import Candidature
-from schemas.offre_schema import offre_schema, offres_schema
+from models.match_score import MatchScore
+from schemas.offre_schema import offre_schema, offres_bulk_schema, offre_serialiseur
 from schemas.candidat_schema import candidats_schema
 from marshmallow import ValidationError
-from services.ai_service import AIService
+from services.ai_service import AIService, MOTEURS
+from services.tfidf_engine import TfidfIndisponible
+from services.match_score_service import MatchScoreService
+from services.skill_index_service import SkillIndexService, signaler_retro_indexation
+from services.bulk_import import BulkImportError, lire_lignes, importer
+from services.analysis_jobs import FileSaturee, file_jobs
+from services.offre_stats_service import OffreStatsError, OffreStatsService
+from services.utils.pagination import PaginationError, lire_limite, lire_page, paginer_keyset, total_demande
+from services.utils.etag import etag_liste, etag_entite, non_modifie, reponse_304, avec_etag
+from services.utils.serialisation import reponse_json
+from services.utils.champs import ChampsError, lire_champs
+from services.utils.query_budget import budget_requetes, passer_en_asynchrone
+from config import Config
 
 offre_bp = Blueprint('offre', __name__)
 
+# Nombre maximum de candidats par appel à analyze-batch
+MAX_ANALYSES_PAR_LOT = 100
+# Nombre maximum d'offres dans top_offres (GET /offers/stats)
+MAX_TOP_OFFRES = 100
+# Secondes conseillées au client (Retry-After) quand la file des jobs est pleine
+RETRY_AFTER_FILE_PLEINE = 5
+
+# Champs de GET /offers/<id>/candidates -> colonne lue (?fields= n'en sélectionne qu'une partie)
+CHAMPS_CANDIDATS_OFFRE = {
+    "id": Candidat.id,
+    "nom": Candidat.nom,
+    "email": Candidat.email,
+    "bio": Candidat.bio,
+    "diplome": Candidat.diplome,
+    "date_candidature": Candidature.date_depot,
+    "score": MatchScore.score
+}
+
 # ========================================
 # GET - Liste toutes les offres
 # ========================================
 @offre_bp.route('/offers', methods=['GET'])
+@budget_requetes(3)
 def get_all_offers():
-    """GET /api/offers - Récupérer toutes les offres"""
+    """GET /api/offers - Récupérer une page d'offres (?limit=, ?cursor=, ?total=true)"""
+    try:
+        limite = lire_limite(request.args)
+        serialiseur = offre_serialiseur.restreindre(lire_champs(request.args, offre_serialiseur.noms))
+        
+        # Rien n'a changé dans la table depuis la dernière réponse : 304 sans requête de page
+        etag = etag_liste(OffreEmploi)
+        if non_modifie(etag):
+            return reponse_304(etag)
+        
+        # Tuples des seules colonnes demandées (pas d'instances ORM), sérialiseur précompilé
+        lignes, next_cursor = paginer_keyset(
+            db.session.query(*serialiseur.colonnes_requete(OffreEmploi.date_creation, OffreEmploi.id)),
+            OffreEmploi.date_creation,
+            OffreEmploi.id,
+            limite,
+            request.args.get('cursor')
+        )
+        
+        reponse = {
+            "success": True,
+            "offres": serialiseur.dump(lignes),
+            "limit": limite,
+            "next_cursor": next_cursor
+        }
+        
+        # COUNT(*) uniquement sur demande
+        if total_demande(request.args):
+            reponse["total"] = OffreEmploi.query.count()
+        
+        return avec_etag(reponse_json(reponse), etag), 200
+        
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# GET - Statistiques de toutes les offres
+# ========================================
+@offre_bp.route('/offers/stats', methods=['GET'])
+@budget_requetes(1)
+def stats_offres():
+    """
+    GET /api/offers/stats - Compteurs, candidatures par jour, tranches de
+    salaire, distribution des scores et offres les plus demandées
+    ?depuis=AAAA-MM-JJ&jusqu_a=AAAA-MM-JJ (30 derniers jours), ?top=10
+    """
+    try:
+        depuis, jusqu_a = OffreStatsService.lire_periode(request.args)
+        
+        try:
+            top = int(request.args.get('top', 10))
+        except ValueError:
+            top = 0
+        if not 1 <= top <= MAX_TOP_OFFRES:
+            return jsonify({
+                "success": False,
+                "error": f"top doit être un entier entre 1 et {MAX_TOP_OFFRES}"
+            }), 400
+        
+        return jsonify({
+            "success": True,
+            "stats": OffreStatsService.stats_globales(depuis, jusqu_a, top)
+        }), 200
+        
+    except OffreStatsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# GET - Statistiques d'une offre
+# ========================================
+@offre_bp.route('/offers/<int:id>/stats', methods=['GET'])
+@budget_requetes(1)
+def stats_offre(id):
+    """
+    GET /api/offers/<id>/stats - Candidatures (total et par jour) et
+    distribution des scores de l'offre
+    ?depuis=AAAA-MM-JJ&jusqu_a=AAAA-MM-JJ (30 derniers jours)
+    """
     try:
-        offres = OffreEmploi.query.order_by(OffreEmploi.date_creation.desc()).all()
+        depuis, jusqu_a = OffreStatsService.lire_periode(request.args)
+        stats = OffreStatsService.stats_offre(id, depuis, jusqu_a)
+        
+        if stats is None:
+            return jsonify({
+                "success": False,
+                "error": "Offre non trouvée"
+            }), 404
         
         return jsonify({
             "success": True,
-            "offres": offres_schema.dump(offres),
-            "total": len(offres)
+            "stats": stats
         }), 200
         
+    except OffreStatsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -35,22 +176,36 @@ def get_all_offers():
 # GET - Obtenir une offre par ID
 # ========================================
 @offre_bp.route('/offers/<int:id>', methods=['GET'])
+@budget_requetes(1)
 def get_offer(id):
     """GET /api/offers/<id> - Récupérer une offre"""
     try:
-        offre = OffreEmploi.query.get(id)
+        serialiseur = offre_serialiseur.restreindre(lire_champs(request.args, offre_serialiseur.noms))
+        ligne = db.session.query(
+            *serialiseur.colonnes_requete(OffreEmploi.id, OffreEmploi.updated_at)
+        ).filter(OffreEmploi.id == id).first()
         
-        if not offre:
+        if not ligne:
             return jsonify({
                 "success": False,
                 "error": "Offre non trouvée"
             }), 404
         
-        return jsonify({
+        # Version déjà connue du client : pas de sérialisation
+        etag = etag_entite(OffreEmploi, ligne)
+        if non_modifie(etag):
+            return reponse_304(etag)
+        
+        return avec_etag(reponse_json({
             "success": True,
-            "offre": offre_schema.dump(offre)
-        }), 200
+            "offre": serialiseur.dump_un(ligne)
+        }), etag), 200
         
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -84,6 +239,11 @@ def creer_offre():
         db.session.add(offre)
         db.session.commit()
         
+        # Représentation de l'offre ; bios existantes parcourues en arrière-plan
+        # pour les nouvelles compétences
+        if SkillIndexService.indexer_offres([offre.id]):
+            signaler_retro_indexation()
+        
         return jsonify({
             "success": True,
             "message": "Offre créée avec succès",
@@ -120,6 +280,9 @@ def update_offer(id):
                 "error": "Données JSON requises"
             }), 400
         
+        # Valeurs des champs utilisés par l'analyse IA avant modification
+        avant = AIService.champs_offre(offre)
+        
         if 'titre' in json_data:
             offre.titre = json_data['titre']
         if 'description' in json_data:
@@ -131,6 +294,14 @@ def update_offer(id):
         
         db.session.commit()
         
+        # Purger le cache et recalculer les scores si un champ analysé a changé
+        if AIService.champs_offre(offre) != avant:
+            AIService.invalider_offre(offre.id)
+            MatchScoreService.recalculer_offre(offre)
+            if SkillIndexService.indexer_offres([offre.id]):
+                signaler_retro_indexation()
+            OffreStatsService.invalider_offre(offre.id)
+        
         return jsonify({
             "success": True,
             "message": "Offre mise à jour",
@@ -160,9 +331,13 @@ def delete_offer(id):
             }), 404
         
         titre = offre.titre
+        SkillIndexService.supprimer_offre(id)
         db.session.delete(offre)
         db.session.commit()
         
+        AIService.invalider_offre(id)
+        OffreStatsService.invalider_offre(id)
+        
         return jsonify({
             "success": True,
             "message": f"Offre '{titre}' supprimée avec succès"
@@ -179,8 +354,193 @@ def delete_offer(id):
 # GET - Candidats d'une offre
 # ========================================
 @offre_bp.route('/offers/<int:id>/candidates', methods=['GET'])
+@budget_requetes(3)
 def liste_candidats_offre(id):
-    """GET /api/offers/<id>/candidates - Liste les candidats d'une offre"""
+    """
+    GET /api/offers/<id>/candidates - Liste les candidats d'une offre
+    ?tri=date_depot|score&ordre=asc|desc&score_min=&page=&limit=&fields=
+    (nombre_candidats uniquement avec ?total=true)
+    """
+    try:
+        offre = db.session.query(OffreEmploi.id, OffreEmploi.titre).filter(OffreEmploi.id == id).first()
+        
+        if not offre:
+            return jsonify({
+                "success": False,
+                "error": "Offre non trouvée"
+            }), 404
+        
+        tri = request.args.get('tri', 'date_depot')
+        ordre = request.args.get('ordre', 'desc')
+        page = lire_page(request.args)
+        limite = lire_limite(request.args)
+        
+        if tri not in ('date_depot', 'score') or ordre not in ('asc', 'desc'):
+            return jsonify({
+                "success": False,
+                "error": "tri doit valoir 'date_depot' ou 'score', ordre 'asc' ou 'desc'"
+            }), 400
+        
+        score_min = request.args.get('score_min')
+        if score_min is not None:
+            try:
+                score_min = int(score_min)
+            except ValueError:
+                return jsonify({
+                    "success": False,
+                    "error": "score_min doit être un entier"
+                }), 400
+        
+        # ?fields= : seules les colonnes demandées sont lues (bio comprise)
+        champs = lire_champs(request.args, list(CHAMPS_CANDIDATS_OFFRE)) or list(CHAMPS_CANDIDATS_OFFRE)
+        
+        # Une seule requête : candidature + candidat + score, colonnes utiles uniquement
+        query = db.session.query(
+            *[CHAMPS_CANDIDATS_OFFRE[champ] for champ in champs]
+        ).select_from(
+            Candidature
+        ).join(
+            Candidat, Candidat.id == Candidature.candidat_id
+        ).outerjoin(
+            MatchScore, MatchScore.candidature_id == Candidature.id
+        ).filter(Candidature.offre_id == id)
+        
+        if score_min is not None:
+            query = query.filter(MatchScore.score >= score_min)
+        
+        if tri == 'score':
+            # Utilise l'index (offre_id, score) de match_scores
+            colonne = MatchScore.score
+        else:
+            # Utilise l'index (offre_id, date_depot) de candidatures
+            colonne = Candidature.date_depot
+        
+        if ordre == 'desc':
+            query = query.order_by(colonne.desc(), Candidature.id.desc())
+        else:
+            query = query.order_by(colonne.asc(), Candidature.id.asc())
+        
+        lignes = query.limit(limite).offset((page - 1) * limite).all()
+        
+        candidats = [dict(zip(champs, ligne)) for ligne in lignes]
+        if "date_candidature" in champs:
+            for candidat in candidats:
+                if candidat["date_candidature"]:
+                    candidat["date_candidature"] = candidat["date_candidature"].isoformat()
+        
+        reponse = {
+            "success": True,
+            "offre": {
+                "id": offre.id,
+                "titre": offre.titre
+            },
+            "candidats": candidats,
+            "page": page,
+            "limit": limite
+        }
+        
+        # COUNT(*) uniquement sur demande
+        if total_demande(request.args):
+            reponse["nombre_candidats"] = query.order_by(None).count()
+        
+        return jsonify(reponse), 200
+        
+    except ChampsError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# GET - Candidats suggérés par l'index des compétences
+# ========================================
+@offre_bp.route('/offers/<int:id>/suggested-candidates', methods=['GET'])
+@budget_requetes(5)
+def candidats_suggeres(id):
+    """GET /api/offers/<id>/suggested-candidates?k= - Candidats couvrant au moins k compétences"""
+    try:
+        offre = db.session.query(
+            OffreEmploi.id, OffreEmploi.titre, OffreEmploi.competences
+        ).filter(OffreEmploi.id == id).first()
+        
+        if not offre:
+            return jsonify({
+                "success": False,
+                "error": "Offre non trouvée"
+            }), 404
+        
+        k = request.args.get('k', 1, type=int)
+        limite = lire_limite(request.args)
+        
+        if k < 1:
+            return jsonify({
+                "success": False,
+                "error": "k doit être positif"
+            }), 400
+        
+        # Index inversé : aucun parcours de la table des candidats
+        suggestions = SkillIndexService.suggerer(offre.competences, k=k, limite=limite)
+        ids = [candidat_id for candidat_id, _ in suggestions]
+        
+        candidats = {
+            ligne.id: ligne
+            for ligne in db.session.query(
+                Candidat.id, Candidat.nom, Candidat.email, Candidat.diplome
+            ).filter(Candidat.id.in_(ids))
+        }
+        termes = SkillIndexService.termes_couverts(ids, offre.competences)
+        
+        return jsonify({
+            "success": True,
+            "offre": {
+                "id": offre.id,
+                "titre": offre.titre,
+                "competences": offre.competences
+            },
+            "candidats": [
+                {
+                    "id": candidat_id,
+                    "nom": candidats[candidat_id].nom,
+                    "email": candidats[candidat_id].email,
+                    "diplome": candidats[candidat_id].diplome,
+                    "couverture": couverture,
+                    "competences_couvertes": sorted(termes.get(candidat_id, []))
+                }
+                for candidat_id, couverture in suggestions
+                if candidat_id in candidats
+            ],
+            "k": k
+        }), 200
+        
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# GET - Candidats les plus proches (moteur TF-IDF)
+# ========================================
+@offre_bp.route('/offers/<int:id>/similar-candidates', methods=['GET'])
+@budget_requetes(3)
+def candidats_similaires(id):
+    """GET /api/offers/<id>/similar-candidates?limit= - Tous les candidats classés par similarité TF-IDF"""
     try:
         offre = OffreEmploi.query.get(id)
         
@@ -190,22 +550,18 @@ def liste_candidats_offre(id):
                 "error": "Offre non trouvée"
             }), 404
         
-        # Récupérer les candidatures
-        candidatures = Candidature.query.filter_by(offre_id=id).all()
+        limite = lire_limite(request.args)
+        
+        # Un produit matriciel contre la matrice de tous les candidats
+        proches = AIService.candidats_similaires([offre], limite)[0]
+        ids = [candidat_id for candidat_id, _ in proches]
         
-        # Récupérer les candidats
-        candidats = []
-        for candidature in candidatures:
-            candidat = Candidat.query.get(candidature.candidat_id)
-            if candidat:
-                candidats.append({
-                    "id": candidat.id,
-                    "nom": candidat.nom,
-                    "email": candidat.email,
-                    "bio": candidat.bio,
-                    "diplome": candidat.diplome,
-                    "date_candidature": candidature.date_depot.isoformat() if candidature.date_depot else None
-                })
+        candidats = {
+            ligne.id: ligne
+            for ligne in db.session.query(
+                Candidat.id, Candidat.nom, Candidat.email, Candidat.diplome
+            ).filter(Candidat.id.in_(ids))
+        }
         
         return jsonify({
             "success": True,
@@ -213,22 +569,84 @@ def liste_candidats_offre(id):
                 "id": offre.id,
                 "titre": offre.titre
             },
-            "candidats": candidats,
-            "nombre_candidats": len(candidats)
+            "candidats": [
+                {
+                    "id": candidat_id,
+                    "nom": candidats[candidat_id].nom,
+                    "email": candidats[candidat_id].email,
+                    "diplome": candidats[candidat_id].diplome,
+                    "score": score
+                }
+                for candidat_id, score in proches
+                if candidat_id in candidats
+            ],
+            "source": "tfidf"
         }), 200
         
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except TfidfIndisponible as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
+def lire_deterministe(json_data):
+    """
+    Option "deterministe" du corps JSON, en booléen strict
+    (absente : Config.AI_SCORING_DETERMINISTE) ; ValueError si invalide
+    """
+    valeur = json_data.get('deterministe')
+    if valeur is None:
+        return Config.AI_SCORING_DETERMINISTE
+    if isinstance(valeur, bool):
+        return valeur
+    if isinstance(valeur, str) and valeur.lower() in ('1', 'true', 'oui', '0', 'false', 'non'):
+        return valeur.lower() in ('1', 'true', 'oui')
+    raise ValueError("deterministe doit être un booléen")
+
+
+def asynchrone():
+    """?async=1 : l'analyse est mise en file et la route répond 202"""
+    return request.args.get('async', '').lower() in ('1', 'true', 'oui')
+
+
+def soumettre_job(offre_id, candidat_ids, deterministe, moteur):
+    """Réponse 202 avec l'identifiant du job (existant si une analyse identique est en cours)"""
+    passer_en_asynchrone()
+    try:
+        job, nouveau = file_jobs().soumettre(offre_id, candidat_ids, deterministe, moteur)
+    except FileSaturee as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503, {"Retry-After": str(RETRY_AFTER_FILE_PLEINE)}
+    
+    return jsonify({
+        "success": True,
+        "job": job,
+        "deduplique": not nouveau
+    }), 202, {"Location": f"/api/jobs/{job['id']}"}
+
 # ========================================
 # POST - Analyser compatibilité IA
 # ========================================
 @offre_bp.route('/offers/<int:id>/analyze-match', methods=['POST'])
+@budget_requetes(2, asynchrone=5)   # mise en file : 5 avec JOBS_BACKEND=base
 def analyser_compatibilite(id):
-    """POST /api/offers/<id>/analyze-match - Analyse avec IA"""
+    """
+    POST /api/offers/<id>/analyze-match - Analyse avec IA
+    ?async=1 : 202 et identifiant du job, résultat sur GET /api/jobs/<id>
+    """
     try:
         offre = OffreEmploi.query.get(id)
         
@@ -246,6 +664,21 @@ def analyser_compatibilite(id):
                 "error": "candidat_id requis"
             }), 400
         
+        moteur = json_data.get('moteur')
+        if moteur is not None and moteur not in MOTEURS:
+            return jsonify({
+                "success": False,
+                "error": f"moteur doit valoir {' ou '.join(MOTEURS)}"
+            }), 400
+        
+        try:
+            deterministe = lire_deterministe(json_data)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
+        
         candidat_id = json_data['candidat_id']
         candidat = Candidat.query.get(candidat_id)
         
@@ -255,8 +688,15 @@ def analyser_compatibilite(id):
                 "error": "Candidat non trouvé"
             }), 404
         
-        # Appeler le service IA
-        result = AIService.analyser_compatibilite(offre, candidat)
+        if asynchrone():
+            return soumettre_job(offre.id, [candidat.id], deterministe, moteur)
+        
+        # Appeler le service IA (résultat mis en cache)
+        result = AIService.analyser_compatibilite(
+            offre, candidat,
+            deterministe=deterministe,
+            moteur=moteur
+        )
         
         if "error" in result:
             return jsonify({
@@ -277,8 +717,241 @@ def analyser_compatibilite(id):
             "analyse": result
         }), 200
         
+    except TfidfIndisponible as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# POST - Analyser plusieurs candidats en parallèle
+# ========================================
+@offre_bp.route('/offers/<int:id>/analyze-batch', methods=['POST'])
+@budget_requetes(2, asynchrone=5)   # mise en file : 5 avec JOBS_BACKEND=base
+def analyser_lot(id):
+    """
+    POST /api/offers/<id>/analyze-batch - Analyse IA d'une liste de candidats
+    ?async=1 : un seul job pour tout le lot, résultat sur GET /api/jobs/<id>
+    """
+    try:
+        offre = OffreEmploi.query.get(id)
+        
+        if not offre:
+            return jsonify({
+                "success": False,
+                "error": "Offre non trouvée"
+            }), 404
+        
+        json_data = request.get_json()
+        
+        if not json_data or not isinstance(json_data.get('candidat_ids'), list):
+            return jsonify({
+                "success": False,
+                "error": "candidat_ids (liste) requis"
+            }), 400
+        
+        candidat_ids = json_data['candidat_ids']
+        
+        moteur = json_data.get('moteur')
+        if moteur is not None and moteur not in MOTEURS:
+            return jsonify({
+                "success": False,
+                "error": f"moteur doit valoir {' ou '.join(MOTEURS)}"
+            }), 400
+        
+        try:
+            deterministe = lire_deterministe(json_data)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
+        
+        if len(candidat_ids) > MAX_ANALYSES_PAR_LOT:
+            return jsonify({
+                "success": False,
+                "error": f"Maximum {MAX_ANALYSES_PAR_LOT} candidats par lot"
+            }), 400
+        
+        # Candidats introuvables signalés dans le résultat du job (non_trouves)
+        if asynchrone():
+            return soumettre_job(offre.id, candidat_ids, deterministe, moteur)
+        
+        # Charger tous les candidats en une seule requête
+        candidats = Candidat.query.filter(Candidat.id.in_(candidat_ids)).all()
+        trouves = {candidat.id for candidat in candidats}
+        
+        # Appels IA en parallèle (limite Config.AI_MAX_CONCURRENCY)
+        analyses = AIService.analyser_lot(
+            [(offre, candidat) for candidat in candidats],
+            deterministe=deterministe,
+            moteur=moteur
+        )
+        
+        return jsonify({
+            "success": True,
+            "offre": {
+                "id": offre.id,
+                "titre": offre.titre
+            },
+            "analyses": [
+                {
+                    "candidat": {
+                        "id": candidat.id,
+                        "nom": candidat.nom
+                    },
+                    "analyse": analyse
+                }
+                for candidat, analyse in zip(candidats, analyses)
+            ],
+            "non_trouves": [cid for cid in candidat_ids if cid not in trouves]
+        }), 200
+        
+    except TfidfIndisponible as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+# ========================================
+# POST - Classer tous les candidats d'une offre
+# ========================================
+@offre_bp.route('/offers/<int:id>/rank-candidates', methods=['POST'])
+@budget_requetes(2)
+def classer_candidats_offre(id):
+    """POST /api/offers/<id>/rank-candidates - Classement des candidats par score"""
+    try:
+        offre = OffreEmploi.query.get(id)
+        
+        if not offre:
+            return jsonify({
+                "success": False,
+                "error": "Offre non trouvée"
+            }), 404
+        
+        json_data = request.get_json(silent=True) or {}
+        
+        try:
+            top = int(json_data.get('top', 50))
+            page = int(json_data.get('page', 1))
+            per_page = int(json_data.get('per_page', 20))
+        except (TypeError, ValueError):
+            return jsonify({
+                "success": False,
+                "error": "top, page et per_page doivent être des entiers"
+            }), 400
+        
+        if top < 1 or page < 1 or per_page < 1 or per_page > 100:
+            return jsonify({
+                "success": False,
+                "error": "top et page doivent être positifs, per_page entre 1 et 100"
+            }), 400
+        
+        moteur = json_data.get('moteur')
+        if moteur is not None and moteur not in MOTEURS:
+            return jsonify({
+                "success": False,
+                "error": f"moteur doit valoir {' ou '.join(MOTEURS)}"
+            }), 400
+        
+        try:
+            deterministe = lire_deterministe(json_data)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
+        
+        # Charger tous les candidats de l'offre en une seule requête
+        candidats = Candidat.query.join(
+            Candidature, Candidature.candidat_id == Candidat.id
+        ).filter(Candidature.offre_id == id).all()
+        
+        # Scoring local (ou TF-IDF) de tout le lot en une passe
+        classement = AIService.classer_candidats(
+            offre, candidats, top=top, deterministe=deterministe, moteur=moteur
+        )
+        
+        debut = (page - 1) * per_page
+        page_resultats = classement[debut:debut + per_page]
+        
+        return jsonify({
+            "success": True,
+            "offre": {
+                "id": offre.id,
+                "titre": offre.titre
+            },
+            "classement": [
+                {
+                    "rang": debut + i + 1,
+                    "candidat": {
+                        "id": candidat.id,
+                        "nom": candidat.nom
+                    },
+                    "score": analyse["score"],
+                    "justification": analyse["justification"],
+                    "source": analyse["source"]
+                }
+                for i, (candidat, analyse) in enumerate(page_resultats)
+            ],
+            "page": page,
+            "per_page": per_page,
+            "total_classes": len(classement),
+            "nombre_candidats": len(candidats)
+        }), 200
+        
+    except TfidfIndisponible as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# ========================================
+# POST - Import en masse de offres
+# ========================================
+@offre_bp.route('/offers/bulk', methods=['POST'])
+def import_offres():
+    """POST /api/offers/bulk - Import d'un tableau JSON ou d'un flux NDJSON"""
+    try:
+        lignes, erreurs_lecture = lire_lignes(request, Config.API_MAX_BULK_ROWS)
+        
+        ids_crees, erreurs = importer(OffreEmploi, offres_bulk_schema, lignes)
+        if SkillIndexService.indexer_offres(ids_crees):
+            signaler_retro_indexation()
+        erreurs = sorted(erreurs_lecture + erreurs, key=lambda erreur: erreur["ligne"])
+        
+        return jsonify({
+            "success": len(ids_crees) > 0 or not erreurs,
+            "message": f"{len(ids_crees)} offres créées",
+            "crees": len(ids_crees),
+            "ids": ids_crees,
+            "erreurs": erreurs,
+            "nombre_erreurs": len(erreurs)
+        }), 201 if ids_crees else (400 if erreurs else 200)
+        
+    except BulkImportError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
@@ -1,5 +1,6 @@
 from marshmallow import fields, validates, ValidationError, post_load
 from schemas import ma
+from services.utils.serialisation import SerialiseurRapide
 from models.candidat import Candidat
 import re
 
@@ -17,6 +18,7 @@ class CandidatSchema(ma.SQLAlchemyAutoSchema):
     bio = fields.String(required=True)           # Biographie
     diplome = fields.String(required=True)       # Diplôme
     date_inscription = fields.DateTime(dump_only=True)  # Date automatique
+    updated_at = fields.DateTime(dump_only=True)     # Dernière modification
     
     @validates('nom')
     def validate_nom(self, value):
@@ -53,3 +55,9 @@ candidat_schema = CandidatSchema()
 
 # Schéma pour plusieurs candidats
 candidats_schema = CandidatSchema(many=True)
+
+# Schéma pour l'import en masse (dictionnaires, pas d'instances)
+candidats_bulk_schema = CandidatSchema(many=True, load_instance=False)
+
+# Sérialiseur précompilé des lectures (tuples de colonnes, même sortie que candidat_schema)
+candidat_serialiseur = SerialiseurRapide(CandidatSchema(), Candidat)
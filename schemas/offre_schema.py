@@ -1,5 +1,6 @@
 from marshmallow import fields, validates, ValidationError
 from schemas import ma
+from services.utils.serialisation import SerialiseurRapide
 from models.offre_emploi import OffreEmploi
 
 # Schéma Marshmallow pour le modèle OffreEmploi
@@ -15,6 +16,7 @@ class OffreEmploiSchema(ma.SQLAlchemyAutoSchema):
     competences = fields.List(fields.String(), required=True)  # Liste des compétences
     salaire = fields.Float(required=True)        # Salaire proposé
     date_creation = fields.DateTime(dump_only=True)  # Date auto-générée
+    updated_at = fields.DateTime(dump_only=True)     # Dernière modification
     
     @validates('titre')
     def validate_titre(self, value):
@@ -51,3 +53,9 @@ offre_schema = OffreEmploiSchema()
 
 # Schéma pour plusieurs offres
 offres_schema = OffreEmploiSchema(many=True)
+
+# Schéma pour l'import en masse (dictionnaires, pas d'instances)
+offres_bulk_schema = OffreEmploiSchema(many=True, load_instance=False)
+
+# Sérialiseur précompilé des lectures (tuples de colonnes, même sortie que offre_schema)
+offre_serialiseur = SerialiseurRapide(OffreEmploiSchema(), OffreEmploi)
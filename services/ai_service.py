@@ -3,42 +3,252 @@ import json
 import requests
 from dotenv import load_dotenv
 import random
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services.analysis_cache import AnalysisCache
+from services.http_client import get_session
+from services.circuit_breaker import (
+    CircuitBreaker, ECHEC_QUOTA, ECHEC_AUTH, ECHEC_TIMEOUT, ECHEC_ERREUR
+)
+from services.utils.keyword_matcher import KeywordMatcher
+from services.tfidf_engine import obtenir_moteur, texte_offre, texte_candidat
+from services import metrics
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', 'votre_clé_api_gemini_ici')
 
+# Version du scoring local : à incrémenter quand les règles changent
+# pour que les scores persistés soient recalculés
+SCORER_VERSION = "local-1"
+
+# Source des analyses de l'algorithme local (_fallback_analysis)
+SOURCE_LOCALE = "algorithme-local"
+
+# Moteurs de scoring : "auto" = Gemini puis algorithme local, "tfidf" = similarité TF-IDF
+MOTEUR_AUTO = "auto"
+MOTEUR_TFIDF = "tfidf"
+MOTEURS = (MOTEUR_AUTO, MOTEUR_TFIDF)
+
+# ============================================================
+# TABLES DE MOTS-CLÉS DU SCORING LOCAL
+# ============================================================
+DIPLOME_KEYWORDS = {
+    'doctorat': 20,
+    'phd': 20,
+    'master': 20,
+    'ingénieur': 20,
+    'ingenieur': 20,
+    'licence': 15,
+    'bachelor': 15,
+    'bac+5': 20,
+    'bac+4': 18,
+    'bac+3': 15,
+    'bac+2': 12,
+    'bts': 12,
+    'dut': 12,
+    'bac': 10
+}
+
+EXPERIENCE_KEYWORDS = [
+    # Années d'expérience
+    ('10 ans', 25), ('dix ans', 25),
+    ('9 ans', 24), ('neuf ans', 24),
+    ('8 ans', 23), ('huit ans', 23),
+    ('7 ans', 21), ('sept ans', 21),
+    ('6 ans', 19), ('six ans', 19),
+    ('5 ans', 17), ('cinq ans', 17),
+    ('4 ans', 15), ('quatre ans', 15),
+    ('3 ans', 13), ('trois ans', 13),
+    ('2 ans', 11), ('deux ans', 11),
+    ('1 an', 9), ('un an', 9),
+    
+    # Niveaux de séniorité
+    ('expert', 25),
+    ('senior', 22),
+    ('expérimenté', 20),
+    ('confirmé', 18),
+    ('intermédiaire', 14),
+    ('junior', 10),
+    ('débutant', 8),
+    ('stage', 6)
+]
+
+BONUS_KEYWORDS = ['passionné', 'motivé', 'dynamique', 'autonome', 'rigoureux', 'polyvalent']
+
+# Automate compilé une seule fois pour la table des diplômes
+DIPLOME_MATCHER = KeywordMatcher(DIPLOME_KEYWORDS)
+
+# Cache partagé des analyses (clé = empreinte des champs du prompt)
+analysis_cache = AnalysisCache(Config.AI_CACHE_MAX_SIZE, Config.AI_CACHE_TTL)
+
+# Disjoncteur autour des appels Gemini
+gemini_breaker = CircuitBreaker(
+    failure_threshold=Config.AI_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=Config.AI_BREAKER_RECOVERY_TIMEOUT,
+    quota_cooldown=Config.AI_BREAKER_QUOTA_COOLDOWN,
+    auth_cooldown=Config.AI_BREAKER_AUTH_COOLDOWN,
+    nom="gemini"
+)
+
 class AIService:
     
     @staticmethod
-    def analyser_compatibilite(offre, candidat):
+    def analyser_compatibilite(offre, candidat, deterministe=None, utiliser_cache=True, moteur=None):
         """
         Analyse la compatibilité entre une offre et un candidat via Gemini
         Fallback automatique si Gemini n'est pas disponible
+        moteur: "auto" (défaut, Config.AI_SCORING_ENGINE) ou "tfidf"
+        Les résultats sont mis en cache tant que les champs analysés ne changent pas
         """
+        if deterministe is None:
+            deterministe = Config.AI_SCORING_DETERMINISTE
+        if moteur is None:
+            moteur = Config.AI_SCORING_ENGINE
         
-        # Essayer d'abord Gemini si la clé est configurée
-        if GEMINI_API_KEY and GEMINI_API_KEY != "votre_clé_api_gemini_ici":
-            gemini_result = AIService._try_gemini(offre, candidat)
-            
-            # Si Gemini fonctionne, retourner le résultat
-            if gemini_result and "error" not in gemini_result:
-                print("[INFO]  Utilisation de Gemini AI")
-                return gemini_result
-            
-            # Si erreur, afficher et utiliser le fallback
-            if gemini_result and "error" in gemini_result:
+        cle = AnalysisCache.cle(offre, candidat, deterministe, moteur if moteur != MOTEUR_AUTO else None)
+        
+        debut = time.perf_counter()
+        if utiliser_cache:
+            cached = analysis_cache.get(cle)
+            if cached is not None:
+                metrics.observer_analyse("cache", time.perf_counter() - debut)
+                return cached
+        
+        if moteur == MOTEUR_TFIDF:
+            result = AIService._analyses_tfidf(offre, [candidat])[0]
+        else:
+            result = AIService._analyser(offre, candidat, deterministe)
+        metrics.observer_analyse(result.get("source", "erreur"), time.perf_counter() - debut)
+        
+        # Score local avec variation aléatoire : pas de mise en cache (la
+        # variation serait figée pendant tout le TTL)
+        aleatoire = not deterministe and result.get("source") == SOURCE_LOCALE
+        if "error" not in result and not aleatoire:
+            analysis_cache.set(cle, result, offre_id=offre.id, candidat_id=candidat.id)
+        
+        return result
+    
+    @staticmethod
+    def analyser_lot(paires, deterministe=None, concurrence=None, moteur=None):
+        """
+        Analyse une liste de paires (offre, candidat)
+        Les appels Gemini partent en parallèle, au plus `concurrence` à la fois
+        Retourne les analyses dans l'ordre des paires
+        """
+        if concurrence is None:
+            concurrence = Config.AI_MAX_CONCURRENCY
+        if moteur is None:
+            moteur = Config.AI_SCORING_ENGINE
+        
+        if moteur == MOTEUR_TFIDF:
+            return AIService._analyser_lot_tfidf(paires, deterministe)
+        
+        # Sans Gemini, le scoring local est purement CPU : pas de threads
+        if not AIService.gemini_configure() or concurrence <= 1 or len(paires) <= 1:
+            return [
+                AIService.analyser_compatibilite(offre, candidat, deterministe, moteur=moteur)
+                for offre, candidat in paires
+            ]
+        
+        with ThreadPoolExecutor(max_workers=min(concurrence, len(paires))) as executor:
+            return list(executor.map(
+                lambda paire: AIService.analyser_compatibilite(paire[0], paire[1], deterministe, moteur=moteur),
+                paires
+            ))
+    
+    @staticmethod
+    def _analyser_lot_tfidf(paires, deterministe=None):
+        """
+        Analyses TF-IDF d'une liste de paires : les paires absentes du cache
+        sont scorées par un seul produit creux par offre
+        """
+        if deterministe is None:
+            deterministe = Config.AI_SCORING_DETERMINISTE
+        
+        resultats = [None] * len(paires)
+        a_calculer = {}   # offre_id -> (offre, [(position, candidat, clé)])
+        for position, (offre, candidat) in enumerate(paires):
+            debut = time.perf_counter()
+            cle = AnalysisCache.cle(offre, candidat, deterministe, MOTEUR_TFIDF)
+            cached = analysis_cache.get(cle)
+            if cached is not None:
+                metrics.observer_analyse("cache", time.perf_counter() - debut)
+                resultats[position] = cached
+            else:
+                a_calculer.setdefault(offre.id, (offre, []))[1].append((position, candidat, cle))
+        
+        for offre, lot in a_calculer.values():
+            analyses = AIService._analyses_tfidf(offre, [candidat for _, candidat, _ in lot])
+            metrics.compter_analyses("tfidf", len(analyses))
+            for (position, candidat, cle), result in zip(lot, analyses):
+                analysis_cache.set(cle, result, offre_id=offre.id, candidat_id=candidat.id)
+                resultats[position] = result
+        
+        return resultats
+    
+    @staticmethod
+    def gemini_configure():
+        """Vrai si une clé API Gemini a été fournie"""
+        return bool(GEMINI_API_KEY) and GEMINI_API_KEY != "votre_clé_api_gemini_ici"
+    
+    @staticmethod
+    def champs_offre(offre):
+        """Champs de l'offre qui alimentent l'analyse"""
+        return (offre.titre, offre.description, list(offre.competences), offre.salaire)
+    
+    @staticmethod
+    def champs_candidat(candidat):
+        """Champs du candidat qui alimentent l'analyse"""
+        return (candidat.bio, candidat.diplome)
+    
+    @staticmethod
+    def invalider_offre(offre_id):
+        """À appeler quand les champs analysés d'une offre changent"""
+        return analysis_cache.invalider_offre(offre_id)
+    
+    @staticmethod
+    def invalider_candidat(candidat_id):
+        """À appeler quand les champs analysés d'un candidat changent"""
+        return analysis_cache.invalider_candidat(candidat_id)
+    
+    @staticmethod
+    def _analyser(offre, candidat, deterministe=False):
+        """Analyse sans cache : Gemini puis fallback local"""
+        
+        # Essayer d'abord Gemini si la clé est configurée et le circuit fermé
+        if AIService.gemini_configure():
+            if not gemini_breaker.autoriser():
+                print("[INFO]  Circuit Gemini ouvert, appel ignoré")
+            else:
+                gemini_result = AIService._try_gemini(offre, candidat)
+                
+                # Si Gemini fonctionne, retourner le résultat
+                if gemini_result and "error" not in gemini_result:
+                    gemini_breaker.succes()
+                    print("[INFO]  Utilisation de Gemini AI")
+                    return gemini_result
+                
+                # Si erreur, l'enregistrer, l'afficher et utiliser le fallback
+                metrics.compter_echec_gemini(gemini_result.get("echec", ECHEC_ERREUR))
+                gemini_breaker.echec(
+                    gemini_result.get("echec", ECHEC_ERREUR),
+                    message=gemini_result.get("error"),
+                    retry_after=gemini_result.get("retry_after")
+                )
                 print(f"[WARNING]  Gemini non disponible: {gemini_result.get('error')}")
         
         print("[INFO]  Utilisation du mode fallback (algorithme local)")
-        return AIService._fallback_analysis(offre, candidat)
+        return AIService._fallback_analysis(offre, candidat, deterministe=deterministe)
     
     @staticmethod
     def _try_gemini(offre, candidat):
         """Essayer d'appeler Gemini API"""
         try:
             # URL avec le modèle gemini-2.0-flash
-            url = f"https://openrouter.ai/api/v1?key={GEMINI_API_KEY}"
+            url = f"{Config.AI_API_URL}?key={GEMINI_API_KEY}"
             
             prompt = f"""Analyse la compatibilité entre cette offre d'emploi et ce candidat.
 
@@ -71,18 +281,22 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
                 }
             }
             
-            response = requests.post(
+            # Session partagée : connexions réutilisées entre les appels
+            response = get_session().post(
                 url,
                 json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=15
+                timeout=Config.AI_HTTP_TIMEOUT
             )
             
             # Gérer les différentes erreurs
             if response.status_code == 429:
-                return {"error": "Quota Gemini dépassé (429)"}
+                return {
+                    "error": "Quota Gemini dépassé (429)",
+                    "echec": ECHEC_QUOTA,
+                    "retry_after": AIService._retry_after(response)
+                }
             elif response.status_code == 403:
-                return {"error": "Accès Gemini refusé (403)"}
+                return {"error": "Accès Gemini refusé (403)", "echec": ECHEC_AUTH}
             elif response.status_code == 404:
                 return {"error": "Modèle Gemini non trouvé (404)"}
             elif response.status_code != 200:
@@ -120,14 +334,126 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
             }
             
         except requests.Timeout:
-            return {"error": "Timeout Gemini"}
+            return {"error": "Timeout Gemini", "echec": ECHEC_TIMEOUT}
         except requests.ConnectionError:
-            return {"error": "Connexion Gemini impossible"}
+            return {"error": "Connexion Gemini impossible", "echec": ECHEC_TIMEOUT}
         except Exception as e:
             return {"error": f"Exception: {str(e)}"}
     
     @staticmethod
-    def _fallback_analysis(offre, candidat):
+    def _retry_after(response):
+        """Délai Retry-After en secondes, si le serveur l'indique"""
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def classer_candidats(offre, candidats, top=None, deterministe=False, moteur=None):
+        """
+        Classe un lot de candidats pour une offre en une seule passe locale
+        Le travail côté offre n'est fait qu'une fois pour tout le lot ;
+        avec le moteur "tfidf", tout le lot est scoré par un seul produit creux
+        Retourne une liste de (candidat, analyse) triée par score décroissant
+        """
+        if moteur is None:
+            moteur = Config.AI_SCORING_ENGINE
+        
+        if moteur == MOTEUR_TFIDF:
+            resultats = list(zip(candidats, AIService._analyses_tfidf(offre, candidats)))
+        else:
+            profil_offre = AIService._preparer_offre(offre)
+            resultats = [
+                (candidat, AIService._fallback_analysis(offre, candidat, profil_offre, deterministe))
+                for candidat in candidats
+            ]
+        metrics.compter_analyses("tfidf" if moteur == MOTEUR_TFIDF else SOURCE_LOCALE, len(resultats))
+        
+        if top is not None:
+            return heapq.nlargest(top, resultats, key=lambda r: r[1]["score"])
+        
+        resultats.sort(key=lambda r: r[1]["score"], reverse=True)
+        return resultats
+    
+    @staticmethod
+    def recommander_offres(candidat, offres, k, deterministe=True):
+        """
+        Top-k des offres pour un candidat avec le scoring local
+        Sélection par tas borné : O(n log k) sur la présélection
+        Retourne une liste de (offre, analyse) triée par score décroissant
+        """
+        metrics.compter_analyses(SOURCE_LOCALE, len(offres))
+        resultats = (
+            (offre, AIService._fallback_analysis(offre, candidat, deterministe=deterministe))
+            for offre in offres
+        )
+        return heapq.nlargest(k, resultats, key=lambda r: r[1]["score"])
+    
+    @staticmethod
+    def candidats_similaires(offres, limite):
+        """
+        Candidats les plus proches de chaque offre selon le moteur TF-IDF
+        Le bloc d'offres est comparé à tous les candidats en un produit matriciel
+        Retourne, pour chaque offre, une liste de (candidat_id, score)
+        """
+        plus_proches = obtenir_moteur().plus_proches([texte_offre(offre) for offre in offres], limite)
+        return [
+            [(candidat_id, AIService._score_tfidf(similarite)) for candidat_id, similarite in proches]
+            for proches in plus_proches
+        ]
+    
+    @staticmethod
+    def _analyses_tfidf(offre, candidats):
+        """Analyses TF-IDF d'un lot de candidats : un seul produit creux pour tout le lot"""
+        if not candidats:
+            return []
+        
+        moteur = obtenir_moteur()
+        scores, contributions = moteur.similarites(
+            texte_offre(offre), [texte_candidat(candidat) for candidat in candidats]
+        )
+        
+        analyses = []
+        for ligne, similarite in enumerate(scores):
+            termes = moteur.termes_principaux(contributions, ligne)
+            if termes:
+                justification = f"Similarité TF-IDF {similarite:.2f} - termes communs: {', '.join(termes)}"
+            else:
+                justification = "Aucun terme significatif en commun avec l'offre"
+            analyses.append({
+                "score": AIService._score_tfidf(similarite),
+                "justification": justification[:200],
+                "source": "tfidf"
+            })
+        return analyses
+    
+    @staticmethod
+    def _score_tfidf(similarite):
+        # Cosinus dans [0, 1] ramené sur 100
+        return max(0, min(100, int(round(float(similarite) * 100))))
+    
+    @staticmethod
+    def _preparer_offre(offre):
+        """Pré-calcul des données de l'offre utilisées par le scoring local"""
+        competences = [c.lower() for c in offre.competences]
+        titre_words = [w.lower() for w in offre.titre.split() if len(w) > 3]
+        
+        # Un seul automate par offre pour tous les mots-clés cherchés dans la bio
+        bio_matcher = KeywordMatcher(
+            competences
+            + titre_words
+            + [keyword for keyword, _ in EXPERIENCE_KEYWORDS]
+            + BONUS_KEYWORDS
+        )
+        
+        return {
+            "competences": competences,
+            "titre_words": titre_words,
+            "bio_matcher": bio_matcher
+        }
+    
+    @staticmethod
+    def _fallback_analysis(offre, candidat, profil_offre=None, deterministe=False):
         """
         Analyse automatique sans IA - Algorithme intelligent de scoring
         
@@ -136,20 +462,26 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
         - Niveau de diplôme (20 points max)
         - Expérience professionnelle (25 points max)
         - Pertinence du profil (15 points max)
+        
+        profil_offre: résultat de _preparer_offre, à fournir pour les lots
+        deterministe: désactive la variation aléatoire de +/- 3 points
         """
+        if profil_offre is None:
+            profil_offre = AIService._preparer_offre(offre)
+        
         score = 0
         justification_parts = []
         
         # ============================================================
         # 1. ANALYSE DES COMPÉTENCES (40 points maximum)
         # ============================================================
-        competences_offre = [c.lower() for c in offre.competences]
+        competences_offre = profil_offre["competences"]
         bio_lower = candidat.bio.lower()
         
-        competences_trouvees = []
-        for comp in competences_offre:
-            if comp in bio_lower:
-                competences_trouvees.append(comp)
+        # Tous les mots-clés présents dans la bio, trouvés en un seul parcours
+        mots_bio = profil_offre["bio_matcher"].trouver(bio_lower)
+        
+        competences_trouvees = [comp for comp in competences_offre if comp in mots_bio]
         
         if competences_offre:
             # Calculer le pourcentage de compétences trouvées
@@ -172,62 +504,22 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
         # ============================================================
         # 2. ANALYSE DU DIPLÔME (20 points maximum)
         # ============================================================
-        diplome_keywords = {
-            'doctorat': 20,
-            'phd': 20,
-            'master': 20,
-            'ingénieur': 20,
-            'ingenieur': 20,
-            'licence': 15,
-            'bachelor': 15,
-            'bac+5': 20,
-            'bac+4': 18,
-            'bac+3': 15,
-            'bac+2': 12,
-            'bts': 12,
-            'dut': 12,
-            'bac': 10
-        }
         
         diplome_lower = candidat.diplome.lower()
         diplome_score = 0
-        for keyword, points in diplome_keywords.items():
-            if keyword in diplome_lower:
-                diplome_score = max(diplome_score, points)  # Prendre le plus haut
+        for keyword in DIPLOME_MATCHER.trouver(diplome_lower):
+            diplome_score = max(diplome_score, DIPLOME_KEYWORDS[keyword])  # Prendre le plus haut
         
         score += diplome_score
         
         # ============================================================
         # 3. ANALYSE DE L'EXPÉRIENCE (25 points maximum)
         # ============================================================
-        experience_keywords = [
-            # Années d'expérience
-            ('10 ans', 25), ('dix ans', 25),
-            ('9 ans', 24), ('neuf ans', 24),
-            ('8 ans', 23), ('huit ans', 23),
-            ('7 ans', 21), ('sept ans', 21),
-            ('6 ans', 19), ('six ans', 19),
-            ('5 ans', 17), ('cinq ans', 17),
-            ('4 ans', 15), ('quatre ans', 15),
-            ('3 ans', 13), ('trois ans', 13),
-            ('2 ans', 11), ('deux ans', 11),
-            ('1 an', 9), ('un an', 9),
-            
-            # Niveaux de séniorité
-            ('expert', 25),
-            ('senior', 22),
-            ('expérimenté', 20),
-            ('confirmé', 18),
-            ('intermédiaire', 14),
-            ('junior', 10),
-            ('débutant', 8),
-            ('stage', 6)
-        ]
         
         experience_score = 0
         experience_found = False
-        for keyword, points in experience_keywords:
-            if keyword in bio_lower:
+        for keyword, points in EXPERIENCE_KEYWORDS:
+            if keyword in mots_bio:
                 experience_score = max(experience_score, points)
                 experience_found = True
         
@@ -245,8 +537,8 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
         # 4. ANALYSE DE LA PERTINENCE (15 points maximum)
         # ============================================================
         # Vérifier les mots-clés importants du titre dans la bio
-        titre_words = [w.lower() for w in offre.titre.split() if len(w) > 3]
-        matching_title_words = sum(1 for word in titre_words if word in bio_lower)
+        titre_words = profil_offre["titre_words"]
+        matching_title_words = sum(1 for word in titre_words if word in mots_bio)
         
         if matching_title_words > 0:
             pertinence_score = min(15, matching_title_words * 6)
@@ -256,8 +548,7 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
                 justification_parts.append("Profil très aligné")
         
         # Bonus : mots-clés positifs dans la bio
-        bonus_keywords = ['passionné', 'motivé', 'dynamique', 'autonome', 'rigoureux', 'polyvalent']
-        bonus_found = sum(1 for kw in bonus_keywords if kw in bio_lower)
+        bonus_found = sum(1 for kw in BONUS_KEYWORDS if kw in mots_bio)
         if bonus_found >= 2:
             score += min(5, bonus_found * 2)
         
@@ -268,9 +559,10 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
         score = min(100, max(0, int(score)))
         
         # Ajouter une petite variation aléatoire pour plus de réalisme
-        # (+/- 3 points maximum)
-        variation = random.randint(-3, 3)
-        score = max(0, min(100, score + variation))
+        # (+/- 3 points maximum), sauf en mode déterministe
+        if not deterministe:
+            variation = random.randint(-3, 3)
+            score = max(0, min(100, score + variation))
         
         # ============================================================
         # 6. CONSTRUCTION DE LA JUSTIFICATION FINALE
@@ -301,5 +593,5 @@ Format exact: {{"score": 85, "justification": "Explication courte"}}"""
         return {
             "score": score,
             "justification": justification,
-            "source": "algorithme-local"
+            "source": SOURCE_LOCALE
         }
\ No newline at end of file
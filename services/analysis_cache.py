@@ -0,0 +1,133 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class AnalysisCache:
+    """
+    Cache LRU avec TTL des analyses de compatibilité offre/candidat
+
+    La clé est une empreinte SHA-256 des champs qui alimentent le prompt :
+    une modification de ces champs produit donc une nouvelle clé. Les index
+    par offre et par candidat permettent en plus de purger les entrées
+    devenues obsolètes dès qu'une offre ou un candidat est modifié.
+    """
+
+    def __init__(self, max_size=1000, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()   # cle -> (analyse, expiration, offre_id, candidat_id)
+        self._par_offre = {}            # offre_id -> ensemble de clés
+        self._par_candidat = {}         # candidat_id -> ensemble de clés
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def cle(offre, candidat, deterministe=False, moteur=None):
+        """Empreinte des champs de l'offre et du candidat utilisés par l'analyse"""
+        champs = [
+            offre.titre,
+            offre.description,
+            list(offre.competences),
+            float(offre.salaire),
+            candidat.bio,
+            candidat.diplome,
+            bool(deterministe)
+        ]
+        # Moteur autre que le défaut : ajouté sans changer les clés existantes
+        if moteur is not None:
+            champs.append(moteur)
+        contenu = json.dumps(champs, ensure_ascii=False)
+        return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+    def get(self, cle):
+        with self._lock:
+            entree = self._entries.get(cle)
+
+            if entree is None:
+                self.misses += 1
+                return None
+
+            if entree[1] <= time.monotonic():
+                self._supprimer(cle)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(cle)
+            self.hits += 1
+            return dict(entree[0])
+
+    def set(self, cle, analyse, offre_id=None, candidat_id=None):
+        with self._lock:
+            if cle in self._entries:
+                self._supprimer(cle)
+
+            self._entries[cle] = (dict(analyse), time.monotonic() + self.ttl, offre_id, candidat_id)
+            if offre_id is not None:
+                self._par_offre.setdefault(offre_id, set()).add(cle)
+            if candidat_id is not None:
+                self._par_candidat.setdefault(candidat_id, set()).add(cle)
+
+            # Éviction des entrées les moins récemment utilisées
+            while len(self._entries) > self.max_size:
+                plus_ancienne = next(iter(self._entries))
+                self._supprimer(plus_ancienne)
+                self.evictions += 1
+
+    def invalider_offre(self, offre_id):
+        """Supprime toutes les analyses mettant en jeu cette offre"""
+        with self._lock:
+            cles = self._par_offre.pop(offre_id, set())
+            for cle in cles:
+                self._supprimer(cle)
+            self.invalidations += len(cles)
+            return len(cles)
+
+    def invalider_candidat(self, candidat_id):
+        """Supprime toutes les analyses mettant en jeu ce candidat"""
+        with self._lock:
+            cles = self._par_candidat.pop(candidat_id, set())
+            for cle in cles:
+                self._supprimer(cle)
+            self.invalidations += len(cles)
+            return len(cles)
+
+    def vider(self):
+        with self._lock:
+            self._entries.clear()
+            self._par_offre.clear()
+            self._par_candidat.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "taille": len(self._entries),
+                "taille_max": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _supprimer(self, cle):
+        # Appelé avec le verrou déjà acquis
+        entree = self._entries.pop(cle, None)
+        if entree is None:
+            return
+        _, _, offre_id, candidat_id = entree
+        if offre_id in self._par_offre:
+            self._par_offre[offre_id].discard(cle)
+            if not self._par_offre[offre_id]:
+                del self._par_offre[offre_id]
+        if candidat_id in self._par_candidat:
+            self._par_candidat[candidat_id].discard(cle)
+            if not self._par_candidat[candidat_id]:
+                del self._par_candidat[candidat_id]
@@ -0,0 +1,554 @@
+import hashlib
+import json
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func, update
+from config import Config
+from models import db
+
+# Statuts d'un job
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINE = "termine"
+ECHEC = "echec"
+ACTIFS = (EN_ATTENTE, EN_COURS)
+
+# Exécution des jobs (JOBS_BACKEND)
+BACKEND_MEMOIRE = "memoire"   # pool de threads du processus web
+BACKEND_BASE = "base"         # table analysis_jobs + processus `flask jobs-worker`
+BACKENDS = (BACKEND_MEMOIRE, BACKEND_BASE)
+
+
+class FileSaturee(Exception):
+    """File des jobs pleine : le client doit réessayer plus tard"""
+
+
+class EchecDefinitif(Exception):
+    """Erreur qu'une nouvelle tentative ne corrigerait pas (offre supprimée, moteur indisponible)"""
+
+
+def empreinte(offre_id, candidat_ids, deterministe=None, moteur=None):
+    """Clé de déduplication : même offre, mêmes candidats, mêmes options"""
+    contenu = json.dumps([offre_id, sorted(set(candidat_ids), key=str), deterministe, moteur])
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+
+def delai_tentative(tentatives, delai=2):
+    """Attente avant la tentative suivante (secondes) : `delai`, doublé à chaque échec"""
+    return delai * 2 ** max(tentatives - 1, 0)
+
+
+def executer(offre_id, candidat_ids, deterministe=None, moteur=None):
+    """
+    Analyses d'un job (contexte d'application requis)
+    Même contenu que la réponse synchrone de analyze-batch
+    """
+    from models.offre_emploi import OffreEmploi
+    from models.candidat import Candidat
+    from services.ai_service import AIService
+    from services.tfidf_engine import TfidfIndisponible
+
+    offre = db.session.get(OffreEmploi, offre_id)
+    if offre is None:
+        raise EchecDefinitif("Offre non trouvée")
+
+    candidats = Candidat.query.filter(Candidat.id.in_(candidat_ids)).all()
+    trouves = {candidat.id for candidat in candidats}
+    try:
+        analyses = AIService.analyser_lot(
+            [(offre, candidat) for candidat in candidats],
+            deterministe=deterministe,
+            moteur=moteur
+        )
+    except TfidfIndisponible as e:
+        raise EchecDefinitif(str(e))
+
+    return {
+        "offre": {
+            "id": offre.id,
+            "titre": offre.titre
+        },
+        "analyses": [
+            {
+                "candidat": {
+                    "id": candidat.id,
+                    "nom": candidat.nom
+                },
+                "analyse": analyse
+            }
+            for candidat, analyse in zip(candidats, analyses)
+        ],
+        "non_trouves": [cid for cid in candidat_ids if cid not in trouves]
+    }
+
+
+def _date(valeur):
+    return valeur.isoformat() if valeur else None
+
+
+def vue_job(job):
+    """Représentation JSON d'un job (dict en mémoire ou ligne AnalysisJob)"""
+    lire = job.get if isinstance(job, dict) else lambda champ: getattr(job, champ)
+    return {
+        "id": lire("id"),
+        "statut": lire("statut"),
+        "offre_id": lire("offre_id"),
+        "candidat_ids": lire("candidat_ids"),
+        "tentatives": lire("tentatives"),
+        "created_at": _date(lire("created_at")),
+        "started_at": _date(lire("started_at")),
+        "finished_at": _date(lire("finished_at")),
+        "resultat": lire("resultat"),
+        "erreur": lire("erreur")
+    }
+
+
+# ============================================================
+# POOL DE THREADS DU PROCESSUS (JOBS_BACKEND=memoire)
+# ============================================================
+class FileMemoire:
+    """
+    Jobs exécutés par un pool de threads du processus
+
+    - file bornée : au-delà de `taille_file` jobs en attente, soumettre()
+      lève FileSaturee (la route répond 503)
+    - un job identique (même empreinte) en attente ou en cours est renvoyé
+      au lieu d'en créer un second
+    - échec : nouvelle tentative après un délai croissant, au plus
+      `max_tentatives` exécutions
+    - les jobs terminés restent consultables `ttl` secondes
+
+    Les jobs sont propres au processus : sous gunicorn avec plusieurs
+    workers, GET /api/jobs/<id> peut arriver sur un autre worker.
+    gunicorn.conf.py passe alors à JOBS_BACKEND=base et refuse memoire
+    (verifier_backend).
+    """
+
+    def __init__(self, workers=2, taille_file=100, max_tentatives=3, ttl=3600, delai=2):
+        self.workers = workers
+        self.taille_file = taille_file
+        self.max_tentatives = max_tentatives
+        self.ttl = ttl
+        self.delai = delai
+
+        self._file = queue.Queue(maxsize=taille_file)
+        self._jobs = {}       # id -> job
+        self._actifs = {}     # empreinte -> id (jobs en attente ou en cours)
+        self._lock = threading.Lock()
+        self._app = None
+        self._threads = []
+        self._compteurs = {
+            "soumis": 0,
+            "dedupliques": 0,
+            "refuses": 0,
+            "termines": 0,
+            "echecs": 0,
+            "nouvelles_tentatives": 0
+        }
+
+    def soumettre(self, offre_id, candidat_ids, deterministe=None, moteur=None):
+        """Retourne (job, nouveau) ; nouveau vaut False si un job identique était déjà actif"""
+        cle = empreinte(offre_id, candidat_ids, deterministe, moteur)
+        with self._lock:
+            self._purger()
+
+            existant = self._actifs.get(cle)
+            if existant is not None:
+                self._compteurs["dedupliques"] += 1
+                return vue_job(self._jobs[existant]), False
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "statut": EN_ATTENTE,
+                "offre_id": offre_id,
+                "candidat_ids": list(candidat_ids),
+                "deterministe": deterministe,
+                "moteur": moteur,
+                "empreinte": cle,
+                "tentatives": 0,
+                "created_at": datetime.utcnow(),
+                "started_at": None,
+                "finished_at": None,
+                "resultat": None,
+                "erreur": None
+            }
+            try:
+                self._file.put_nowait(job["id"])
+            except queue.Full:
+                raise FileSaturee(f"File des analyses pleine ({self.taille_file} jobs en attente)")
+
+            self._jobs[job["id"]] = job
+            self._actifs[cle] = job["id"]
+            self._compteurs["soumis"] += 1
+            # Threads démarrés à la première soumission : après le fork des workers gunicorn
+            self._demarrer()
+            return vue_job(job), True
+
+    def obtenir(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return vue_job(job) if job is not None else None
+
+    def stats(self):
+        with self._lock:
+            statuts = {statut: 0 for statut in (EN_ATTENTE, EN_COURS, TERMINE, ECHEC)}
+            for job in self._jobs.values():
+                statuts[job["statut"]] += 1
+            return {
+                "backend": BACKEND_MEMOIRE,
+                "workers": self.workers,
+                "threads_actifs": sum(thread.is_alive() for thread in self._threads),
+                "taille_file": self.taille_file,
+                "en_file": self._file.qsize(),
+                "statuts": statuts,
+                **self._compteurs
+            }
+
+    def _demarrer(self):
+        if self._threads:
+            return
+        self._app = current_app._get_current_object()
+        for numero in range(self.workers):
+            thread = threading.Thread(target=self._travailler, name=f"analyse-job-{numero}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _purger(self):
+        limite = datetime.utcnow() - timedelta(seconds=self.ttl)
+        expires = [
+            job_id for job_id, job in self._jobs.items()
+            if job["statut"] not in ACTIFS and job["finished_at"] < limite
+        ]
+        for job_id in expires:
+            del self._jobs[job_id]
+
+    def _travailler(self):
+        while True:
+            job_id = self._file.get()
+            with self._lock:
+                job = self._jobs[job_id]
+                job["statut"] = EN_COURS
+                job["tentatives"] += 1
+                job["started_at"] = datetime.utcnow()
+
+            try:
+                with self._app.app_context():
+                    resultat = executer(job["offre_id"], job["candidat_ids"], job["deterministe"], job["moteur"])
+            except Exception as e:
+                self._echec(job, e)
+            else:
+                with self._lock:
+                    job.update(statut=TERMINE, resultat=resultat, erreur=None, finished_at=datetime.utcnow())
+                    self._actifs.pop(job["empreinte"], None)
+                    self._compteurs["termines"] += 1
+            finally:
+                self._file.task_done()
+
+    def _echec(self, job, erreur):
+        with self._lock:
+            job["erreur"] = str(erreur)
+            if isinstance(erreur, EchecDefinitif) or job["tentatives"] >= self.max_tentatives:
+                job.update(statut=ECHEC, finished_at=datetime.utcnow())
+                self._actifs.pop(job["empreinte"], None)
+                self._compteurs["echecs"] += 1
+                print(f"[WARNING]  Job d'analyse {job['id']} en échec : {erreur}")
+                return
+            job["statut"] = EN_ATTENTE
+            self._compteurs["nouvelles_tentatives"] += 1
+
+        # Remis en file après le délai, sans bloquer un thread du pool
+        relance = threading.Timer(delai_tentative(job["tentatives"], self.delai), self._relancer, args=(job,))
+        relance.daemon = True
+        relance.start()
+
+    def _relancer(self, job):
+        # File pleine : pas d'attente (le Timer resterait bloqué hors contre-pression), job en échec
+        try:
+            self._file.put_nowait(job["id"])
+        except queue.Full:
+            with self._lock:
+                job.update(
+                    statut=ECHEC, finished_at=datetime.utcnow(),
+                    erreur=f"{job['erreur']} (nouvelle tentative impossible : file des analyses pleine)"
+                )
+                self._actifs.pop(job["empreinte"], None)
+                self._compteurs["echecs"] += 1
+            print(f"[WARNING]  Job d'analyse {job['id']} en échec : file pleine à la nouvelle tentative")
+
+
+# ============================================================
+# TABLE DES JOBS + PROCESSUS WORKER (JOBS_BACKEND=base)
+# ============================================================
+class FileBase:
+    """
+    Jobs enregistrés dans la table analysis_jobs
+
+    Les routes insèrent les jobs ; des consommateurs les exécutent : threads
+    de chaque processus web (`consommateurs`, démarrés à la première requête
+    du processus) et/ou processus `flask jobs-worker`. Chaque consommateur
+    réserve le prochain job disponible par un UPDATE conditionnel sur le
+    statut (un seul obtient la ligne), l'exécute puis écrit le résultat. Un
+    job resté en cours plus de `timeout` secondes (worker arrêté) est remis
+    en attente. Les jobs sont lisibles depuis n'importe quel worker gunicorn.
+    """
+
+    def __init__(self, taille_file=100, max_tentatives=3, ttl=3600, timeout=300,
+                 delai=2, intervalle=1, consommateurs=0):
+        self.taille_file = taille_file
+        self.max_tentatives = max_tentatives
+        self.ttl = ttl
+        self.timeout = timeout
+        self.delai = delai
+        self.intervalle = intervalle
+        self.consommateurs = consommateurs
+        self.executes = 0
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def soumettre(self, offre_id, candidat_ids, deterministe=None, moteur=None):
+        """Retourne (job, nouveau) ; nouveau vaut False si un job identique était déjà actif"""
+        from models.analysis_job import AnalysisJob
+
+        cle = empreinte(offre_id, candidat_ids, deterministe, moteur)
+        # Deux soumissions simultanées peuvent passer toutes les deux : doublon sans conséquence
+        existant = AnalysisJob.query.filter(
+            AnalysisJob.empreinte == cle, AnalysisJob.statut.in_(ACTIFS)
+        ).first()
+        if existant is not None:
+            return vue_job(existant), False
+
+        en_attente = db.session.query(func.count(AnalysisJob.id)).filter(
+            AnalysisJob.statut == EN_ATTENTE
+        ).scalar()
+        if en_attente >= self.taille_file:
+            raise FileSaturee(f"File des analyses pleine ({self.taille_file} jobs en attente)")
+
+        maintenant = datetime.utcnow()
+        job = AnalysisJob(
+            id=uuid.uuid4().hex,
+            offre_id=offre_id,
+            candidat_ids=list(candidat_ids),
+            deterministe=deterministe,
+            moteur=moteur,
+            empreinte=cle,
+            statut=EN_ATTENTE,
+            tentatives=0,
+            created_at=maintenant,
+            disponible_a=maintenant
+        )
+        db.session.add(job)
+        # Vue construite avant le commit : pas de relecture de la ligne expirée
+        vue = vue_job(job)
+        db.session.commit()
+        return vue, True
+
+    def obtenir(self, job_id):
+        from models.analysis_job import AnalysisJob
+
+        job = db.session.get(AnalysisJob, job_id)
+        return vue_job(job) if job is not None else None
+
+    def stats(self):
+        from models.analysis_job import AnalysisJob
+
+        statuts = {statut: 0 for statut in (EN_ATTENTE, EN_COURS, TERMINE, ECHEC)}
+        statuts.update(db.session.query(AnalysisJob.statut, func.count()).group_by(AnalysisJob.statut).all())
+        return {
+            "backend": BACKEND_BASE,
+            "consommateurs": sum(thread.is_alive() for thread in self._threads),
+            "taille_file": self.taille_file,
+            "en_file": statuts[EN_ATTENTE],
+            "statuts": statuts
+        }
+
+    def reserver(self):
+        """Passe le prochain job disponible en cours et le retourne (None si aucun)"""
+        from models.analysis_job import AnalysisJob
+
+        maintenant = datetime.utcnow()
+        self._reprendre_abandonnes(maintenant)
+
+        while True:
+            job_id = db.session.query(AnalysisJob.id).filter(
+                AnalysisJob.statut == EN_ATTENTE, AnalysisJob.disponible_a <= maintenant
+            ).order_by(AnalysisJob.disponible_a).limit(1).scalar()
+            if job_id is None:
+                db.session.commit()
+                return None
+
+            reserve = db.session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == job_id, AnalysisJob.statut == EN_ATTENTE)
+                .values(statut=EN_COURS, tentatives=AnalysisJob.tentatives + 1, started_at=maintenant)
+            ).rowcount
+            db.session.commit()
+            # Pris entre-temps par un autre worker : job suivant
+            if reserve:
+                return db.session.get(AnalysisJob, job_id)
+
+    def executer_job(self, job):
+        """Exécute un job réservé et enregistre son résultat ou son échec"""
+        try:
+            resultat = executer(job.offre_id, job.candidat_ids, job.deterministe, job.moteur)
+        except Exception as e:
+            db.session.rollback()
+            job.erreur = str(e)
+            if isinstance(e, EchecDefinitif) or job.tentatives >= self.max_tentatives:
+                job.statut = ECHEC
+                job.finished_at = datetime.utcnow()
+                print(f"[WARNING]  Job d'analyse {job.id} en échec : {e}")
+            else:
+                job.statut = EN_ATTENTE
+                job.disponible_a = datetime.utcnow() + timedelta(seconds=delai_tentative(job.tentatives, self.delai))
+        else:
+            job.statut = TERMINE
+            job.resultat = resultat
+            job.erreur = None
+            job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    def demarrer(self, app, threads=None, une_fois=False):
+        """
+        Lance `threads` consommateurs (défaut : `consommateurs`) ; sans effet
+        si ce processus en a déjà. Retourne les threads démarrés
+        """
+        with self._lock:
+            if self._threads:
+                return []
+            threads = self.consommateurs if threads is None else threads
+            self._threads = [
+                threading.Thread(target=self._consommer, args=(app, numero, une_fois),
+                                 name=f"analyse-job-{numero}", daemon=True)
+                for numero in range(threads)
+            ]
+            for thread in self._threads:
+                thread.start()
+            return list(self._threads)
+
+    def _consommer(self, app, numero, une_fois):
+        while True:
+            # Un contexte (et une session) par job : rien ne reste en mémoire d'un job à l'autre
+            try:
+                with app.app_context():
+                    job = self.reserver()
+                    if job is not None:
+                        self.executer_job(job)
+                        with self._lock:
+                            self.executes += 1
+                        continue
+                    if numero == 0:
+                        self.purger()
+            except Exception as e:
+                # Base indisponible : le job réservé sera repris après `timeout`
+                print(f"[WARNING]  Worker d'analyses : {e}")
+            if une_fois:
+                return
+            time.sleep(self.intervalle)
+
+    def purger(self):
+        """Supprime les jobs terminés depuis plus de `ttl` secondes"""
+        from models.analysis_job import AnalysisJob
+
+        limite = datetime.utcnow() - timedelta(seconds=self.ttl)
+        supprimes = AnalysisJob.query.filter(
+            AnalysisJob.statut.in_((TERMINE, ECHEC)), AnalysisJob.finished_at < limite
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return supprimes
+
+    def _reprendre_abandonnes(self, maintenant):
+        from models.analysis_job import AnalysisJob
+
+        limite = maintenant - timedelta(seconds=self.timeout)
+        abandonnes = (AnalysisJob.statut == EN_COURS, AnalysisJob.started_at < limite)
+        db.session.execute(
+            update(AnalysisJob)
+            .where(*abandonnes, AnalysisJob.tentatives >= self.max_tentatives)
+            .values(statut=ECHEC, erreur="Worker arrêté pendant l'exécution", finished_at=maintenant)
+        )
+        db.session.execute(
+            update(AnalysisJob)
+            .where(*abandonnes)
+            .values(statut=EN_ATTENTE, disponible_a=maintenant)
+        )
+
+
+def verifier_backend(processus):
+    """
+    JOBS_BACKEND=memoire n'est valable qu'avec un seul processus web : les
+    jobs d'un worker gunicorn sont invisibles des autres (404 sur
+    GET /api/jobs/<id> selon le worker qui répond)
+    """
+    if Config.JOBS_BACKEND == BACKEND_MEMOIRE and processus > 1:
+        raise ValueError(
+            f"JOBS_BACKEND=memoire avec {processus} workers : les jobs ne seraient visibles "
+            f"que du worker qui les a créés. Utiliser JOBS_BACKEND=base"
+        )
+
+
+def creer_file(config):
+    """File des jobs selon la configuration de l'application (JOBS_*)"""
+    if config['JOBS_BACKEND'] not in BACKENDS:
+        raise ValueError(f"JOBS_BACKEND doit valoir {' ou '.join(BACKENDS)}")
+    if config['JOBS_BACKEND'] == BACKEND_BASE:
+        return FileBase(config['JOBS_QUEUE_SIZE'], config['JOBS_MAX_ATTEMPTS'], config['JOBS_RESULT_TTL'],
+                        config['JOBS_STALE_TIMEOUT'], config['JOBS_RETRY_DELAY'],
+                        config['JOBS_POLL_INTERVAL'], config['JOBS_WEB_THREADS'])
+    return FileMemoire(config['JOBS_WORKERS'], config['JOBS_QUEUE_SIZE'], config['JOBS_MAX_ATTEMPTS'],
+                       config['JOBS_RESULT_TTL'], config['JOBS_RETRY_DELAY'])
+
+
+def file_jobs():
+    """File des jobs de l'application courante (créée par init_app)"""
+    return current_app.extensions['file_jobs']
+
+
+# ============================================================
+# COMMANDE CLI
+# ============================================================
+@click.command('jobs-worker')
+@click.option('--threads', type=int, default=None, help="Jobs exécutés en parallèle (défaut : JOBS_WORKERS)")
+@click.option('--une-fois', is_flag=True, help="S'arrêter dès que la file est vide")
+@with_appcontext
+def jobs_worker_command(threads, une_fois):
+    """Exécute les jobs d'analyse de la table analysis_jobs (JOBS_BACKEND=base)"""
+    config = current_app.config
+    if config['JOBS_BACKEND'] != BACKEND_BASE:
+        click.echo("[WARNING]  JOBS_BACKEND=memoire : les jobs sont exécutés par l'application, "
+                   "pas par ce worker (définir JOBS_BACKEND=base des deux côtés)")
+    threads = threads or config['JOBS_WORKERS']
+    file_base = FileBase(config['JOBS_QUEUE_SIZE'], config['JOBS_MAX_ATTEMPTS'], config['JOBS_RESULT_TTL'],
+                         config['JOBS_STALE_TIMEOUT'], config['JOBS_RETRY_DELAY'], config['JOBS_POLL_INTERVAL'])
+
+    click.echo(f"Worker d'analyses démarré ({threads} thread(s))")
+    pool = file_base.demarrer(current_app._get_current_object(), threads, une_fois)
+    try:
+        for thread in pool:
+            thread.join()
+    except KeyboardInterrupt:
+        pass
+    click.echo(f"Jobs exécutés : {file_base.executes}")
+
+
+def init_app(app):
+    """File des jobs de l'application (configuration JOBS_* de app.config) et commande `flask jobs-worker`"""
+    file = creer_file(app.config)
+    app.extensions['file_jobs'] = file
+
+    if isinstance(file, FileBase):
+        if file.consommateurs:
+            # Consommateurs démarrés à la première requête : après le fork des workers gunicorn
+            @app.before_request
+            def _demarrer_consommateurs():
+                file.demarrer(app)
+        else:
+            print("[WARNING]  JOBS_BACKEND=base sans JOBS_WEB_THREADS : les jobs restent en attente "
+                  "tant qu'aucun `flask jobs-worker` ne tourne")
+
+    app.cli.add_command(jobs_worker_command)
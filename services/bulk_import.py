@@ -0,0 +1,125 @@
+import json
+from marshmallow import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from models import db
+
+# Lignes validées, vérifiées et insérées par aller-retour avec la base
+TAILLE_CHUNK = 1000
+
+
+class BulkImportError(ValueError):
+    """Corps de requête illisible pour un import en masse"""
+
+
+def lire_lignes(requete, max_lignes):
+    """
+    Lit un tableau JSON ou un flux NDJSON (application/x-ndjson)
+    Retourne (lignes, erreurs) ; une ligne NDJSON illisible devient une erreur
+    """
+    erreurs = []
+
+    if requete.mimetype == 'application/x-ndjson':
+        lignes = []
+        for index, texte in enumerate(requete.get_data(as_text=True).splitlines()):
+            if not texte.strip():
+                continue
+            try:
+                lignes.append((index, json.loads(texte)))
+            except json.JSONDecodeError:
+                erreurs.append({"ligne": index, "erreurs": "JSON invalide"})
+    else:
+        donnees = requete.get_json(silent=True)
+        if not isinstance(donnees, list):
+            raise BulkImportError("Un tableau JSON ou un flux NDJSON est requis")
+        lignes = list(enumerate(donnees))
+
+    if len(lignes) + len(erreurs) > max_lignes:
+        raise BulkImportError(f"Maximum {max_lignes} lignes par import")
+
+    return lignes, erreurs
+
+
+def importer(model, schema, lignes, cle_unique=None):
+    """
+    Valide et insère des lignes par chunks de TAILLE_CHUNK
+
+    - validation du chunk en un seul appel au schéma (many=True)
+    - doublons de `cle_unique` dans le lot et en base en une seule requête
+    - insertion multi-lignes (executemany) avec RETURNING des ids ; sans
+      RETURNING multi-lignes (MySQL, SQLite < 3.35), une insertion par ligne
+    Retourne (ids_crees, erreurs) ; les erreurs sont indexées par ligne.
+    """
+    table = model.__table__
+    ids_crees = []
+    erreurs = []
+    deja_vus = set()
+
+    for debut in range(0, len(lignes), TAILLE_CHUNK):
+        chunk = lignes[debut:debut + TAILLE_CHUNK]
+        index_lignes = [index for index, _ in chunk]
+
+        # 1. Validation du chunk complet
+        try:
+            donnees = schema.load([ligne for _, ligne in chunk])
+            messages = {}
+        except ValidationError as e:
+            donnees = e.valid_data
+            messages = e.messages
+
+        valides = []
+        for position, (index, valeur) in enumerate(zip(index_lignes, donnees)):
+            if position in messages:
+                erreurs.append({"ligne": index, "erreurs": messages[position]})
+            else:
+                valides.append((index, valeur))
+
+        # 2. Unicité dans le lot puis en base (une requête par chunk)
+        if cle_unique is not None and valides:
+            colonne = getattr(model, cle_unique)
+            existants = {
+                valeur for (valeur,) in db.session.query(colonne).filter(
+                    colonne.in_([valeur[cle_unique] for _, valeur in valides])
+                )
+            }
+
+            uniques = []
+            for index, valeur in valides:
+                cle = valeur[cle_unique]
+                if cle in existants:
+                    erreurs.append({"ligne": index, "erreurs": {cle_unique: ["Déjà utilisé en base"]}})
+                elif cle in deja_vus:
+                    erreurs.append({"ligne": index, "erreurs": {cle_unique: ["Doublon dans le lot"]}})
+                else:
+                    deja_vus.add(cle)
+                    uniques.append((index, valeur))
+            valides = uniques
+
+        if not valides:
+            continue
+
+        # 3. Insertion multi-lignes du chunk
+        try:
+            if db.session.get_bind().dialect.insert_executemany_returning:
+                resultat = db.session.execute(
+                    insert(table).returning(table.c.id),
+                    [valeur for _, valeur in valides]
+                )
+                ids_chunk = [id for (id,) in resultat]
+            else:
+                ids_chunk = [
+                    db.session.execute(insert(table), valeur).inserted_primary_key[0]
+                    for _, valeur in valides
+                ]
+            db.session.commit()
+            ids_crees.extend(ids_chunk)
+        except IntegrityError:
+            # Conflit concurrent : le chunk entier est rejeté
+            db.session.rollback()
+            erreurs.extend(
+                {"ligne": index, "erreurs": "Conflit d'intégrité lors de l'insertion"}
+                for index, _ in valides
+            )
+
+    erreurs.sort(key=lambda erreur: erreur["ligne"])
+    return ids_crees, erreurs
@@ -0,0 +1,132 @@
+import threading
+import time
+
+# États du disjoncteur
+FERME = "closed"            # Les appels passent normalement
+OUVERT = "open"             # Les appels sont refusés, fallback direct
+SEMI_OUVERT = "half-open"   # Un seul appel d'essai est autorisé
+
+# Types d'échec remontés par le client LLM
+ECHEC_QUOTA = "quota"       # 429 : réessayer après le délai de quota
+ECHEC_AUTH = "auth"         # 403 : clé invalide, inutile de réessayer vite
+ECHEC_TIMEOUT = "timeout"   # Délai dépassé ou connexion impossible
+ECHEC_ERREUR = "erreur"     # Toute autre réponse invalide
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur autour d'un service distant
+
+    - closed : les échecs consécutifs sont comptés ; au-delà du seuil, le
+      circuit s'ouvre pour `recovery_timeout` secondes
+    - open : `autoriser()` renvoie False jusqu'à la fin du délai
+    - half-open : un seul appel d'essai ; succès -> closed, échec -> open
+
+    Un 429 ouvre le circuit immédiatement pour la durée du quota (ou le
+    Retry-After fourni), un 403 l'ouvre pour `auth_cooldown` secondes.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30,
+                 quota_cooldown=60, auth_cooldown=3600, nom="service"):
+        self.nom = nom
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.quota_cooldown = quota_cooldown
+        self.auth_cooldown = auth_cooldown
+
+        self._lock = threading.Lock()
+        self._etat = FERME
+        self._echecs_consecutifs = 0
+        self._reouverture = 0.0
+        self._essai_en_cours = False
+        self._derniere_erreur = None
+        self._compteurs = {
+            "appels": 0,
+            "succes": 0,
+            "echecs": 0,
+            "refuses": 0,
+            "ouvertures": 0
+        }
+
+    @property
+    def etat(self):
+        with self._lock:
+            return self._etat_courant()
+
+    def autoriser(self):
+        """Vrai si l'appel distant peut être tenté"""
+        with self._lock:
+            etat = self._etat_courant()
+
+            if etat == FERME:
+                self._compteurs["appels"] += 1
+                return True
+
+            if etat == SEMI_OUVERT and not self._essai_en_cours:
+                self._essai_en_cours = True
+                self._compteurs["appels"] += 1
+                return True
+
+            self._compteurs["refuses"] += 1
+            return False
+
+    def succes(self):
+        with self._lock:
+            self._compteurs["succes"] += 1
+            self._echecs_consecutifs = 0
+            self._essai_en_cours = False
+            self._etat = FERME
+
+    def echec(self, type_echec=ECHEC_ERREUR, message=None, retry_after=None):
+        with self._lock:
+            self._compteurs["echecs"] += 1
+            self._echecs_consecutifs += 1
+            self._derniere_erreur = {"type": type_echec, "message": message}
+            essai = self._essai_en_cours
+            self._essai_en_cours = False
+
+            if type_echec == ECHEC_AUTH:
+                self._ouvrir(self.auth_cooldown)
+            elif type_echec == ECHEC_QUOTA:
+                self._ouvrir(retry_after if retry_after else self.quota_cooldown)
+            elif essai or self._echecs_consecutifs >= self.failure_threshold:
+                self._ouvrir(self.recovery_timeout)
+
+    def reinitialiser(self):
+        with self._lock:
+            self._etat = FERME
+            self._echecs_consecutifs = 0
+            self._essai_en_cours = False
+            self._reouverture = 0.0
+
+    def stats(self):
+        with self._lock:
+            etat = self._etat_courant()
+            return {
+                "nom": self.nom,
+                "etat": etat,
+                "echecs_consecutifs": self._echecs_consecutifs,
+                "reouverture_dans": round(max(0.0, self._reouverture - time.monotonic()), 1) if etat == OUVERT else 0,
+                "derniere_erreur": self._derniere_erreur,
+                "seuils": {
+                    "failure_threshold": self.failure_threshold,
+                    "recovery_timeout": self.recovery_timeout,
+                    "quota_cooldown": self.quota_cooldown,
+                    "auth_cooldown": self.auth_cooldown
+                },
+                **self._compteurs
+            }
+
+    def _ouvrir(self, duree):
+        # Appelé avec le verrou déjà acquis
+        if self._etat != OUVERT:
+            self._compteurs["ouvertures"] += 1
+        self._etat = OUVERT
+        self._reouverture = time.monotonic() + duree
+
+    def _etat_courant(self):
+        # Passage automatique de open à half-open une fois le délai écoulé
+        if self._etat == OUVERT and time.monotonic() >= self._reouverture:
+            self._etat = SEMI_OUVERT
+            self._essai_en_cours = False
+        return self._etat
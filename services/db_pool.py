@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Bornes (secondes) de l'histogramme des attentes au checkout
+BORNES_ATTENTE = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """
+    Compteurs du pool de connexions d'un worker
+
+    - checkouts : connexions empruntées, et durée d'obtention (attente)
+    - attentes : checkouts faits pool saturé (pool_size + max_overflow atteint)
+    - timeouts : checkouts abandonnés après pool_timeout
+    - connexions créées / invalidées par la base
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        with self._lock:
+            self._compteurs = {
+                "checkouts": 0,
+                "attentes": 0,
+                "timeouts": 0,
+                "connexions_creees": 0,
+                "invalidations": 0
+            }
+            self._attente_totale = 0.0
+            self._attente_max = 0.0
+            self._histogramme = [0] * (len(BORNES_ATTENTE) + 1)
+
+    def enregistrer_checkout(self, duree, sature):
+        with self._lock:
+            self._compteurs["checkouts"] += 1
+            if sature:
+                self._compteurs["attentes"] += 1
+            self._enregistrer_attente(duree)
+
+    def enregistrer_timeout(self, duree):
+        with self._lock:
+            self._compteurs["timeouts"] += 1
+            self._enregistrer_attente(duree)
+
+    def enregistrer_connexion(self):
+        with self._lock:
+            self._compteurs["connexions_creees"] += 1
+
+    def enregistrer_invalidation(self):
+        with self._lock:
+            self._compteurs["invalidations"] += 1
+
+    def _enregistrer_attente(self, duree):
+        self._attente_totale += duree
+        self._attente_max = max(self._attente_max, duree)
+        for i, borne in enumerate(BORNES_ATTENTE):
+            if duree <= borne:
+                self._histogramme[i] += 1
+                return
+        self._histogramme[-1] += 1
+
+    def stats(self):
+        with self._lock:
+            mesures = self._compteurs["checkouts"] + self._compteurs["timeouts"]
+            return {
+                **self._compteurs,
+                "attente_totale_ms": round(self._attente_totale * 1000, 3),
+                "attente_moyenne_ms": round(self._attente_totale * 1000 / mesures, 3) if mesures else 0.0,
+                "attente_max_ms": round(self._attente_max * 1000, 3),
+                # Nombre de checkouts par borne (cumulé : <= borne, comme Prometheus)
+                "histogramme_attente": {
+                    **{
+                        f"le_{borne}": sum(self._histogramme[:i + 1])
+                        for i, borne in enumerate(BORNES_ATTENTE)
+                    },
+                    "le_inf": sum(self._histogramme)
+                }
+            }
+
+
+# Métriques partagées par le worker
+pool_metrics = PoolMetrics()
+
+
+class QueuePoolMesure(QueuePool):
+    """QueuePool qui mesure le temps d'obtention de chaque connexion"""
+
+    _local = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get se rappelle lui-même : seul l'appel externe est mesuré
+        if getattr(self._local, "en_cours", False):
+            return super()._do_get()
+
+        sature = self._max_overflow > -1 and self._overflow >= self._max_overflow and self._pool.empty()
+        self._local.en_cours = True
+        debut = time.perf_counter()
+        try:
+            connexion = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.enregistrer_timeout(time.perf_counter() - debut)
+            raise
+        finally:
+            self._local.en_cours = False
+
+        pool_metrics.enregistrer_checkout(time.perf_counter() - debut, sature)
+        return connexion
+
+
+def _sqlite_memoire(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def options_moteur(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS à partir de la configuration (variables DB_POOL_*)
+
+    SQLite en mémoire garde le StaticPool imposé par Flask-SQLAlchemy : seules
+    les options communes à tous les pools s'appliquent.
+    """
+    options = {
+        "pool_pre_ping": config['DB_POOL_PRE_PING'],
+        "pool_recycle": config['DB_POOL_RECYCLE']
+    }
+
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri:
+        return options
+    url = make_url(uri)
+
+    if not _sqlite_memoire(url):
+        options.update({
+            "poolclass": QueuePoolMesure,
+            "pool_size": config['DB_POOL_SIZE'],
+            "max_overflow": config['DB_MAX_OVERFLOW'],
+            "pool_timeout": config['DB_POOL_TIMEOUT']
+        })
+
+    timeout_ms = config['DB_STATEMENT_TIMEOUT_MS']
+    if timeout_ms and url.get_backend_name() == 'postgresql':
+        # Appliqué par le serveur à chaque requête de la session
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    elif timeout_ms:
+        print(f"[WARNING]  DB_STATEMENT_TIMEOUT_MS ignoré pour {url.get_backend_name()}")
+
+    return options
+
+
+def instrumenter(engine):
+    """Compte les connexions créées et invalidées du pool de l'engine"""
+    if getattr(engine, "_pool_instrumente", False):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _connexion(dbapi_connection, connection_record):
+        pool_metrics.enregistrer_connexion()
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidation(dbapi_connection, connection_record, exception):
+        pool_metrics.enregistrer_invalidation()
+
+    engine._pool_instrumente = True
+
+
+def stats_pool(engine):
+    """État instantané du pool et compteurs cumulés du worker"""
+    pool = engine.pool
+    etat = {
+        "classe": pool.__class__.__name__,
+        "pid": os.getpid()
+    }
+    if isinstance(pool, QueuePool):
+        etat.update({
+            "taille": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "ouvertes": pool.checkedin() + pool.checkedout(),
+            "disponibles": pool.checkedin(),
+            "empruntees": pool.checkedout(),
+            # QueuePool.overflow() est négatif tant que pool_size n'est pas atteint
+            "overflow": max(pool.overflow(), 0)
+        })
+    return {**etat, "metriques": pool_metrics.stats()}
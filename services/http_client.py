@@ -0,0 +1,42 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Session HTTP partagée par tous les appels au backend LLM
+
+    Les connexions sont gardées ouvertes (keep-alive) dans un pool : seul le
+    premier appel vers un hôte paie la poignée de main TCP+TLS.
+    """
+    global _session
+
+    if _session is None:
+        with _lock:
+            if _session is None:
+                # Le pool doit couvrir au moins tous les appels concurrents
+                taille_pool = max(Config.AI_HTTP_POOL_SIZE, Config.AI_MAX_CONCURRENCY)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=taille_pool)
+
+                session = requests.Session()
+                session.headers.update({"Content-Type": "application/json"})
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+
+    return _session
+
+
+def fermer_session():
+    """Ferme les connexions du pool (tests, arrêt du worker)"""
+    global _session
+
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,135 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy.orm import contains_eager
+from models import db
+from models.candidature import Candidature
+from models.candidat import Candidat
+from models.offre_emploi import OffreEmploi
+from models.match_score import MatchScore
+from services.ai_service import AIService, SCORER_VERSION
+from services.analysis_cache import AnalysisCache
+
+
+class MatchScoreService:
+    """
+    Persistance des scores de compatibilité par candidature
+
+    Les scores sont calculés par l'algorithme local en mode déterministe.
+    Une ligne n'est recalculée que si l'empreinte des champs analysés ou
+    la version du scoring a changé.
+    """
+    
+    @staticmethod
+    def calculer(candidature, offre, candidat, profil_offre=None):
+        """Crée ou met à jour le score d'une candidature (sans commit)"""
+        input_hash = AnalysisCache.cle(offre, candidat, deterministe=True)
+        match_score = candidature.match_score
+        
+        if (match_score is not None
+                and match_score.input_hash == input_hash
+                and match_score.scorer_version == SCORER_VERSION):
+            return match_score, False
+        
+        analyse = AIService._fallback_analysis(offre, candidat, profil_offre, deterministe=True)
+        
+        if match_score is None:
+            match_score = MatchScore(
+                offre_id=offre.id,
+                candidat_id=candidat.id
+            )
+            candidature.match_score = match_score
+        
+        match_score.score = analyse["score"]
+        match_score.justification = analyse["justification"]
+        match_score.source = analyse["source"]
+        match_score.scorer_version = SCORER_VERSION
+        match_score.input_hash = input_hash
+        
+        return match_score, True
+    
+    @staticmethod
+    def recalculer_offre(offre):
+        """Recalcule les scores obsolètes des candidatures d'une offre"""
+        profil_offre = AIService._preparer_offre(offre)
+        
+        lignes = db.session.query(Candidature, Candidat).join(
+            Candidat, Candidat.id == Candidature.candidat_id
+        ).outerjoin(
+            MatchScore, MatchScore.candidature_id == Candidature.id
+        ).options(
+            contains_eager(Candidature.match_score)
+        ).filter(Candidature.offre_id == offre.id).all()
+        
+        recalcules = 0
+        for candidature, candidat in lignes:
+            _, modifie = MatchScoreService.calculer(candidature, offre, candidat, profil_offre)
+            recalcules += modifie
+        
+        db.session.commit()
+        return recalcules
+    
+    @staticmethod
+    def recalculer_candidat(candidat):
+        """Recalcule les scores obsolètes des candidatures d'un candidat"""
+        lignes = db.session.query(Candidature, OffreEmploi).join(
+            OffreEmploi, OffreEmploi.id == Candidature.offre_id
+        ).outerjoin(
+            MatchScore, MatchScore.candidature_id == Candidature.id
+        ).options(
+            contains_eager(Candidature.match_score)
+        ).filter(Candidature.candidat_id == candidat.id).all()
+        
+        recalcules = 0
+        for candidature, offre in lignes:
+            _, modifie = MatchScoreService.calculer(candidature, offre, candidat)
+            recalcules += modifie
+        
+        db.session.commit()
+        return recalcules
+    
+    @staticmethod
+    def recalculer_tout(taille_lot=500, progression=None):
+        """
+        Calcule les scores manquants ou obsolètes de toutes les candidatures
+        (données antérieures aux scores persistés, changement de SCORER_VERSION)
+        
+        Les offres sont parcourues par lots d'identifiants, une transaction
+        par offre. progression(offres_traitees, scores_recalcules) est
+        appelée après chaque lot. Retourne (offres, scores recalculés).
+        """
+        offres = recalcules = 0
+        dernier_id = 0
+        while True:
+            lot = OffreEmploi.query.filter(
+                OffreEmploi.id > dernier_id
+            ).order_by(OffreEmploi.id).limit(taille_lot).all()
+            if not lot:
+                return offres, recalcules
+            
+            for offre in lot:
+                recalcules += MatchScoreService.recalculer_offre(offre)
+            offres += len(lot)
+            dernier_id = lot[-1].id
+            # Lot traité : rien à garder en mémoire pour le suivant
+            db.session.expunge_all()
+            if progression:
+                progression(offres, recalcules)
+
+
+# ============================================================
+# COMMANDE CLI
+# ============================================================
+@click.command('recalculer-scores')
+@click.option('--lot', 'taille_lot', default=500, show_default=True, help="Offres chargées par requête")
+@with_appcontext
+def recalculer_scores_command(taille_lot):
+    """Calcule les scores persistés manquants ou obsolètes (reprise des données existantes)"""
+    def progression(offres, recalcules):
+        click.echo(f"\r  {offres} offres, {recalcules} scores calculés", nl=False)
+    
+    offres, recalcules = MatchScoreService.recalculer_tout(taille_lot, progression)
+    click.echo(f"\n✅ {recalcules} scores calculés sur {offres} offres")
+
+
+def init_app(app):
+    app.cli.add_command(recalculer_scores_command)
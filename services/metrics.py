@@ -0,0 +1,162 @@
+import os
+import time
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from services.utils.acces_interne import refuser_acces_interne
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+    )
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    CollectorRegistry = None
+
+# Sous gunicorn (plusieurs workers), PROMETHEUS_MULTIPROC_DIR doit être défini
+# avant le démarrage : chaque worker écrit ses valeurs dans ce dossier et
+# /metrics agrège tous les workers, quel que soit celui qui répond
+MULTIPROCESS = bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+# Bornes (secondes) des histogrammes de latence
+BORNES_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BORNES_SQL = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+BORNES_REQUETES_SQL = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+BORNES_IA = (0.0001, 0.001, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+# Routes non mesurées (la collecte ne se mesure pas elle-même)
+ENDPOINTS_IGNORES = {'metrics'}
+
+
+def disponible():
+    return CollectorRegistry is not None
+
+
+if disponible():
+    HTTP_REQUETES = Counter(
+        'smartrecruit_http_requests_total', "Requêtes HTTP terminées",
+        ['blueprint', 'endpoint', 'method', 'status']
+    )
+    HTTP_DUREE = Histogram(
+        'smartrecruit_http_request_duration_seconds', "Durée de traitement des requêtes HTTP",
+        ['blueprint', 'endpoint', 'method'], buckets=BORNES_HTTP
+    )
+    HTTP_EN_COURS = Gauge(
+        'smartrecruit_http_requests_in_progress', "Requêtes HTTP en cours de traitement",
+        ['blueprint', 'endpoint', 'method'], multiprocess_mode='livesum'
+    )
+    SQL_REQUETES = Histogram(
+        'smartrecruit_http_sql_statements', "Instructions SQL exécutées par requête HTTP",
+        ['blueprint', 'endpoint'], buckets=BORNES_REQUETES_SQL
+    )
+    SQL_DUREE = Histogram(
+        'smartrecruit_http_sql_duration_seconds', "Temps passé en base par requête HTTP",
+        ['blueprint', 'endpoint'], buckets=BORNES_SQL
+    )
+    IA_ANALYSES = Counter(
+        'smartrecruit_ai_analyses_total', "Analyses de compatibilité par source",
+        ['source']
+    )
+    IA_DUREE = Histogram(
+        'smartrecruit_ai_analysis_duration_seconds', "Durée d'une analyse de compatibilité par source",
+        ['source'], buckets=BORNES_IA
+    )
+    IA_ECHECS_GEMINI = Counter(
+        'smartrecruit_ai_gemini_failures_total', "Échecs Gemini avant repli sur l'algorithme local",
+        ['type']
+    )
+
+
+def _labels():
+    regle = request.url_rule.rule if request.url_rule is not None else 'inconnue'
+    return request.blueprint or 'app', regle, request.method
+
+
+def init_app(app, engine):
+    """Middleware de mesure des requêtes et événements SQL de l'engine"""
+    if not app.config['METRICS_ENABLED']:
+        return
+    if not disponible():
+        print("[WARNING]  prometheus_client non installé : /metrics désactivé")
+        return
+
+    @app.before_request
+    def _debut_requete():
+        if request.endpoint in ENDPOINTS_IGNORES:
+            return
+        g._metriques = {"debut": time.perf_counter(), "labels": _labels(), "sql": 0, "sql_duree": 0.0}
+        HTTP_EN_COURS.labels(*g._metriques["labels"]).inc()
+
+    @app.after_request
+    def _statut_requete(response):
+        metriques = g.get('_metriques')
+        if metriques is not None:
+            metriques["status"] = response.status_code
+        return response
+
+    @app.teardown_request
+    def _fin_requete(exception):
+        metriques = g.pop('_metriques', None)
+        if metriques is None:
+            return
+        blueprint, endpoint, methode = metriques["labels"]
+        # Pas de réponse (exception non gérée) : 500
+        status = metriques.get("status", 500)
+
+        HTTP_EN_COURS.labels(blueprint, endpoint, methode).dec()
+        HTTP_DUREE.labels(blueprint, endpoint, methode).observe(time.perf_counter() - metriques["debut"])
+        HTTP_REQUETES.labels(blueprint, endpoint, methode, str(status)).inc()
+        SQL_REQUETES.labels(blueprint, endpoint).observe(metriques["sql"])
+        SQL_DUREE.labels(blueprint, endpoint).observe(metriques["sql_duree"])
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _debut_sql(conn, cursor, statement, parameters, context, executemany):
+        # Écrasé à chaque instruction : une instruction en échec ne laisse rien en attente
+        conn.info['_debut_sql'] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _fin_sql(conn, cursor, statement, parameters, context, executemany):
+        debut = conn.info.pop('_debut_sql', None)
+        # Hors requête HTTP (threads d'analyse, CLI) : non attribué
+        if has_request_context():
+            metriques = g.get('_metriques')
+            if metriques is not None and debut is not None:
+                metriques["sql"] += 1
+                metriques["sql_duree"] += time.perf_counter() - debut
+
+    @app.route('/metrics')
+    def metrics():
+        """GET /metrics - Métriques au format texte Prometheus (tous les workers)"""
+        refus = refuser_acces_interne()
+        if refus is not None:
+            return refus
+
+        if MULTIPROCESS:
+            registre = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registre)
+        else:
+            registre = REGISTRY
+        return Response(generate_latest(registre), mimetype=CONTENT_TYPE_LATEST)
+
+
+def observer_analyse(source, duree):
+    """Une analyse de compatibilité (source : gemini-ai, algorithme-local, tfidf, cache)"""
+    if disponible():
+        IA_ANALYSES.labels(source).inc()
+        IA_DUREE.labels(source).observe(duree)
+
+
+def compter_analyses(source, nombre):
+    """Analyses faites en lot (classement, recommandations), sans latence individuelle"""
+    if disponible() and nombre:
+        IA_ANALYSES.labels(source).inc(nombre)
+
+
+def compter_echec_gemini(type_echec):
+    if disponible():
+        IA_ECHECS_GEMINI.labels(type_echec).inc()
+
+
+def worker_termine(pid):
+    """À appeler par gunicorn (child_exit) : retire les jauges du worker arrêté"""
+    if disponible() and MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
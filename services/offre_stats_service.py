@@ -0,0 +1,273 @@
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Float, String, case, cast, func, literal, null, select, union_all
+from config import Config
+from models import db
+from models.offre_emploi import OffreEmploi
+from models.candidature import Candidature
+from models.match_score import MatchScore
+from services.analysis_cache import AnalysisCache
+
+# Bornes des tranches de salaire en FCFA (la dernière tranche est ouverte)
+BORNES_SALAIRE = (300000, 500000, 750000, 1000000, 1500000)
+# Largeur des tranches de score (0-9, 10-19, ..., 90-100)
+PAS_SCORE = 10
+# Fenêtre par défaut et maximale de l'histogramme journalier (jours)
+JOURS_PAR_DEFAUT = 30
+JOURS_MAX = 366
+
+# Statistiques recalculées au plus toutes les OFFER_STATS_CACHE_TTL secondes
+stats_cache = AnalysisCache(Config.OFFER_STATS_CACHE_SIZE, Config.OFFER_STATS_CACHE_TTL)
+
+
+def _tranches_salaire():
+    return [f"0-{BORNES_SALAIRE[0]}"] + [
+        f"{bas}-{haut}" for bas, haut in zip(BORNES_SALAIRE, BORNES_SALAIRE[1:])
+    ] + [f"{BORNES_SALAIRE[-1]}+"]
+
+
+def _tranches_score():
+    return [f"{bas}-{bas + PAS_SCORE - 1}" for bas in range(0, 100 - PAS_SCORE, PAS_SCORE)] + [f"{100 - PAS_SCORE}-100"]
+
+
+TRANCHES_SALAIRE = _tranches_salaire()
+TRANCHES_SCORE = _tranches_score()
+
+
+class OffreStatsError(ValueError):
+    """Paramètres de période invalides"""
+
+
+def _ligne(serie, cle=None, libelle=None, valeur=None):
+    """Colonnes communes à toutes les branches du UNION ALL : (serie, cle, libelle, valeur)"""
+    return (
+        literal(serie, String).label('serie'),
+        cast(cle if cle is not None else null(), String).label('cle'),
+        cast(libelle if libelle is not None else null(), String).label('libelle'),
+        cast(valeur, Float).label('valeur')
+    )
+
+
+class OffreStatsService:
+    """
+    Statistiques agrégées des offres, calculées par la base
+
+    Chaque appel envoie une seule instruction SQL : les séries (compteurs,
+    candidatures par jour, tranches de salaire, distribution des scores)
+    sont des GROUP BY réunis par UNION ALL, lus comme des tuples
+    (serie, cle, libelle, valeur) sans objet ORM. Les résultats sont mis en
+    cache OFFER_STATS_CACHE_TTL secondes.
+    """
+
+    @staticmethod
+    def lire_periode(args):
+        """(depuis, jusqu_a) depuis ?depuis=AAAA-MM-JJ&jusqu_a=AAAA-MM-JJ (30 derniers jours par défaut)"""
+        try:
+            jusqu_a = date.fromisoformat(args['jusqu_a']) if args.get('jusqu_a') else datetime.utcnow().date()
+            depuis = (date.fromisoformat(args['depuis']) if args.get('depuis')
+                      else jusqu_a - timedelta(days=JOURS_PAR_DEFAUT - 1))
+        except ValueError:
+            raise OffreStatsError("depuis et jusqu_a doivent être des dates AAAA-MM-JJ")
+
+        if depuis > jusqu_a:
+            raise OffreStatsError("depuis doit précéder jusqu_a")
+        if (jusqu_a - depuis).days + 1 > JOURS_MAX:
+            raise OffreStatsError(f"Période limitée à {JOURS_MAX} jours")
+        return depuis, jusqu_a
+
+    @staticmethod
+    def stats_offre(offre_id, depuis, jusqu_a):
+        """Statistiques d'une offre ; None si l'offre n'existe pas"""
+        cle = f"offre:{offre_id}:{depuis}:{jusqu_a}"
+        return OffreStatsService._en_cache(
+            cle, lambda: OffreStatsService._calculer_offre(offre_id, depuis, jusqu_a), offre_id
+        )
+
+    @staticmethod
+    def stats_globales(depuis, jusqu_a, top):
+        """Statistiques de toutes les offres"""
+        cle = f"offres:{depuis}:{jusqu_a}:{top}"
+        return OffreStatsService._en_cache(
+            cle, lambda: OffreStatsService._calculer_globales(depuis, jusqu_a, top)
+        )
+
+    @staticmethod
+    def invalider_offre(offre_id):
+        return stats_cache.invalider_offre(offre_id)
+
+    @staticmethod
+    def _en_cache(cle, calculer, offre_id=None):
+        if stats_cache.ttl <= 0:
+            return calculer()
+        stats = stats_cache.get(cle)
+        if stats is None:
+            stats = calculer()
+            if stats is not None:
+                stats_cache.set(cle, stats, offre_id=offre_id)
+        return stats
+
+    # ========== Expressions communes ==========
+
+    @staticmethod
+    def _tranche_salaire(colonne):
+        return case(
+            *[(colonne < haut, libelle) for haut, libelle in zip(BORNES_SALAIRE, TRANCHES_SALAIRE)],
+            else_=TRANCHES_SALAIRE[-1]
+        )
+
+    @staticmethod
+    def _jour():
+        return func.date(Candidature.date_depot)
+
+    @staticmethod
+    def _dans_periode(depuis, jusqu_a):
+        return (
+            Candidature.date_depot >= datetime.combine(depuis, time.min),
+            Candidature.date_depot < datetime.combine(jusqu_a + timedelta(days=1), time.min)
+        )
+
+    @staticmethod
+    def _branches_scores(*filtres):
+        # Division entière (//) : même tranche sous SQLite et PostgreSQL
+        tranche = MatchScore.score // PAS_SCORE
+        return [
+            select(*_ligne('scores_calcules', valeur=func.count())).select_from(MatchScore).where(*filtres),
+            select(*_ligne('score_moyen', valeur=func.avg(MatchScore.score))).where(*filtres),
+            select(*_ligne('score', cle=tranche, valeur=func.count())).where(*filtres).group_by(tranche)
+        ]
+
+    # ========== Calcul ==========
+
+    @staticmethod
+    def _calculer_offre(offre_id, depuis, jusqu_a):
+        jour = OffreStatsService._jour()
+        de_l_offre = Candidature.offre_id == offre_id
+
+        requete = union_all(
+            select(*_ligne(
+                'offre', cle=OffreEmploi.id, libelle=OffreEmploi.titre, valeur=OffreEmploi.salaire
+            )).where(OffreEmploi.id == offre_id),
+            select(*_ligne('candidatures', valeur=func.count())).where(de_l_offre),
+            select(*_ligne('jour', cle=jour, valeur=func.count()))
+                .where(de_l_offre, *OffreStatsService._dans_periode(depuis, jusqu_a))
+                .group_by(jour),
+            *OffreStatsService._branches_scores(MatchScore.offre_id == offre_id)
+        )
+        series = OffreStatsService._lire(requete)
+        if not series.get('offre'):
+            return None
+
+        (id_offre, titre, salaire), = series['offre']
+        return {
+            "offre": {
+                "id": int(id_offre),
+                "titre": titre,
+                "salaire": salaire,
+                "tranche_salaire": TRANCHES_SALAIRE[sum(salaire >= borne for borne in BORNES_SALAIRE)]
+            },
+            "candidatures": OffreStatsService._total(series, 'candidatures'),
+            **OffreStatsService._scores(series),
+            **OffreStatsService._histogramme(series, depuis, jusqu_a)
+        }
+
+    @staticmethod
+    def _calculer_globales(depuis, jusqu_a, top):
+        jour = OffreStatsService._jour()
+        tranche_offre = OffreStatsService._tranche_salaire(OffreEmploi.salaire)
+
+        # Offres les plus demandées : agrégat par offre, puis titre par clé primaire
+        par_offre = select(
+            Candidature.offre_id, func.count().label('nombre')
+        ).group_by(Candidature.offre_id).order_by(
+            func.count().desc(), Candidature.offre_id
+        ).limit(top).subquery()
+
+        requete = union_all(
+            select(*_ligne('offres', valeur=func.count())).select_from(OffreEmploi),
+            select(*_ligne('candidatures', valeur=func.count())).select_from(Candidature),
+            select(*_ligne(
+                'candidats', valeur=func.count(Candidature.candidat_id.distinct())
+            )),
+            select(*_ligne('jour', cle=jour, valeur=func.count()))
+                .where(*OffreStatsService._dans_periode(depuis, jusqu_a))
+                .group_by(jour),
+            select(*_ligne('salaire_offres', cle=tranche_offre, valeur=func.count())).group_by(tranche_offre),
+            select(*_ligne('salaire_candidatures', cle=tranche_offre, valeur=func.count()))
+                .select_from(Candidature)
+                .join(OffreEmploi, OffreEmploi.id == Candidature.offre_id)
+                .group_by(tranche_offre),
+            select(*_ligne(
+                'top', cle=par_offre.c.offre_id, libelle=OffreEmploi.titre, valeur=par_offre.c.nombre
+            )).join(OffreEmploi, OffreEmploi.id == par_offre.c.offre_id),
+            *OffreStatsService._branches_scores()
+        )
+        series = OffreStatsService._lire(requete)
+
+        offres = OffreStatsService._total(series, 'offres')
+        candidatures = OffreStatsService._total(series, 'candidatures')
+        salaire_offres = {cle: int(valeur) for cle, _, valeur in series.get('salaire_offres', [])}
+        salaire_candidatures = {cle: int(valeur) for cle, _, valeur in series.get('salaire_candidatures', [])}
+
+        return {
+            "offres": offres,
+            "candidatures": candidatures,
+            "candidats_ayant_postule": OffreStatsService._total(series, 'candidats'),
+            "candidatures_par_offre": round(candidatures / offres, 2) if offres else 0,
+            "tranches_salaire": [
+                {
+                    "tranche": tranche,
+                    "offres": salaire_offres.get(tranche, 0),
+                    "candidatures": salaire_candidatures.get(tranche, 0)
+                }
+                for tranche in TRANCHES_SALAIRE
+            ],
+            "top_offres": sorted(
+                (
+                    {"id": int(cle), "titre": titre, "candidatures": int(valeur)}
+                    for cle, titre, valeur in series.get('top', [])
+                ),
+                key=lambda offre: (-offre["candidatures"], offre["id"])
+            ),
+            **OffreStatsService._scores(series),
+            **OffreStatsService._histogramme(series, depuis, jusqu_a)
+        }
+
+    # ========== Mise en forme ==========
+
+    @staticmethod
+    def _lire(requete):
+        """Lignes du UNION ALL regroupées par série : {serie: [(cle, libelle, valeur)]}"""
+        series = {}
+        for serie, cle, libelle, valeur in db.session.execute(requete):
+            series.setdefault(serie, []).append((cle, libelle, valeur))
+        return series
+
+    @staticmethod
+    def _total(series, serie):
+        lignes = series.get(serie)
+        return int(lignes[0][2] or 0) if lignes else 0
+
+    @staticmethod
+    def _scores(series):
+        distribution = dict.fromkeys(TRANCHES_SCORE, 0)
+        for cle, _, valeur in series.get('score', []):
+            # Tranche 10 (score de 100) rattachée à 90-100
+            distribution[TRANCHES_SCORE[min(int(float(cle)), len(TRANCHES_SCORE) - 1)]] += int(valeur)
+        moyenne = series.get('score_moyen', [(None, None, None)])[0][2]
+        return {
+            "scores_calcules": OffreStatsService._total(series, 'scores_calcules'),
+            "score_moyen": round(moyenne, 1) if moyenne is not None else None,
+            "distribution_scores": distribution
+        }
+
+    @staticmethod
+    def _histogramme(series, depuis, jusqu_a):
+        """Candidatures par jour sur la période, jours sans candidature compris"""
+        par_jour = {str(cle)[:10]: int(valeur) for cle, _, valeur in series.get('jour', [])}
+        jours = [depuis + timedelta(days=i) for i in range((jusqu_a - depuis).days + 1)]
+        return {
+            "periode": {"depuis": depuis.isoformat(), "jusqu_a": jusqu_a.isoformat()},
+            "candidatures_par_jour": [
+                {"date": jour.isoformat(), "candidatures": par_jour.get(jour.isoformat(), 0)}
+                for jour in jours
+            ]
+        }
@@ -0,0 +1,216 @@
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.orm import load_only
+from models import db
+from models.candidat import Candidat
+
+
+class SearchService:
+    """
+    Recherche plein texte sur les candidats (nom, bio, diplome)
+
+    - PostgreSQL : colonne tsvector générée (stemming français + unaccent),
+      indexée en GIN ; la base la maintient à jour à chaque écriture
+    - SQLite (dev/local) : table FTS5 externe synchronisée par triggers,
+      sans stemming mais avec suppression des accents et recherche par préfixe
+    - Autres bases : repli sur ILIKE (chaque mot présent dans un des champs),
+      sans index ni classement par pertinence, résultats triés par id
+
+    Avec PostgreSQL et SQLite, l'index est maintenu par la base : il couvre
+    aussi l'import en masse et les suppressions en cascade. Le repli ILIKE
+    n'a pas d'index à maintenir.
+    """
+
+    @staticmethod
+    def initialiser():
+        """Crée l'index plein texte s'il n'existe pas encore (idempotent)"""
+        with db.engine.begin() as connexion:
+            SearchService.creer_index(connexion)
+
+    @staticmethod
+    def creer_index(connexion):
+        """Création idempotente sur une connexion donnée (démarrage ou migration Alembic)"""
+        dialecte = connexion.dialect.name
+
+        if dialecte == 'postgresql':
+            SearchService._initialiser_postgresql(connexion)
+        elif dialecte == 'sqlite':
+            SearchService._initialiser_sqlite(connexion)
+        else:
+            print(f"[WARNING]  Recherche plein texte non disponible pour {dialecte}")
+
+    @staticmethod
+    def supprimer_index(connexion):
+        """Inverse de creer_index (downgrade des migrations)"""
+        dialecte = connexion.dialect.name
+
+        if dialecte == 'postgresql':
+            connexion.execute(text("DROP INDEX IF EXISTS ix_candidats_search_vector"))
+            connexion.execute(text("ALTER TABLE candidats DROP COLUMN IF EXISTS search_vector"))
+        elif dialecte == 'sqlite':
+            for trigger in ('candidats_fts_ai', 'candidats_fts_ad', 'candidats_fts_au'):
+                connexion.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            connexion.execute(text("DROP TABLE IF EXISTS candidats_fts"))
+
+    @staticmethod
+    def rechercher(q, limite, page=1, colonnes=None):
+        """
+        Retourne (candidats, total) triés par pertinence
+        Les candidats sont chargés en une requête, dans l'ordre du classement ;
+        colonnes: attributs à charger (load_only), les autres ne sont pas lus
+        """
+        dialecte = db.engine.dialect.name
+
+        if dialecte == 'postgresql':
+            ids, total = SearchService._rechercher_postgresql(q, limite, page)
+        elif dialecte == 'sqlite':
+            ids, total = SearchService._rechercher_sqlite(q, limite, page)
+        else:
+            ids, total = SearchService._rechercher_ilike(q, limite, page)
+
+        if not ids:
+            return [], total
+
+        query = Candidat.query.filter(Candidat.id.in_(ids))
+        if colonnes:
+            query = query.options(load_only(*colonnes))
+
+        par_id = {c.id: c for c in query}
+        return [par_id[id] for id in ids if id in par_id], total
+
+    # ========== PostgreSQL ==========
+
+    @staticmethod
+    def _initialiser_postgresql(connexion):
+        instructions = [
+            "CREATE EXTENSION IF NOT EXISTS unaccent",
+            # Configuration française insensible aux accents
+            """
+            DO $$ BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'fr_unaccent') THEN
+                    CREATE TEXT SEARCH CONFIGURATION fr_unaccent (COPY = french);
+                    ALTER TEXT SEARCH CONFIGURATION fr_unaccent
+                        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+                END IF;
+            END $$
+            """,
+            # Nom (poids A) > diplôme (B) > bio (C)
+            """
+            ALTER TABLE candidats ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('fr_unaccent'::regconfig, coalesce(nom, '')), 'A') ||
+                setweight(to_tsvector('fr_unaccent'::regconfig, coalesce(diplome, '')), 'B') ||
+                setweight(to_tsvector('fr_unaccent'::regconfig, coalesce(bio, '')), 'C')
+            ) STORED
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_candidats_search_vector ON candidats USING GIN (search_vector)"
+        ]
+        for instruction in instructions:
+            connexion.execute(text(instruction))
+
+    @staticmethod
+    def _rechercher_postgresql(q, limite, page):
+        requete = "websearch_to_tsquery('fr_unaccent'::regconfig, :q)"
+        lignes = db.session.execute(text(f"""
+            SELECT id FROM candidats
+            WHERE search_vector @@ {requete}
+            ORDER BY ts_rank_cd(search_vector, {requete}) DESC, id
+            LIMIT :limite OFFSET :decalage
+        """), {"q": q, "limite": limite, "decalage": (page - 1) * limite})
+        total = db.session.execute(text(f"""
+            SELECT count(*) FROM candidats WHERE search_vector @@ {requete}
+        """), {"q": q}).scalar()
+        return [id for (id,) in lignes], total
+
+    # ========== SQLite ==========
+
+    @staticmethod
+    def _initialiser_sqlite(connexion):
+        existe = connexion.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidats_fts'"
+        )).first()
+        if existe:
+            return
+
+        connexion.execute(text("""
+            CREATE VIRTUAL TABLE candidats_fts USING fts5(
+                nom, bio, diplome,
+                content='candidats', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """))
+        # Triggers de synchronisation (insert, delete, update)
+        connexion.execute(text("""
+            CREATE TRIGGER candidats_fts_ai AFTER INSERT ON candidats BEGIN
+                INSERT INTO candidats_fts(rowid, nom, bio, diplome)
+                VALUES (new.id, new.nom, new.bio, new.diplome);
+            END
+        """))
+        connexion.execute(text("""
+            CREATE TRIGGER candidats_fts_ad AFTER DELETE ON candidats BEGIN
+                INSERT INTO candidats_fts(candidats_fts, rowid, nom, bio, diplome)
+                VALUES ('delete', old.id, old.nom, old.bio, old.diplome);
+            END
+        """))
+        connexion.execute(text("""
+            CREATE TRIGGER candidats_fts_au AFTER UPDATE OF nom, bio, diplome ON candidats BEGIN
+                INSERT INTO candidats_fts(candidats_fts, rowid, nom, bio, diplome)
+                VALUES ('delete', old.id, old.nom, old.bio, old.diplome);
+                INSERT INTO candidats_fts(rowid, nom, bio, diplome)
+                VALUES (new.id, new.nom, new.bio, new.diplome);
+            END
+        """))
+        # Indexer les candidats déjà présents
+        connexion.execute(text("INSERT INTO candidats_fts(candidats_fts) VALUES ('rebuild')"))
+
+    @staticmethod
+    def _requete_fts5(q):
+        # Chaque mot devient un préfixe entre guillemets : pas d'opérateurs FTS5 injectés
+        termes = [terme.replace('"', '""') for terme in q.split()]
+        return " ".join(f'"{terme}"*' for terme in termes)
+
+    @staticmethod
+    def _rechercher_sqlite(q, limite, page):
+        requete = SearchService._requete_fts5(q)
+        if not requete:
+            return [], 0
+
+        # bm25 : plus petit = plus pertinent ; poids nom 10, bio 1, diplôme 5
+        lignes = db.session.execute(text("""
+            SELECT rowid FROM candidats_fts
+            WHERE candidats_fts MATCH :q
+            ORDER BY bm25(candidats_fts, 10.0, 1.0, 5.0), rowid
+            LIMIT :limite OFFSET :decalage
+        """), {"q": requete, "limite": limite, "decalage": (page - 1) * limite})
+        total = db.session.execute(text(
+            "SELECT count(*) FROM candidats_fts WHERE candidats_fts MATCH :q"
+        ), {"q": requete}).scalar()
+        return [id for (id,) in lignes], total
+
+    # ========== Autres bases ==========
+
+    @staticmethod
+    def _rechercher_ilike(q, limite, page):
+        termes = q.split()
+        if not termes:
+            return [], 0
+
+        # Chaque mot doit apparaître dans le nom, la bio ou le diplôme (% et _ pris littéralement)
+        condition = and_(*[
+            or_(*[
+                colonne.ilike(f"%{SearchService._echapper_like(terme)}%", escape='\\')
+                for colonne in (Candidat.nom, Candidat.bio, Candidat.diplome)
+            ])
+            for terme in termes
+        ])
+        lignes = db.session.execute(
+            select(Candidat.id).where(condition).order_by(Candidat.id)
+            .limit(limite).offset((page - 1) * limite)
+        )
+        total = db.session.execute(
+            select(func.count(Candidat.id)).where(condition)
+        ).scalar()
+        return [id for (id,) in lignes], total
+
+    @staticmethod
+    def _echapper_like(terme):
+        return terme.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,531 @@
+import itertools
+import json
+import operator
+import random
+import time
+import unicodedata
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, text
+from models import db
+from models.candidat import Candidat
+from models.offre_emploi import OffreEmploi
+from models.candidature import Candidature
+from services.search_service import SearchService
+
+# Lignes envoyées par aller-retour avec la base (executemany / COPY)
+TAILLE_CHUNK = 20000
+# Cache de pages SQLite pendant le chargement (Ko) : index mis à jour en mémoire
+CACHE_SQLITE_KO = 256 * 1024
+# PRAGMA SQLite le temps du chargement, rétablis ensuite : ni fsync ni journal
+# sur disque (une coupure pendant le seed laisse une base à recharger), tris
+# de recréation des index en mémoire
+PRAGMAS_CHARGEMENT = {
+    "cache_size": -CACHE_SQLITE_KO,
+    "synchronous": "OFF",
+    "journal_mode": "MEMORY",
+    "temp_store": "MEMORY"
+}
+
+# Dates fixes : deux exécutions avec la même graine produisent les mêmes lignes
+ORIGINE = datetime(2023, 1, 1)
+PERIODE = timedelta(days=730)
+
+# ============================================================
+# VOCABULAIRE DES DONNÉES SYNTHÉTIQUES
+# ============================================================
+# Métiers : intitulé, compétences principales, fourchette de salaire (milliers)
+METIERS = {
+    "backend": ("Développeur Backend", [
+        "Python", "Django", "Flask", "FastAPI", "Java", "Spring", "Node.js", "PostgreSQL",
+        "MySQL", "Redis", "API REST", "GraphQL", "Docker", "Git", "Go", "PHP", "Symfony"
+    ], (400, 1200)),
+    "frontend": ("Développeur Frontend", [
+        "JavaScript", "TypeScript", "React", "Vue.js", "Angular", "HTML", "CSS", "Sass",
+        "Redux", "Webpack", "Figma", "Git", "Jest", "Next.js"
+    ], (350, 1000)),
+    "fullstack": ("Développeur Full Stack", [
+        "JavaScript", "TypeScript", "React", "Node.js", "Python", "Django", "PostgreSQL",
+        "MongoDB", "Docker", "Git", "API REST", "Vue.js", "PHP", "Laravel"
+    ], (400, 1100)),
+    "data": ("Data Scientist", [
+        "Python", "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "SQL",
+        "Spark", "Machine Learning", "Statistiques", "Power BI", "Tableau", "Airflow"
+    ], (500, 1500)),
+    "devops": ("Ingénieur DevOps", [
+        "Docker", "Kubernetes", "Terraform", "Ansible", "AWS", "Azure", "GCP", "Linux",
+        "Jenkins", "GitLab CI", "Prometheus", "Grafana", "Bash", "Python"
+    ], (500, 1400)),
+    "mobile": ("Développeur Mobile", [
+        "Kotlin", "Swift", "Flutter", "Dart", "React Native", "Android", "iOS",
+        "Firebase", "Git", "API REST", "Java"
+    ], (400, 1100)),
+    "securite": ("Ingénieur Sécurité", [
+        "Sécurité", "Pentest", "SIEM", "ISO 27001", "Linux", "Réseau", "Python",
+        "Cryptographie", "Firewall", "SOC", "OWASP"
+    ], (600, 1500)),
+    "reseau": ("Administrateur Systèmes et Réseaux", [
+        "Linux", "Windows Server", "Réseau", "Cisco", "VMware", "Active Directory",
+        "Bash", "PowerShell", "Sauvegarde", "Virtualisation", "Supervision"
+    ], (300, 900))
+}
+# Poids des métiers (certains profils sont bien plus fréquents)
+POIDS_METIERS = {
+    "backend": 26, "frontend": 18, "fullstack": 20, "data": 10,
+    "devops": 9, "mobile": 8, "securite": 4, "reseau": 5
+}
+COMPETENCES_TRANSVERSES = ["Agile", "Scrum", "Anglais", "Git", "Tests", "Jira", "UML"]
+
+# Diplômes reconnus par le scoring local, avec leur fréquence
+DIPLOMES = [
+    ("Master en Informatique", 24), ("Diplôme d'Ingénieur en Informatique", 18),
+    ("Licence en Informatique", 16), ("Licence Pro Développement Web", 8),
+    ("Bachelor Développement", 6), ("BTS Services Informatiques", 10),
+    ("DUT Informatique", 6), ("Bac+2 Informatique", 5), ("Doctorat en Informatique", 3),
+    ("Master Data Science", 4)
+]
+# Années d'expérience : formulations cherchées par le scoring local
+EXPERIENCES = [
+    ("un an", 14), ("2 ans", 16), ("deux ans", 4), ("3 ans", 15), ("trois ans", 3),
+    ("4 ans", 10), ("5 ans", 11), ("cinq ans", 3), ("6 ans", 6), ("7 ans", 5),
+    ("8 ans", 4), ("10 ans", 4), ("dix ans", 1)
+]
+NIVEAUX = ["junior", "confirmé", "senior", "expert", "stagiaire", "lead"]
+QUALITES = ["passionné", "motivé", "dynamique", "autonome", "rigoureux", "polyvalent", "curieux", "organisé"]
+SECTEURS = ["banque", "assurance", "e-commerce", "santé", "télécoms", "industrie", "énergie", "transport", "public"]
+VILLES = ["Paris", "Lyon", "Marseille", "Toulouse", "Bordeaux", "Lille", "Nantes", "Dakar", "Abidjan", "Casablanca"]
+PRENOMS = [
+    "Camille", "Léa", "Manon", "Chloé", "Inès", "Sarah", "Emma", "Aïcha", "Fatou", "Julie",
+    "Lucas", "Hugo", "Louis", "Nathan", "Thomas", "Mamadou", "Yanis", "Karim", "Théo", "Antoine",
+    "Mathilde", "Clara", "Awa", "Mariam", "Nicolas", "Julien", "Moussa", "Ibrahima", "Élodie", "Pauline"
+]
+NOMS = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau",
+    "Simon", "Laurent", "Lefèvre", "Michel", "Garcia", "Diallo", "Ndiaye", "Traoré", "Koné", "Benali",
+    "Fontaine", "Rousseau", "Vincent", "Muller", "Faure", "Mercier", "Diop", "Sow", "Girard", "Bonnet"
+]
+ENTREPRISES = ["FinTech", "Retail", "SaaS", "Logistique", "Énergie", "Média", "Santé", "Mobilité"]
+
+# Candidatures par candidat : beaucoup de 0 à 2, une longue traîne jusqu'à 12
+CANDIDATURES_PAR_CANDIDAT = [(0, 18), (1, 30), (2, 20), (3, 12), (4, 7), (5, 5), (6, 3), (8, 3), (12, 2)]
+# Popularité des offres (loi de Zipf) : quelques offres reçoivent l'essentiel des candidatures
+EXPOSANT_ZIPF = 0.9
+
+
+# Combinaisons de compétences pré-tirées par métier
+COMBINAISONS_PAR_METIER = 512
+# Valeurs aléatoires tirées ensemble
+TAILLE_BLOC = 10000
+
+
+def _identite(valeur):
+    return valeur
+
+
+def _ascii(texte):
+    return unicodedata.normalize('NFKD', texte).encode('ascii', 'ignore').decode().lower().replace(' ', '')
+
+
+class SeedService:
+    """
+    Données synthétiques déterministes pour les tests de montée en charge
+
+    Les candidats, offres et candidatures sont générés à partir d'une graine
+    (même graine -> mêmes lignes) puis écrits par chunks : COPY sur
+    PostgreSQL (psycopg), executemany ailleurs. Les bios reprennent les
+    mots-clés du scoring local (compétences, diplôme, années d'expérience,
+    qualités) ; les candidatures suivent une distribution asymétrique
+    (popularité des offres en loi de Zipf, nombre par candidat en longue traîne).
+    """
+
+    # Colonnes des tuples produits par les générateurs
+    COLONNES_CANDIDATS = ("id", "nom", "email", "bio", "diplome", "date_inscription", "updated_at")
+    COLONNES_OFFRES = ("id", "titre", "description", "competences", "salaire", "date_creation", "updated_at")
+    COLONNES_CANDIDATURES = ("candidat_id", "offre_id", "date_depot", "updated_at")
+
+    # ========== Génération ==========
+    # Les générateurs produisent des tuples prêts à écrire : format_date et
+    # format_json (voir _formats) sont appliqués une fois par valeur générée,
+    # la date d'un candidat servant à ses deux colonnes et à ses candidatures.
+
+    @staticmethod
+    def _metiers(rng, minimum, maximum):
+        """Combinaisons de compétences pré-tirées : [(métier, compétences, poids)]"""
+        return [
+            (cle, rng.sample(competences, rng.randint(minimum, maximum)), POIDS_METIERS[cle])
+            for cle, (_, competences, _) in METIERS.items()
+            for _ in range(COMBINAISONS_PAR_METIER)
+        ]
+
+    @staticmethod
+    def _blocs(nombre):
+        """Tirages faits par blocs (rng.choices) : bien plus rapide que valeur par valeur"""
+        for debut in range(0, nombre, TAILLE_BLOC):
+            yield debut, min(TAILLE_BLOC, nombre - debut)
+
+    @staticmethod
+    def _dates(premiere, pas, nombre):
+        """premiere, premiere + pas, ... (nombre dates)"""
+        return itertools.accumulate(itertools.repeat(pas, nombre - 1), initial=premiere)
+
+    @staticmethod
+    def generer_candidats(rng, premier_id, nombre, format_date=_identite):
+        choices = rng.choices
+        # Début de bio par combinaison : intitulé et compétences déjà assemblés
+        combinaisons = SeedService._metiers(rng, 3, 7)
+        debuts_bio = [
+            f"{METIERS[cle][0]} {{}} avec {{}} d'expérience en {', '.join(c[:-1])} et {c[-1]}. "
+            for cle, c, _ in combinaisons
+        ]
+        poids_debuts = list(itertools.accumulate(poids for _, _, poids in combinaisons))
+        identites = [
+            (f"{prenom} {nom}", f"{_ascii(prenom)}.{_ascii(nom)}") for prenom in PRENOMS for nom in NOMS
+        ]
+        fins_bio = [
+            f"Projets dans le secteur {secteur} à {ville}, pratique de {transverse}. "
+            f"Profil {a} et {b}, à l'aise en équipe."
+            for secteur in SECTEURS for ville in VILLES for transverse in COMPETENCES_TRANSVERSES
+            for a, b in itertools.combinations(QUALITES, 2)
+        ]
+        diplomes, poids_diplomes = zip(*DIPLOMES)
+        experiences, poids_experiences = zip(*EXPERIENCES)
+        pas = PERIODE / max(nombre, 1)
+
+        for debut, taille in SeedService._blocs(nombre):
+            ids = range(premier_id + debut, premier_id + debut + taille)
+            dates = map(format_date, SeedService._dates(ORIGINE + pas * debut, pas, taille))
+            for id, (nom, email), debut_bio, niveau, experience, fin_bio, diplome, date in zip(
+                ids,
+                choices(identites, k=taille),
+                choices(debuts_bio, cum_weights=poids_debuts, k=taille),
+                choices(NIVEAUX, k=taille),
+                choices(experiences, weights=poids_experiences, k=taille),
+                choices(fins_bio, k=taille),
+                choices(diplomes, weights=poids_diplomes, k=taille),
+                dates
+            ):
+                yield (
+                    id, nom, f"{email}.{id}@exemple.fr",
+                    debut_bio.format(niveau, experience) + fin_bio,
+                    diplome, date, date
+                )
+
+    @staticmethod
+    def generer_offres(rng, premier_id, nombre, format_date=_identite, format_json=_identite):
+        choices = rng.choices
+        combinaisons = SeedService._metiers(rng, 3, 6)
+        poids_combinaisons = list(itertools.accumulate(poids for _, _, poids in combinaisons))
+        descriptions = [
+            f"{entreprise} basée à {ville} recherche un profil {{}} pour renforcer son équipe ({secteur}). "
+            for entreprise in ENTREPRISES for ville in VILLES for secteur in SECTEURS
+        ]
+        pas = PERIODE / max(nombre, 1)
+
+        for debut, taille in SeedService._blocs(nombre):
+            dates = map(format_date, SeedService._dates(ORIGINE + pas * debut, pas, taille))
+            for id, (cle, competences, _), niveau, description, extra, salaire, date in zip(
+                range(premier_id + debut, premier_id + debut + taille),
+                choices(combinaisons, cum_weights=poids_combinaisons, k=taille),
+                choices(NIVEAUX[:4], k=taille),
+                choices(descriptions, k=taille),
+                # Une offre sur trois ajoute une compétence transverse
+                choices(COMPETENCES_TRANSVERSES + [None] * 2 * len(COMPETENCES_TRANSVERSES), k=taille),
+                [rng.random() for _ in range(taille)],
+                dates
+            ):
+                intitule, _, (salaire_min, salaire_max) = METIERS[cle]
+                if extra is not None and extra not in competences:
+                    competences = competences + [extra]
+                yield (
+                    id,
+                    f"{intitule} {niveau.capitalize()}",
+                    f"{description.format(niveau)}Environnement : {', '.join(competences)}.",
+                    format_json(competences),
+                    float(int(salaire_min + salaire * (salaire_max - salaire_min)) * 1000),
+                    date, date
+                )
+
+    @staticmethod
+    def generer_candidatures(rng, premiers_ids, nombres, format_date=_identite):
+        """
+        Candidatures des candidats [premier, premier + nombre) sur les offres
+        [premier, premier + nombre), sans doublon (candidat, offre)
+        """
+        (premier_candidat, premier_offre), (nb_candidats, nb_offres) = premiers_ids, nombres
+        if not nb_candidats or not nb_offres:
+            return
+
+        choices = rng.choices
+        # Rang de popularité des offres mélangé : les offres populaires ne sont pas les premières
+        rangs = list(range(nb_offres))
+        rng.shuffle(rangs)
+        offres = range(premier_offre, premier_offre + nb_offres)
+        poids_offres = list(itertools.accumulate(1 / (rang + 1) ** EXPOSANT_ZIPF for rang in rangs))
+        quantites, poids_quantites = zip(*CANDIDATURES_PAR_CANDIDAT)
+        pas = PERIODE / nb_candidats
+        # Dépôt dans les 60 jours suivant l'inscription
+        delais = [timedelta(days=jours) for jours in range(60)]
+
+        for debut, taille in SeedService._blocs(nb_candidats):
+            nombres_bloc = [min(n, nb_offres) for n in choices(quantites, weights=poids_quantites, k=taille)]
+            tirages = iter(choices(offres, cum_weights=poids_offres, k=sum(nombres_bloc)))
+            inscriptions = SeedService._dates(ORIGINE + pas * debut, pas, taille)
+
+            for i, nombre, inscription, delai in zip(
+                range(debut, debut + taille), nombres_bloc, inscriptions, choices(delais, k=taille)
+            ):
+                if not nombre:
+                    continue
+                candidat_id = premier_candidat + i
+                date = format_date(inscription + delai)
+                if nombre == 1:
+                    yield candidat_id, next(tirages), date, date
+                    continue
+                choisies = set(itertools.islice(tirages, nombre))
+                while len(choisies) < nombre:
+                    # Doublon (offre très populaire) : nouveau tirage
+                    choisies.add(choices(offres, cum_weights=poids_offres)[0])
+                for offre_id in sorted(choisies):
+                    yield candidat_id, offre_id, date, date
+
+    # ========== Écriture ==========
+
+    @staticmethod
+    def _formats(connexion):
+        """
+        (format_date, format_json) des valeurs générées pour cette connexion
+
+        SQLite stocke les dates en texte : la chaîne est produite directement,
+        au format du processeur DateTime de SQLAlchemy, plutôt que convertie
+        à chaque écriture. Les colonnes JSON sont sérialisées partout.
+        """
+        json_texte = lambda valeur: json.dumps(valeur, ensure_ascii=False)
+        if connexion.dialect.name == 'sqlite':
+            return operator.methodcaller('isoformat', ' ', 'microseconds'), json_texte
+        return _identite, json_texte
+
+    @staticmethod
+    def inserer(connexion, table, colonnes, lignes, taille_chunk=TAILLE_CHUNK, progression=None):
+        """
+        Écrit des tuples par chunks ; retourne le nombre de lignes insérées
+
+        - PostgreSQL (psycopg) : COPY ... FROM STDIN
+        - autres bases : executemany, sans passer par le traitement ligne
+          à ligne des paramètres de SQLAlchemy (valeurs déjà formatées)
+        """
+        dialecte = connexion.dialect
+        if dialecte.name == 'postgresql' and dialecte.driver == 'psycopg':
+            requete = f"COPY {table} ({', '.join(colonnes)}) FROM STDIN"
+
+            def ecrire(chunk):
+                with connexion.connection.driver_connection.cursor() as curseur:
+                    with curseur.copy(requete) as flux:
+                        for ligne in chunk:
+                            flux.write_row(ligne)
+        else:
+            marqueurs = {'qmark': '?', 'numeric': None, 'named': None}.get(dialecte.paramstyle, '%s')
+            if marqueurs is None:
+                valeurs = ', '.join(f":{nom}" for nom in colonnes)
+                requete = text(f"INSERT INTO {table} ({', '.join(colonnes)}) VALUES ({valeurs})")
+                ecrire = lambda chunk: connexion.execute(requete, [dict(zip(colonnes, ligne)) for ligne in chunk])
+            else:
+                requete = f"INSERT INTO {table} ({', '.join(colonnes)}) VALUES ({', '.join([marqueurs] * len(colonnes))})"
+                ecrire = lambda chunk: connexion.exec_driver_sql(requete, chunk)
+
+        total = 0
+        lignes = iter(lignes)
+        while chunk := list(itertools.islice(lignes, taille_chunk)):
+            ecrire(chunk)
+            total += len(chunk)
+            if progression:
+                progression(total)
+        return total
+
+    @staticmethod
+    def _pragmas(connexion, valeurs):
+        """Applique des PRAGMA SQLite ; retourne leurs valeurs précédentes"""
+        precedentes = {}
+        for nom, valeur in valeurs.items():
+            precedentes[nom] = connexion.exec_driver_sql(f"PRAGMA {nom}").scalar()
+            connexion.exec_driver_sql(f"PRAGMA {nom} = {valeur}")
+        return precedentes
+
+    @staticmethod
+    def _recaler_sequences(connexion, tables):
+        # Identifiants fournis explicitement : les séquences PostgreSQL ne les ont pas vus passer
+        if connexion.dialect.name != 'postgresql':
+            return
+        for table in tables:
+            connexion.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            ))
+
+    # ========== Chargement complet ==========
+
+    @staticmethod
+    def vider():
+        """Supprime toutes les lignes applicatives (index plein texte compris)"""
+        from models.match_score import MatchScore
+        from models.competence import Competence, CandidatCompetence, OffreCompetence
+
+        connexion = db.session.connection()
+        # SQLite : sans l'index FTS5, la suppression ne passe pas par les triggers ligne à ligne
+        sqlite = connexion.dialect.name == 'sqlite'
+        if sqlite:
+            SearchService.supprimer_index(connexion)
+        for model in (MatchScore, Candidature, CandidatCompetence, OffreCompetence, Competence, Candidat, OffreEmploi):
+            connexion.execute(model.__table__.delete())
+        if sqlite:
+            SearchService.creer_index(connexion)
+        db.session.commit()
+
+    @staticmethod
+    def peupler(candidats, offres, graine=42, taille_chunk=TAILLE_CHUNK, index=True, progression=None):
+        """
+        Ajoute `candidats` candidats, `offres` offres et leurs candidatures
+        à la suite des identifiants existants. Retourne les statistiques du
+        chargement (lignes par table, durées, débit d'écriture).
+
+        progression(table, lignes_ecrites, lignes_prevues, terminee) est appelée
+        après chaque chunk et en fin de table
+        """
+        connexion = db.session.connection()
+        premier_candidat = (db.session.query(func.max(Candidat.id)).scalar() or 0) + 1
+        premier_offre = (db.session.query(func.max(OffreEmploi.id)).scalar() or 0) + 1
+        format_date, format_json = SeedService._formats(connexion)
+
+        # Un flux aléatoire par table : le nombre d'offres ne change pas les candidats générés
+        def flux(nom):
+            return random.Random(f"{graine}-{nom}-{premier_candidat}-{premier_offre}")
+
+        def charger(model, colonnes, lignes, prevues):
+            table = model.__table__.name
+            suivi = None
+            if progression is not None:
+                suivi = lambda ecrites: progression(table, ecrites, prevues, False)
+            stats["lignes"][table] = SeedService.inserer(connexion, table, colonnes, lignes, taille_chunk, suivi)
+            if progression is not None:
+                progression(table, stats["lignes"][table], prevues, True)
+
+        stats = {"premiers_ids": (premier_candidat, premier_offre), "lignes": {}}
+        debut = time.perf_counter()
+
+        # Base vide ou presque : les index secondaires sont recréés en une passe
+        # (tri) plutôt que mis à jour à chaque ligne
+        differes = []
+        if premier_candidat - 1 < candidats:
+            differes = [
+                ix for model in (Candidat, OffreEmploi, Candidature)
+                for ix in model.__table__.indexes if not ix.unique
+            ]
+        for ix in differes:
+            ix.drop(connexion, checkfirst=True)
+
+        sqlite = connexion.dialect.name == 'sqlite'
+        if sqlite:
+            # L'index FTS5 est reconstruit en une passe plutôt que par trigger à chaque ligne
+            SearchService.supprimer_index(connexion)
+            pragmas_initiaux = SeedService._pragmas(connexion, PRAGMAS_CHARGEMENT)
+
+        termine = False
+        try:
+            charger(Candidat, SeedService.COLONNES_CANDIDATS, SeedService.generer_candidats(
+                flux("candidats"), premier_candidat, candidats, format_date
+            ), candidats)
+            charger(OffreEmploi, SeedService.COLONNES_OFFRES, SeedService.generer_offres(
+                flux("offres"), premier_offre, offres, format_date, format_json
+            ), offres)
+            charger(Candidature, SeedService.COLONNES_CANDIDATURES, SeedService.generer_candidatures(
+                flux("candidatures"), (premier_candidat, premier_offre), (candidats, offres), format_date
+            ), None)
+
+            for ix in differes:
+                ix.create(connexion)
+            SeedService._recaler_sequences(connexion, ('candidats', 'offres_emploi'))
+            db.session.commit()
+            termine = True
+        finally:
+            if sqlite or not termine:
+                db.session.rollback()
+            if sqlite:
+                # Connexion rendue au pool : PRAGMA rétablis, hors transaction
+                # (journal_mode ne change pas dans une transaction ouverte)
+                SeedService._pragmas(db.session.connection(), pragmas_initiaux)
+                db.session.commit()
+            if not termine:
+                # Chargement interrompu : les lignes sont annulées mais les DROP
+                # (validés aussitôt par pysqlite) non, index et FTS5 recréés
+                connexion = db.session.connection()
+                for ix in differes:
+                    ix.create(connexion, checkfirst=True)
+                if sqlite:
+                    SearchService.creer_index(connexion)
+                db.session.commit()
+
+        stats["duree_ecriture_s"] = round(time.perf_counter() - debut, 3)
+        total = sum(stats["lignes"].values())
+        stats["lignes_par_s"] = int(total / stats["duree_ecriture_s"]) if stats["duree_ecriture_s"] else total
+
+        debut_index = time.perf_counter()
+        if sqlite:
+            SearchService.creer_index(db.session.connection())
+            db.session.commit()
+        if index:
+            SeedService._indexer(
+                list(range(premier_candidat, premier_candidat + candidats)),
+                list(range(premier_offre, premier_offre + offres))
+            )
+        stats["duree_index_s"] = round(time.perf_counter() - debut_index, 3)
+        return stats
+
+    @staticmethod
+    def _indexer(candidat_ids, offre_ids):
+        """Index dérivés : compétences et moteur TF-IDF"""
+        from services.skill_index_service import SkillIndexService
+        from services.tfidf_engine import TfidfEngine, reconstruire_moteur
+
+        # Candidats d'abord, sur le vocabulaire existant : les termes ajoutés
+        # ensuite par les offres sont rétro-indexés une seule fois sur toutes les bios
+        SkillIndexService.indexer_candidats(candidat_ids)
+        SkillIndexService.indexer_offres(offre_ids)
+        SkillIndexService.retro_indexer_en_attente()
+        if TfidfEngine.disponible():
+            reconstruire_moteur()
+
+
+# ============================================================
+# COMMANDE CLI
+# ============================================================
+@click.command('seed')
+@click.option('--candidats', default=10000, show_default=True, help="Candidats à créer")
+@click.option('--offres', type=int, default=None, help="Offres à créer (défaut : candidats / 10)")
+@click.option('--graine', default=42, show_default=True, help="Graine : même graine, mêmes données")
+@click.option('--chunk', 'taille_chunk', default=TAILLE_CHUNK, show_default=True, help="Lignes par aller-retour")
+@click.option('--vider', is_flag=True, help="Supprimer les données existantes avant le chargement")
+@click.option('--sans-index', is_flag=True, help="Ne pas reconstruire l'index des compétences ni le TF-IDF")
+@with_appcontext
+def seed_command(candidats, offres, graine, taille_chunk, vider, sans_index):
+    """Génère des candidats, offres et candidatures synthétiques (tests de charge)"""
+    offres = max(candidats // 10, 1) if offres is None else offres
+
+    if vider:
+        click.echo("Suppression des données existantes...")
+        SeedService.vider()
+
+    def progression(table, ecrites, prevues, terminee):
+        total = f"/{prevues}" if prevues is not None else ""
+        click.echo(f"\r  {table:<14} {ecrites}{total} lignes", nl=terminee)
+
+    click.echo(f"Génération de {candidats} candidats et {offres} offres (graine {graine})")
+    stats = SeedService.peupler(candidats, offres, graine, taille_chunk, not sans_index, progression)
+
+    click.echo(f"✅ Écriture : {stats['duree_ecriture_s']} s ({stats['lignes_par_s']} lignes/s)")
+    click.echo(f"   Index : {stats['duree_index_s']} s")
+
+
+def init_app(app):
+    """Enregistre la commande `flask seed`"""
+    app.cli.add_command(seed_command)
+
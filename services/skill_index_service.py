@@ -0,0 +1,459 @@
+import threading
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db
+from models.candidat import Candidat
+from models.offre_emploi import OffreEmploi
+from models.competence import Competence, CandidatCompetence, OffreCompetence
+from services.utils.keyword_matcher import KeywordMatcher
+
+# Lignes lues/écrites par aller-retour avec la base
+TAILLE_CHUNK = 1000
+
+
+class SkillIndexService:
+    """
+    Index inversé compétence -> candidats
+
+    Le vocabulaire recherché dans les bios est l'ensemble des compétences des
+    offres, normalisées comme dans AIService._fallback_analysis (minuscules) :
+    un candidat est indexé sous un terme si sa bio contient ce terme. L'index
+    est mis à jour à l'écriture des candidats et des offres. Une compétence
+    nouvelle entre dans le vocabulaire pendant la requête (les candidats écrits
+    ensuite l'indexent) ; les bios existantes sont parcourues en arrière-plan
+    (RetroIndexation, ou `flask indexer-competences --en-attente`). Les
+    lectures n'écrivent jamais.
+
+    Les mots du titre entrent dans la représentation de l'offre seulement
+    (Competence.indexe_bios faux) : ils ne déclenchent aucune rétro-indexation.
+    """
+
+    # Automate du vocabulaire, reconstruit quand le vocabulaire grandit
+    _matcher = None
+    _taille_vocabulaire = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def normaliser(terme):
+        return terme.strip().lower()[:100]
+
+    @staticmethod
+    def _normaliser_tous(termes):
+        return {SkillIndexService.normaliser(t) for t in termes if t and t.strip()}
+
+    @staticmethod
+    def representation(titre, competences):
+        """(compétences, mots du titre) normalisés, comme dans le scoring local"""
+        termes = SkillIndexService._normaliser_tous(competences or [])
+        mots_titre = SkillIndexService._normaliser_tous(w for w in (titre or '').split() if len(w) > 3)
+        return termes, mots_titre - termes
+
+    @staticmethod
+    def enregistrer_termes(competences, mots_titre=()):
+        """
+        Ajoute au vocabulaire les termes absents, sans commit : les nouvelles
+        compétences sont marquées en attente de rétro-indexation
+        Retourne le nombre de compétences en attente ajoutées
+        """
+        connexion = db.session.connection()
+        nouveaux = SkillIndexService._ajouter_vocabulaire(
+            connexion,
+            SkillIndexService._normaliser_tous(competences),
+            SkillIndexService._normaliser_tous(mots_titre)
+        )
+        for debut in range(0, len(nouveaux), TAILLE_CHUNK):
+            connexion.execute(
+                update(Competence).where(
+                    Competence.terme.in_(nouveaux[debut:debut + TAILLE_CHUNK])
+                ).values(retro_indexe=False)
+            )
+        return len(nouveaux)
+
+    @staticmethod
+    def retro_indexer_en_attente():
+        """
+        Parcourt toutes les bios pour les compétences en attente, un lot
+        validé à la fois, puis les marque rétro-indexées
+        Retourne le nombre de compétences traitées
+        """
+        termes = db.session.execute(
+            select(Competence.terme).where(Competence.indexe_bios, ~Competence.retro_indexe).order_by(Competence.terme)
+        ).scalars().all()
+        db.session.commit()
+        if not termes:
+            return 0
+
+        SkillIndexService._retro_indexer(termes)
+        for debut in range(0, len(termes), TAILLE_CHUNK):
+            db.session.execute(
+                update(Competence).where(
+                    Competence.terme.in_(termes[debut:debut + TAILLE_CHUNK])
+                ).values(retro_indexe=True)
+            )
+        db.session.commit()
+        return len(termes)
+
+    @staticmethod
+    def indexer_offres(offre_ids):
+        """
+        (Ré)écrit la représentation des offres (compétences et mots du titre
+        de plus de 3 lettres) et ajoute leurs nouveaux termes au vocabulaire
+        Retourne le nombre de compétences en attente de rétro-indexation
+        """
+        representations = {}
+        for debut in range(0, len(offre_ids), TAILLE_CHUNK):
+            chunk = offre_ids[debut:debut + TAILLE_CHUNK]
+            for offre_id, titre, competences in db.session.query(
+                OffreEmploi.id, OffreEmploi.titre, OffreEmploi.competences
+            ).filter(OffreEmploi.id.in_(chunk)):
+                representations[offre_id] = SkillIndexService.representation(titre, competences)
+
+        if not representations:
+            return 0
+
+        en_attente = SkillIndexService.enregistrer_termes(
+            set().union(*(termes for termes, _ in representations.values())),
+            set().union(*(mots for _, mots in representations.values()))
+        )
+
+        connexion = db.session.connection()
+        for debut in range(0, len(offre_ids), TAILLE_CHUNK):
+            chunk = offre_ids[debut:debut + TAILLE_CHUNK]
+            SkillIndexService._ecrire_offres(
+                connexion, {offre_id: representations[offre_id] for offre_id in chunk if offre_id in representations}
+            )
+
+        db.session.commit()
+        return en_attente
+
+    @staticmethod
+    def supprimer_offre(offre_id):
+        """Retire une offre de l'index (sans commit, dans la transaction appelante)"""
+        db.session.query(OffreCompetence).filter(
+            OffreCompetence.offre_id == offre_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def offres_proches(candidat_id, limite):
+        """
+        Offres partageant le plus de compétences avec la bio du candidat
+        Retourne une liste de (offre_id, nombre de compétences communes)
+        """
+        communes = func.count(OffreCompetence.terme).label('communes')
+        return db.session.query(
+            OffreCompetence.offre_id, communes
+        ).join(
+            CandidatCompetence, CandidatCompetence.terme == OffreCompetence.terme
+        ).filter(
+            CandidatCompetence.candidat_id == candidat_id
+        ).group_by(
+            OffreCompetence.offre_id
+        ).order_by(
+            communes.desc(), OffreCompetence.offre_id.desc()
+        ).limit(limite).all()
+
+    @staticmethod
+    def indexer_candidats(candidat_ids):
+        """(Ré)indexe les bios d'une liste de candidats"""
+        if not candidat_ids:
+            return
+
+        matcher = SkillIndexService._matcher_vocabulaire()
+        connexion = db.session.connection()
+
+        for debut in range(0, len(candidat_ids), TAILLE_CHUNK):
+            chunk = candidat_ids[debut:debut + TAILLE_CHUNK]
+            lignes = db.session.query(Candidat.id, Candidat.bio).filter(Candidat.id.in_(chunk))
+            SkillIndexService._ecrire_candidats(connexion, chunk, lignes, matcher)
+
+        db.session.commit()
+
+    @staticmethod
+    def supprimer_candidat(candidat_id):
+        """Retire un candidat de l'index (sans commit, dans la transaction appelante)"""
+        db.session.query(CandidatCompetence).filter(
+            CandidatCompetence.candidat_id == candidat_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def suggerer(competences, k=1, limite=50):
+        """
+        Candidats couvrant au moins k des compétences, par couverture décroissante
+        Lecture seule : un terme absent du vocabulaire ne couvre aucun candidat
+        Retourne une liste de (candidat_id, couverture)
+        """
+        termes = sorted(SkillIndexService._normaliser_tous(competences))
+
+        couverture = func.count(CandidatCompetence.terme).label('couverture')
+        return db.session.query(
+            CandidatCompetence.candidat_id, couverture
+        ).filter(
+            CandidatCompetence.terme.in_(termes)
+        ).group_by(
+            CandidatCompetence.candidat_id
+        ).having(
+            couverture >= k
+        ).order_by(
+            couverture.desc(), CandidatCompetence.candidat_id
+        ).limit(limite).all()
+
+    @staticmethod
+    def termes_couverts(candidat_ids, competences):
+        """Termes de `competences` présents dans l'index pour chaque candidat"""
+        termes = sorted(SkillIndexService._normaliser_tous(competences))
+        resultat = {}
+        for terme, candidat_id in db.session.query(
+            CandidatCompetence.terme, CandidatCompetence.candidat_id
+        ).filter(
+            CandidatCompetence.candidat_id.in_(candidat_ids),
+            CandidatCompetence.terme.in_(termes)
+        ):
+            resultat.setdefault(candidat_id, []).append(terme)
+        return resultat
+
+    @staticmethod
+    def reconstruire(connexion, progression=None):
+        """
+        Reconstruit tout l'index sur une connexion (migration, flask indexer-competences) :
+        vocabulaire et représentation de chaque offre, puis chaque bio avec le
+        vocabulaire complet, par lots de TAILLE_CHUNK. Idempotent.
+        Retourne (offres, candidats)
+        """
+        offres = SkillIndexService._parcourir(
+            connexion,
+            select(OffreEmploi.id, OffreEmploi.titre, OffreEmploi.competences),
+            OffreEmploi.id,
+            lambda lignes: SkillIndexService._reconstruire_offres(connexion, lignes)
+        )
+
+        termes = connexion.execute(select(Competence.terme).where(Competence.indexe_bios)).scalars().all()
+        matcher = KeywordMatcher(termes) if termes else None
+
+        def indexer(lignes):
+            SkillIndexService._ecrire_candidats(connexion, [ligne.id for ligne in lignes], lignes, matcher)
+            if progression:
+                progression(offres, lignes[-1].id)
+
+        candidats = SkillIndexService._parcourir(
+            connexion, select(Candidat.id, Candidat.bio), Candidat.id, indexer
+        )
+        return offres, candidats
+
+    # ========== Écritures ==========
+
+    @staticmethod
+    def _ajouter_vocabulaire(connexion, termes, mots_titre):
+        """
+        Insère les termes absents (mots du titre avec indexe_bios faux) et
+        passe en compétences les mots du titre devenus compétences
+        Retourne les compétences à rétro-indexer, triées
+        """
+        mots_titre = mots_titre - termes
+        existants = {}
+        tous = sorted(termes | mots_titre)
+        for debut in range(0, len(tous), TAILLE_CHUNK):
+            existants.update(connexion.execute(
+                select(Competence.terme, Competence.indexe_bios).where(
+                    Competence.terme.in_(tous[debut:debut + TAILLE_CHUNK])
+                )
+            ).all())
+
+        absents = [
+            {"terme": terme, "indexe_bios": terme in termes}
+            for terme in tous if terme not in existants
+        ]
+        # Deux écritures concurrentes peuvent introduire le même terme : doublon ignoré
+        for debut in range(0, len(absents), TAILLE_CHUNK):
+            connexion.execute(SkillIndexService._insert_ignorer(connexion, Competence), absents[debut:debut + TAILLE_CHUNK])
+
+        promus = sorted(terme for terme in termes if existants.get(terme) is False)
+        for debut in range(0, len(promus), TAILLE_CHUNK):
+            connexion.execute(
+                update(Competence).where(
+                    Competence.terme.in_(promus[debut:debut + TAILLE_CHUNK])
+                ).values(indexe_bios=True)
+            )
+
+        return sorted({terme for terme in termes if terme not in existants} | set(promus))
+
+    @staticmethod
+    def _retro_indexer(termes):
+        """Indexe les bios existantes sous les seuls `termes`, un lot validé à la fois"""
+        matcher = KeywordMatcher(termes)
+
+        def indexer(lignes):
+            SkillIndexService._inserer(db.session.connection(), [
+                {"terme": terme, "candidat_id": candidat_id}
+                for candidat_id, bio in lignes
+                for terme in matcher.trouver(bio.lower())
+            ])
+            db.session.commit()
+
+        SkillIndexService._parcourir(
+            db.session, select(Candidat.id, Candidat.bio), Candidat.id, indexer
+        )
+
+    @staticmethod
+    def _reconstruire_offres(connexion, lignes):
+        representations = {
+            offre_id: SkillIndexService.representation(titre, competences)
+            for offre_id, titre, competences in lignes
+        }
+        SkillIndexService._ajouter_vocabulaire(
+            connexion,
+            set().union(*(termes for termes, _ in representations.values())),
+            set().union(*(mots for _, mots in representations.values()))
+        )
+        SkillIndexService._ecrire_offres(connexion, representations)
+
+    @staticmethod
+    def _ecrire_offres(connexion, representations):
+        """Remplace la représentation d'un lot d'offres : {offre_id: (compétences, mots du titre)}"""
+        if not representations:
+            return
+        connexion.execute(delete(OffreCompetence).where(OffreCompetence.offre_id.in_(list(representations))))
+        entrees = [
+            {"terme": terme, "offre_id": offre_id}
+            for offre_id, (termes, mots_titre) in representations.items()
+            for terme in termes | mots_titre
+        ]
+        for debut in range(0, len(entrees), TAILLE_CHUNK):
+            connexion.execute(insert(OffreCompetence), entrees[debut:debut + TAILLE_CHUNK])
+
+    @staticmethod
+    def _ecrire_candidats(connexion, candidat_ids, lignes, matcher):
+        """Remplace les entrées d'un lot de candidats à partir de leurs (id, bio)"""
+        connexion.execute(delete(CandidatCompetence).where(CandidatCompetence.candidat_id.in_(candidat_ids)))
+        if matcher is None:
+            return
+        SkillIndexService._inserer(connexion, [
+            {"terme": terme, "candidat_id": candidat_id}
+            for candidat_id, bio in lignes
+            for terme in matcher.trouver(bio.lower())
+        ])
+
+    @staticmethod
+    def _inserer(connexion, entrees):
+        # insert() sur la table (Core) : pas de traitement ORM ligne à ligne, inutile ici ;
+        # une entrée déjà écrite par un autre processus est ignorée
+        for debut in range(0, len(entrees), TAILLE_CHUNK):
+            connexion.execute(
+                SkillIndexService._insert_ignorer(connexion, CandidatCompetence), entrees[debut:debut + TAILLE_CHUNK]
+            )
+
+    @staticmethod
+    def _insert_ignorer(connexion, modele):
+        """INSERT qui ignore les clés primaires déjà présentes (ON CONFLICT DO NOTHING)"""
+        dialecte = connexion.dialect.name
+        if dialecte == 'postgresql':
+            return postgresql.insert(modele.__table__).on_conflict_do_nothing()
+        if dialecte == 'sqlite':
+            return sqlite.insert(modele.__table__).on_conflict_do_nothing()
+        return insert(modele.__table__)
+
+    @staticmethod
+    def _parcourir(connexion, requete, colonne_id, traiter):
+        """Parcours keyset de `requete` par lots de TAILLE_CHUNK ; retourne le nombre de lignes"""
+        dernier, total = None, 0
+        while True:
+            lot = requete.order_by(colonne_id).limit(TAILLE_CHUNK)
+            if dernier is not None:
+                lot = lot.where(colonne_id > dernier)
+            lignes = connexion.execute(lot).all()
+            if not lignes:
+                return total
+            traiter(lignes)
+            dernier, total = lignes[-1][0], total + len(lignes)
+
+    @staticmethod
+    def _matcher_vocabulaire():
+        # Le vocabulaire des bios ne fait que grandir : sa taille suffit comme version
+        taille = db.session.query(func.count(Competence.terme)).filter(Competence.indexe_bios).scalar()
+
+        with SkillIndexService._lock:
+            if taille != SkillIndexService._taille_vocabulaire:
+                termes = [terme for (terme,) in db.session.query(Competence.terme).filter(Competence.indexe_bios)]
+                SkillIndexService._matcher = KeywordMatcher(termes) if termes else None
+                SkillIndexService._taille_vocabulaire = taille
+            return SkillIndexService._matcher
+
+
+# ============================================================
+# RÉTRO-INDEXATION EN ARRIÈRE-PLAN
+# ============================================================
+class RetroIndexation:
+    """
+    Thread du processus qui rétro-indexe les compétences en attente
+
+    Réveillé par signaler() après l'écriture d'une offre qui introduit une
+    compétence, et toutes les `intervalle` secondes pour reprendre les
+    compétences laissées en attente (processus arrêté, autre worker).
+    Démarré au premier signal : après le fork des workers gunicorn.
+    """
+
+    def __init__(self, app, intervalle=60):
+        self.app = app
+        self.intervalle = intervalle
+        self._evenement = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def signaler(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._travailler, name="retro-indexation", daemon=True)
+                self._thread.start()
+        self._evenement.set()
+
+    def _travailler(self):
+        while True:
+            self._evenement.wait(self.intervalle)
+            self._evenement.clear()
+            try:
+                with self.app.app_context():
+                    traitees = SkillIndexService.retro_indexer_en_attente()
+                if traitees:
+                    print(f"[INFO] {traitees} compétence(s) rétro-indexée(s) sur les bios")
+            except Exception as e:
+                # Compétences toujours en attente : reprises au prochain réveil
+                print(f"[WARNING]  Rétro-indexation des compétences : {e}")
+
+
+def signaler_retro_indexation():
+    """Compétences en attente : réveille le thread du processus s'il est activé"""
+    retro_indexation = current_app.extensions.get('retro_indexation')
+    if retro_indexation is not None:
+        retro_indexation.signaler()
+
+
+# ========================================
+# CLI - Reconstruction de l'index des compétences
+# ========================================
+@click.command('indexer-competences')
+@click.option('--en-attente', is_flag=True,
+              help="Rétro-indexer seulement les nouvelles compétences en attente (sans reconstruction)")
+@with_appcontext
+def indexer_competences_command(en_attente):
+    """Reconstruit l'index des compétences de toutes les offres et de tous les candidats"""
+    if en_attente:
+        traitees = SkillIndexService.retro_indexer_en_attente()
+        click.echo(f"✅ {traitees} compétence(s) rétro-indexée(s)")
+        return
+
+    def progression(offres, dernier_candidat):
+        click.echo(f"\r  {offres} offres, candidats jusqu'à l'id {dernier_candidat}", nl=False)
+
+    offres, candidats = SkillIndexService.reconstruire(db.session.connection(), progression)
+    # Toutes les bios viennent d'être parcourues avec le vocabulaire complet
+    db.session.execute(update(Competence).values(retro_indexe=True))
+    db.session.commit()
+    click.echo(f"\n✅ Index reconstruit : {offres} offres, {candidats} candidats")
+
+
+def init_app(app):
+    if app.config['SKILL_RETRO_INDEX_THREAD']:
+        app.extensions['retro_indexation'] = RetroIndexation(app, app.config['SKILL_RETRO_INDEX_INTERVAL'])
+    app.cli.add_command(indexer_competences_command)
@@ -0,0 +1,370 @@
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from config import Config
+from services.utils.query_budget import hors_budget
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - dépendances optionnelles
+    np = None
+    sparse = None
+
+# Les lignes validées peu après la synchronisation précédente sont relues
+MARGE_SYNCHRO = timedelta(seconds=60)
+
+TOKEN_RE = re.compile(r"[\w+#]{2,}")
+
+STOPWORDS = {
+    'au', 'aux', 'avec', 'ce', 'ces', 'cette', 'dans', 'de', 'des', 'du', 'elle', 'en', 'est',
+    'et', 'il', 'je', 'la', 'le', 'les', 'leur', 'mais', 'me', 'mes', 'mon', 'ne', 'nous', 'ou',
+    'par', 'pas', 'pour', 'qu', 'que', 'qui', 'sa', 'se', 'ses', 'son', 'sur', 'ta', 'un', 'une',
+    'vous', 'être', 'avoir', 'the', 'and', 'of', 'to', 'in', 'for', 'with', 'on'
+}
+
+
+class TfidfIndisponible(RuntimeError):
+    """NumPy/SciPy absents : le moteur TF-IDF ne peut pas être utilisé"""
+
+
+def tokeniser(texte):
+    return [t for t in TOKEN_RE.findall(texte.lower()) if t not in STOPWORDS]
+
+
+def texte_candidat(candidat):
+    return f"{candidat.bio} {candidat.diplome}"
+
+
+def texte_offre(offre):
+    # Les compétences sont répétées pour peser plus que la description
+    competences = " ".join(offre.competences)
+    return f"{offre.titre} {offre.description} {competences} {competences}"
+
+
+class TfidfEngine:
+    """
+    Moteur de similarité TF-IDF offres x candidats (NumPy/SciPy)
+
+    Les bios (+ diplôme) sont vectorisées dans une matrice creuse CSR dont
+    les lignes sont normalisées (L2) : la similarité cosinus d'une ou
+    plusieurs offres contre tous les candidats est un seul produit matriciel.
+    Vocabulaire, IDF et matrice sont sauvegardés dans un fichier .npz.
+    """
+
+    def __init__(self):
+        self.vocabulaire = {}     # terme -> colonne
+        self.termes = []          # colonne -> terme
+        self.idf = None
+        self.matrice = None       # (n_candidats x V), lignes normalisées
+        self.ids = []             # id du candidat de chaque ligne
+        self.date_construction = None
+        self.date_synchro = None  # dernière relecture des candidats modifiés en base
+        self._lignes = {}         # id -> ligne
+        self._modifies = {}       # id -> vecteur (1 x V), ou None si supprimé
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def disponible():
+        return np is not None
+
+    @property
+    def construit(self):
+        return self.idf is not None
+
+    # ========== Construction ==========
+
+    def construire(self, documents):
+        """Construit vocabulaire, IDF et matrice à partir de (id, texte)"""
+        ids = []
+        tokens_docs = []
+        df = {}
+        for id, texte in documents:
+            tokens = tokeniser(texte)
+            ids.append(id)
+            tokens_docs.append(tokens)
+            for terme in set(tokens):
+                df[terme] = df.get(terme, 0) + 1
+
+        termes = sorted(df)
+        vocabulaire = {terme: i for i, terme in enumerate(termes)}
+        n = len(ids)
+        # IDF lissé : log((1 + n) / (1 + df)) + 1
+        idf = np.log((1 + n) / (1 + np.array([df[t] for t in termes], dtype=np.float64))) + 1
+
+        with self._lock:
+            self.vocabulaire = vocabulaire
+            self.termes = termes
+            self.idf = idf
+            self.matrice = self._vectoriser_tokens(tokens_docs)
+            self.ids = ids
+            self._lignes = {id: i for i, id in enumerate(ids)}
+            self._modifies = {}
+            self.date_construction = datetime.utcnow()
+            self.date_synchro = self.date_construction
+
+    def vectoriser(self, textes):
+        """Matrice TF-IDF normalisée des textes (termes hors vocabulaire ignorés)"""
+        return self._vectoriser_tokens([tokeniser(texte) for texte in textes])
+
+    def _vectoriser_tokens(self, tokens_docs):
+        lignes, colonnes, valeurs = [], [], []
+        for i, tokens in enumerate(tokens_docs):
+            compte = {}
+            for terme in tokens:
+                colonne = self.vocabulaire.get(terme)
+                if colonne is not None:
+                    compte[colonne] = compte.get(colonne, 0) + 1
+            lignes.extend([i] * len(compte))
+            colonnes.extend(compte.keys())
+            valeurs.extend(compte.values())
+
+        matrice = sparse.csr_matrix(
+            (np.array(valeurs, dtype=np.float64), (lignes, colonnes)),
+            shape=(len(tokens_docs), len(self.termes))
+        )
+        matrice = matrice.multiply(self.idf).tocsr()
+
+        # Normalisation L2 des lignes : cosinus = produit scalaire
+        normes = np.sqrt(np.asarray(matrice.multiply(matrice).sum(axis=1)).ravel())
+        normes[normes == 0] = 1.0
+        return sparse.diags(1.0 / normes).dot(matrice).tocsr()
+
+    # ========== Similarités ==========
+
+    def similarites(self, texte, textes):
+        """Cosinus d'un texte d'offre contre une liste de textes (un seul produit)"""
+        requete = self.vectoriser([texte])
+        documents = self.vectoriser(textes)
+        produit = documents.multiply(requete).tocsr()   # contributions par terme
+        scores = np.asarray(produit.sum(axis=1)).ravel()
+        return scores, produit
+
+    def similarites_bloc(self, textes_offres):
+        """
+        Cosinus d'un bloc d'offres contre tous les candidats indexés
+        Retourne (matrice dense m x n, ids des candidats)
+        """
+        with self._lock:
+            self._compacter()
+            requetes = self.vectoriser(textes_offres)
+            return (requetes.dot(self.matrice.T)).toarray(), list(self.ids)
+
+    def plus_proches(self, textes_offres, limite):
+        """
+        Pour chaque offre du bloc, les `limite` candidats les plus similaires
+        Retourne une liste de listes de (candidat_id, similarité)
+        """
+        similarites, ids = self.similarites_bloc(textes_offres)
+        resultats = []
+        for ligne in similarites:
+            n = min(limite, len(ligne))
+            # Sélection partielle O(n) puis tri des seuls meilleurs
+            meilleurs = np.argpartition(-ligne, n - 1)[:n] if n else []
+            meilleurs = sorted(meilleurs, key=lambda i: (-ligne[i], ids[i]))
+            resultats.append([(ids[i], float(ligne[i])) for i in meilleurs if ligne[i] > 0])
+        return resultats
+
+    def termes_principaux(self, contributions, ligne, n=3):
+        debut, fin = contributions.indptr[ligne], contributions.indptr[ligne + 1]
+        colonnes = contributions.indices[debut:fin]
+        valeurs = contributions.data[debut:fin]
+        ordre = np.argsort(valeurs)[::-1][:n]
+        return [self.termes[colonnes[i]] for i in ordre]
+
+    # ========== Mises à jour incrémentales ==========
+
+    def mettre_a_jour(self, id, texte):
+        with self._lock:
+            if self.construit:
+                self._modifies[id] = self.vectoriser([texte])
+
+    def supprimer(self, id):
+        with self._lock:
+            if self.construit:
+                self._modifies[id] = None
+
+    def ids_indexes(self):
+        """Ids des candidats présents dans la matrice, modifications en attente comprises"""
+        with self._lock:
+            ids = set(self.ids)
+            for id, vecteur in self._modifies.items():
+                if vecteur is None:
+                    ids.discard(id)
+                else:
+                    ids.add(id)
+            return ids
+
+    def _compacter(self):
+        # Applique les lignes modifiées/supprimées à la matrice
+        if not self._modifies:
+            return
+
+        garder = [i for i, id in enumerate(self.ids) if id not in self._modifies]
+        blocs = [self.matrice[garder]]
+        ids = [self.ids[i] for i in garder]
+        for id, vecteur in self._modifies.items():
+            if vecteur is not None:
+                blocs.append(vecteur)
+                ids.append(id)
+
+        self.matrice = sparse.vstack(blocs).tocsr()
+        self.ids = ids
+        self._lignes = {id: i for i, id in enumerate(ids)}
+        self._modifies = {}
+
+    # ========== Persistance ==========
+
+    def sauvegarder(self, chemin):
+        with self._lock:
+            self._compacter()
+            os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+            fichier_tmp = chemin + '.tmp.npz'
+            np.savez_compressed(
+                fichier_tmp,
+                data=self.matrice.data,
+                indices=self.matrice.indices,
+                indptr=self.matrice.indptr,
+                shape=np.array(self.matrice.shape),
+                idf=self.idf,
+                termes=np.array(self.termes, dtype=str),
+                ids=np.array(self.ids, dtype=np.int64),
+                date_construction=np.array(self.date_construction.isoformat())
+            )
+            os.replace(fichier_tmp, chemin)
+
+    def charger(self, chemin):
+        with np.load(chemin, allow_pickle=False) as donnees:
+            matrice = sparse.csr_matrix(
+                (donnees['data'], donnees['indices'], donnees['indptr']),
+                shape=tuple(donnees['shape'])
+            )
+            termes = [str(t) for t in donnees['termes']]
+            with self._lock:
+                self.termes = termes
+                self.vocabulaire = {terme: i for i, terme in enumerate(termes)}
+                self.idf = donnees['idf']
+                self.matrice = matrice
+                self.ids = [int(id) for id in donnees['ids']]
+                self._lignes = {id: i for i, id in enumerate(self.ids)}
+                self._modifies = {}
+                self.date_construction = datetime.fromisoformat(str(donnees['date_construction']))
+                self.date_synchro = self.date_construction
+
+    def stats(self):
+        with self._lock:
+            return {
+                "disponible": self.disponible(),
+                "construit": self.construit,
+                "candidats": len(self.ids),
+                "vocabulaire": len(self.termes),
+                "modifications_en_attente": len(self._modifies),
+                "date_construction": self.date_construction.isoformat() if self.date_construction else None,
+                "date_synchro": self.date_synchro.isoformat() if self.date_synchro else None
+            }
+
+
+# Moteur partagé par le worker, chargé à la première utilisation
+tfidf_engine = TfidfEngine()
+_chargement_lock = threading.Lock()
+
+
+def obtenir_moteur():
+    """
+    Retourne le moteur prêt à l'emploi (dans un contexte d'application)
+    Charge le fichier persisté s'il existe, sinon construit et sauvegarde ;
+    toutes les TFIDF_SYNC_INTERVAL secondes, relit les candidats écrits par
+    les autres workers
+    """
+    if not TfidfEngine.disponible():
+        raise TfidfIndisponible("Moteur TF-IDF indisponible : installer numpy et scipy")
+
+    if tfidf_engine.construit:
+        echeance = tfidf_engine.date_synchro + timedelta(seconds=Config.TFIDF_SYNC_INTERVAL)
+        # Un seul thread synchronise, les autres utilisent la matrice en l'état
+        if datetime.utcnow() >= echeance and _chargement_lock.acquire(blocking=False):
+            try:
+                with hors_budget():
+                    synchroniser_moteur()
+            finally:
+                _chargement_lock.release()
+        return tfidf_engine
+
+    with _chargement_lock, hors_budget():
+        if not tfidf_engine.construit:
+            chemin = Config.TFIDF_INDEX_PATH
+            if os.path.exists(chemin):
+                tfidf_engine.charger(chemin)
+                synchroniser_moteur()
+            else:
+                reconstruire_moteur()
+
+    return tfidf_engine
+
+
+def reconstruire_moteur():
+    """Reconstruction complète depuis la base puis sauvegarde"""
+    from models import db
+    from models.candidat import Candidat
+
+    documents = (
+        (id, f"{bio} {diplome}")
+        for id, bio, diplome in db.session.query(Candidat.id, Candidat.bio, Candidat.diplome).yield_per(1000)
+    )
+    tfidf_engine.construire(documents)
+    tfidf_engine.sauvegarder(Config.TFIDF_INDEX_PATH)
+    return tfidf_engine
+
+
+def synchroniser_moteur():
+    """
+    Rattrape les écritures faites hors de ce worker (autres workers, avant
+    un redémarrage) depuis la dernière synchronisation, sans reconstruction :
+    candidats créés ou modifiés (updated_at, indexé) revectorisés, candidats
+    supprimés retirés. Les ids ne sont relus que si le nombre de candidats
+    en base diffère de celui de la matrice.
+    """
+    from sqlalchemy import func
+    from models import db
+    from models.candidat import Candidat
+
+    debut = datetime.utcnow()
+    for id, bio, diplome in db.session.query(Candidat.id, Candidat.bio, Candidat.diplome).filter(
+        Candidat.updated_at > tfidf_engine.date_synchro - MARGE_SYNCHRO
+    ).yield_per(1000):
+        tfidf_engine.mettre_a_jour(id, f"{bio} {diplome}")
+
+    indexes = tfidf_engine.ids_indexes()
+    if db.session.query(func.count(Candidat.id)).scalar() != len(indexes):
+        existants = {id for (id,) in db.session.query(Candidat.id).yield_per(10000)}
+        for id in indexes - existants:
+            tfidf_engine.supprimer(id)
+        notifier_candidats(sorted(existants - indexes))
+
+    tfidf_engine.date_synchro = debut
+
+
+def notifier_candidats(candidat_ids):
+    """
+    Revectorise des candidats créés ou modifiés, si le moteur est chargé
+    dans ce worker (les autres workers les relisent à leur prochaine
+    synchronisation, ou à leur prochain chargement)
+    """
+    if not TfidfEngine.disponible() or not tfidf_engine.construit or not candidat_ids:
+        return
+
+    from models import db
+    from models.candidat import Candidat
+
+    for debut in range(0, len(candidat_ids), 1000):
+        chunk = candidat_ids[debut:debut + 1000]
+        for id, bio, diplome in db.session.query(
+            Candidat.id, Candidat.bio, Candidat.diplome
+        ).filter(Candidat.id.in_(chunk)):
+            tfidf_engine.mettre_a_jour(id, f"{bio} {diplome}")
+
+
+def notifier_suppression(candidat_id):
+    if TfidfEngine.disponible():
+        tfidf_engine.supprimer(candidat_id)
@@ -0,0 +1,51 @@
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, request
+
+
+def jeton_requis(config):
+    """Vrai si les routes internes exigent un jeton, faux si elles sont libres (développement)"""
+    return bool(config['INTERNAL_STATS_TOKEN']) or config['APP_ENV'] == 'production'
+
+
+def refuser_acces_interne():
+    """
+    Contrôle d'accès des routes internes (/api/internal/*, /metrics) et
+    des routes d'administration marquées @acces_interne
+    Retourne None si l'accès est permis, sinon la réponse d'erreur :
+
+    - INTERNAL_STATS_TOKEN défini : jeton attendu en X-Internal-Token ou
+      Authorization: Bearer, 403 sinon
+    - jeton vide en production (APP_ENV=production) : routes désactivées (404)
+    - jeton vide hors production : accès libre
+    """
+    jeton = current_app.config['INTERNAL_STATS_TOKEN']
+    if not jeton:
+        if not jeton_requis(current_app.config):
+            return None
+        return jsonify({
+            "success": False,
+            "error": "Routes internes désactivées : définir INTERNAL_STATS_TOKEN"
+        }), 404
+
+    fournis = (
+        request.headers.get('X-Internal-Token', ''),
+        request.headers.get('Authorization', '').removeprefix('Bearer ')
+    )
+    if not any(hmac.compare_digest(fourni, jeton) for fourni in fournis):
+        return jsonify({
+            "success": False,
+            "error": "Jeton interne invalide"
+        }), 403
+    return None
+
+
+def acces_interne(vue):
+    """Route d'administration soumise au même contrôle que les routes internes"""
+    @wraps(vue)
+    def verifiee(*args, **kwargs):
+        refus = refuser_acces_interne()
+        if refus is not None:
+            return refus
+        return vue(*args, **kwargs)
+    return verifiee
@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+
+class ChampsError(ValueError):
+    """Paramètre fields invalide"""
+
+
+def lire_champs(args, disponibles):
+    """
+    Lit ?fields=nom,email : None si absent (tous les champs),
+    sinon les champs demandés dans l'ordre de `disponibles`
+    """
+    valeur = args.get('fields')
+    if valeur is None:
+        return None
+
+    demandes = {champ.strip() for champ in valeur.split(',') if champ.strip()}
+    if not demandes:
+        raise ChampsError("fields ne peut pas être vide")
+
+    inconnus = demandes.difference(disponibles)
+    if inconnus:
+        raise ChampsError(
+            f"Champs inconnus : {', '.join(sorted(inconnus))} "
+            f"(disponibles : {', '.join(disponibles)})"
+        )
+
+    return [champ for champ in disponibles if champ in demandes]
+
+
+@lru_cache(maxsize=256)
+def schema_restreint(schema_cls, champs, many=False):
+    """Instance de schéma limitée à `champs` (only=), réutilisée entre les requêtes"""
+    return schema_cls(only=champs, many=many)
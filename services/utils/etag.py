@@ -0,0 +1,109 @@
+import hashlib
+from flask import Response, request
+from sqlalchemy import func, select, text
+from models import db
+from models.version_table import VersionTable
+
+# Tables dont les listes ont un ETag : suppressions comptées par trigger
+TABLES_VERSIONNEES = ('candidats', 'offres_emploi')
+
+
+def calculer_etag(*parties):
+    """ETag fort : empreinte des éléments qui déterminent la représentation"""
+    contenu = "|".join(str(partie) for partie in parties)
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()[:32]
+
+
+def version_table(model):
+    """
+    Version d'une table en une seule requête : (max id, max updated_at, suppressions)
+    Une création change max id, une modification max updated_at et une
+    suppression le compteur du trigger ; chaque valeur est lue dans un index
+    (clé primaire, ix_*_updated_at), sans parcourir la table
+    """
+    return db.session.query(
+        select(func.max(model.id)).scalar_subquery(),
+        select(func.max(model.updated_at)).scalar_subquery(),
+        select(VersionTable.suppressions).where(VersionTable.nom == model.__tablename__).scalar_subquery()
+    ).one()
+
+
+def initialiser_versions():
+    """Crée les compteurs de suppressions s'ils n'existent pas encore (idempotent)"""
+    with db.engine.begin() as connexion:
+        creer_compteurs(connexion)
+
+
+def creer_compteurs(connexion):
+    """Lignes de versions_tables et triggers AFTER DELETE (démarrage ou migration Alembic)"""
+    dialecte = connexion.dialect.name
+    if dialecte not in ('postgresql', 'sqlite'):
+        print(f"[WARNING]  Compteur de suppressions non disponible pour {dialecte}")
+        return
+
+    for table in TABLES_VERSIONNEES:
+        connexion.execute(text(
+            "INSERT INTO versions_tables (nom, suppressions) VALUES (:nom, 0) ON CONFLICT DO NOTHING"
+        ), {"nom": table})
+
+    if dialecte == 'postgresql':
+        connexion.execute(text("""
+            CREATE OR REPLACE FUNCTION compter_suppressions() RETURNS trigger AS $$
+            BEGIN
+                UPDATE versions_tables SET suppressions = suppressions + 1 WHERE nom = TG_TABLE_NAME;
+                RETURN NULL;
+            END $$ LANGUAGE plpgsql
+        """))
+        for table in TABLES_VERSIONNEES:
+            connexion.execute(text(f"DROP TRIGGER IF EXISTS {table}_suppressions ON {table}"))
+            # Une fois par instruction : une suppression en masse ne coûte qu'une mise à jour
+            connexion.execute(text(f"""
+                CREATE TRIGGER {table}_suppressions AFTER DELETE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION compter_suppressions()
+            """))
+    else:
+        for table in TABLES_VERSIONNEES:
+            connexion.execute(text(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_suppressions AFTER DELETE ON {table} BEGIN
+                    UPDATE versions_tables SET suppressions = suppressions + 1 WHERE nom = '{table}';
+                END
+            """))
+
+
+def supprimer_compteurs(connexion):
+    """Inverse de creer_compteurs (downgrade des migrations)"""
+    dialecte = connexion.dialect.name
+    for table in TABLES_VERSIONNEES:
+        if dialecte == 'postgresql':
+            connexion.execute(text(f"DROP TRIGGER IF EXISTS {table}_suppressions ON {table}"))
+        elif dialecte == 'sqlite':
+            connexion.execute(text(f"DROP TRIGGER IF EXISTS {table}_suppressions"))
+    if dialecte == 'postgresql':
+        connexion.execute(text("DROP FUNCTION IF EXISTS compter_suppressions()"))
+
+
+def etag_liste(model):
+    """ETag d'une page de liste : version de la table + paramètres de la requête"""
+    return calculer_etag(model.__tablename__, *version_table(model), request.full_path)
+
+
+def etag_entite(model, ligne):
+    """ETag d'une entité (instance ou ligne) : identifiant, dernière modification et paramètres (?fields=)"""
+    return calculer_etag(model.__tablename__, ligne.id, ligne.updated_at, request.full_path)
+
+
+def non_modifie(etag):
+    """Vrai si le client possède déjà cette version (If-None-Match, comparaison faible)"""
+    return request.if_none_match.contains_weak(etag)
+
+
+def reponse_304(etag):
+    """Réponse 304 sans corps : aucune sérialisation n'est faite"""
+    return avec_etag(Response(status=304), etag)
+
+
+def avec_etag(reponse, etag):
+    # no-cache : le navigateur garde la réponse mais revalide à chaque fois
+    reponse.set_etag(etag)
+    reponse.headers['Cache-Control'] = 'no-cache'
+    return reponse
@@ -0,0 +1,39 @@
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    Recherche multi-motifs compilée une seule fois pour une table de mots-clés
+
+    Avec pyahocorasick, tous les mots-clés présents dans un texte sont trouvés
+    en un seul parcours (automate d'Aho-Corasick). Sans la dépendance, on
+    revient à un test `in` par mot-clé distinct, avec le même résultat.
+    """
+
+    def __init__(self, mots_cles, utiliser_automate=True):
+        # Dédoublonner en gardant l'ordre
+        self.mots_cles = list(dict.fromkeys(mots_cles))
+
+        # Une chaîne vide est contenue dans tout texte (même sémantique que `in`)
+        self._toujours = {mot for mot in self.mots_cles if mot == ""}
+        self._automate = None
+
+        if utiliser_automate and ahocorasick is not None:
+            automate = ahocorasick.Automaton()
+            for mot in self.mots_cles:
+                if mot:
+                    automate.add_word(mot, mot)
+            if len(automate) > 0:
+                automate.make_automaton()
+                self._automate = automate
+
+    def trouver(self, texte):
+        """Retourne l'ensemble des mots-clés contenus dans le texte"""
+        if self._automate is not None:
+            trouves = {mot for _, mot in self._automate.iter(texte)}
+            return trouves | self._toujours if self._toujours else trouves
+
+        return {mot for mot in self.mots_cles if mot in texte}
@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+from config import Config
+
+
+class PaginationError(ValueError):
+    """Paramètre de pagination invalide (limit, page ou cursor)"""
+
+
+def lire_limite(args):
+    """Lit ?limit=, borné par Config.API_MAX_PAGE_SIZE"""
+    valeur = args.get('limit', Config.API_DEFAULT_PAGE_SIZE)
+    try:
+        limite = int(valeur)
+    except (TypeError, ValueError):
+        raise PaginationError("limit doit être un entier")
+
+    if limite < 1:
+        raise PaginationError("limit doit être positif")
+
+    return min(limite, Config.API_MAX_PAGE_SIZE)
+
+
+def lire_page(args):
+    """Lit ?page= (pagination par numéro de page, 1 par défaut)"""
+    try:
+        page = int(args.get('page', 1))
+    except (TypeError, ValueError):
+        raise PaginationError("page doit être un entier")
+
+    if page < 1:
+        raise PaginationError("page doit être positif")
+
+    return page
+
+
+def encoder_curseur(date, id):
+    """Curseur opaque à partir de la clé (date, id) de la dernière ligne"""
+    contenu = json.dumps([date.isoformat() if date else None, id])
+    return base64.urlsafe_b64encode(contenu.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decoder_curseur(curseur):
+    try:
+        rembourrage = '=' * (-len(curseur) % 4)
+        date, id = json.loads(base64.urlsafe_b64decode(curseur + rembourrage))
+        return (datetime.fromisoformat(date) if date else None), int(id)
+    except (ValueError, TypeError):
+        raise PaginationError("cursor invalide")
+
+
+def paginer_keyset(query, colonne_date, colonne_id, limite, curseur=None):
+    """
+    Pagination par clé (keyset) sur (date DESC, id DESC)
+
+    La page suivante reprend strictement après la dernière ligne lue, ce qui
+    utilise l'index composite (date, id) au lieu d'un OFFSET.
+    Retourne (lignes, next_cursor) ; next_cursor vaut None en fin de liste.
+    """
+    if curseur:
+        date, id = decoder_curseur(curseur)
+        query = query.filter(or_(
+            colonne_date < date,
+            and_(colonne_date == date, colonne_id < id)
+        ))
+
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    lignes = query.order_by(colonne_date.desc(), colonne_id.desc()).limit(limite + 1).all()
+
+    if len(lignes) <= limite:
+        return lignes, None
+
+    lignes = lignes[:limite]
+    derniere = lignes[-1]
+    return lignes, encoder_curseur(
+        getattr(derniere, colonne_date.key),
+        getattr(derniere, colonne_id.key)
+    )
+
+
+def total_demande(args):
+    """Le COUNT(*) n'est calculé que sur demande (?total=true)"""
+    return args.get('total', 'false').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,142 @@
+import traceback
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Modes du garde-fou (QUERY_BUDGET_MODE)
+MODE_OFF = "off"       # aucun comptage (production)
+MODE_LOG = "log"       # dépassement affiché avec la pile d'appels (développement)
+MODE_RAISE = "raise"   # dépassement -> exception, la requête échoue (tests, scripts de contrôle)
+MODES = (MODE_OFF, MODE_LOG, MODE_RAISE)
+
+# Frames de la pile conservées dans le message (les plus proches de la requête SQL)
+PROFONDEUR_PILE = 12
+
+
+class BudgetRequetesDepasse(AssertionError):
+    """Une requête HTTP a exécuté plus d'instructions SQL que le budget de sa route"""
+
+
+def budget_requetes(maximum, asynchrone=None):
+    """
+    Déclare le nombre maximum d'instructions SQL d'une route, quel que soit
+    le volume de données (à placer sous @bp.route)
+
+    asynchrone : budget distinct du chemin qui met le travail en file
+    (?async=1), appliqué quand la route appelle passer_en_asynchrone()
+    """
+    def decorateur(vue):
+        vue.budget_requetes = maximum
+        vue.budget_asynchrone = asynchrone
+        return vue
+    return decorateur
+
+
+def passer_en_asynchrone():
+    """La requête suit le chemin asynchrone de sa route : budget `asynchrone` de @budget_requetes"""
+    compteur = g.get('_budget_sql') if has_request_context() else None
+    vue = current_app.view_functions.get(request.endpoint) if compteur is not None else None
+    budget = getattr(vue, 'budget_asynchrone', None)
+    if budget is None:
+        return
+    compteur["budget"] = budget
+    # Instructions déjà exécutées dans le nouveau budget : pas de dépassement
+    if compteur["requetes"] <= budget:
+        compteur["depassement"] = None
+
+
+def _budget_route():
+    vue = current_app.view_functions.get(request.endpoint)
+    budget = getattr(vue, 'budget_requetes', None)
+    return budget if budget is not None else current_app.config['QUERY_BUDGET_DEFAULT']
+
+
+def _pile_application():
+    # Pile sans les frames de SQLAlchemy/Flask : on garde le code de l'application
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if 'site-packages' not in frame.filename and 'query_budget' not in frame.filename
+    ]
+    return ''.join(traceback.format_list(frames[-PROFONDEUR_PILE:]))
+
+
+def init_app(app, engine):
+    """Compte les instructions SQL de chaque requête et applique le budget de la route"""
+    mode = app.config['QUERY_BUDGET_MODE']
+    if mode not in MODES:
+        raise ValueError(f"QUERY_BUDGET_MODE doit valoir {', '.join(MODES)}")
+    if mode == MODE_OFF:
+        return
+
+    @app.before_request
+    def _ouvrir_budget():
+        budget = _budget_route()
+        if budget is not None:
+            g._budget_sql = {"budget": budget, "requetes": 0, "depassement": None}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _compter(conn, cursor, statement, parameters, context, executemany):
+        # Les threads d'analyse et la CLI n'ont pas de contexte de requête
+        compteur = g.get('_budget_sql') if has_request_context() else None
+        if compteur is None or compteur.get("suspendu"):
+            return
+        compteur["requetes"] += 1
+        # Première instruction hors budget : c'est souvent celle de la boucle N+1
+        if compteur["requetes"] == compteur["budget"] + 1:
+            compteur["depassement"] = (statement, _pile_application())
+
+    @app.after_request
+    def _verifier_budget(response):
+        compteur = g.pop('_budget_sql', None)
+        if compteur is None or compteur["depassement"] is None:
+            return response
+
+        instruction, pile = compteur["depassement"]
+        message = (
+            f"{request.method} {request.path} : {compteur['requetes']} instructions SQL "
+            f"pour un budget de {compteur['budget']}\n"
+            f"Première instruction hors budget : {' '.join(instruction.split())[:300]}\n{pile}"
+        )
+        if mode == MODE_RAISE:
+            raise BudgetRequetesDepasse(message)
+        print(f"[WARNING]  Budget de requêtes dépassé - {message}")
+        return response
+
+
+@contextmanager
+def hors_budget():
+    """
+    Instructions du bloc non comptées dans le budget de la route : travail
+    périodique fait au passage d'une requête (chargement, synchronisation)
+    """
+    compteur = g.get('_budget_sql') if has_request_context() else None
+    if compteur is None or compteur.get("suspendu"):
+        yield
+        return
+
+    compteur["suspendu"] = True
+    try:
+        yield
+    finally:
+        compteur["suspendu"] = False
+
+
+@contextmanager
+def compter_requetes(engine):
+    """
+    Instructions SQL exécutées dans le bloc (scripts de contrôle)
+
+        with compter_requetes(db.engine) as requetes:
+            client.get('/api/candidates')
+        len(requetes)
+    """
+    requetes = []
+
+    def _enregistrer(conn, cursor, statement, parameters, context, executemany):
+        requetes.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _enregistrer)
+    try:
+        yield requetes
+    finally:
+        event.remove(engine, "before_cursor_execute", _enregistrer)
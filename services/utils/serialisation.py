@@ -0,0 +1,173 @@
+import re
+from datetime import datetime
+from flask import current_app
+from marshmallow import fields
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+# Caractères que json.dumps(ensure_ascii=True) échappe et qu'orjson laisse en UTF-8
+NON_ASCII_RE = re.compile('[^\x00-\x7e]')
+
+# Au-delà, un remplacement par caractère distinct coûte plus qu'une substitution
+MAX_CARACTERES_DISTINCTS = 64
+
+
+class FlottantStandard(float):
+    """
+    Flottant qu'orjson n'écrirait pas comme repr() (exposants, NaN) : orjson
+    refuse cette sous-classe et la réponse repasse par l'encodeur standard
+    """
+
+
+def _echappement(caractere):
+    # Même forme que json.dumps : \uXXXX minuscule, paires de substitution au-delà du BMP
+    code = ord(caractere)
+    if code < 0x10000:
+        return '\\u%04x' % code
+    code -= 0x10000
+    return '\\u%04x\\u%04x' % (0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff))
+
+
+def echapper_ascii(texte):
+    """Échappe les caractères hors ASCII imprimable comme json.dumps(ensure_ascii=True)"""
+    distincts = set(NON_ASCII_RE.findall(texte))
+    if len(distincts) > MAX_CARACTERES_DISTINCTS:
+        return NON_ASCII_RE.sub(lambda match: _echappement(match.group()), texte)
+
+    # Peu de caractères distincts (accents) : un remplacement C par caractère
+    for caractere in distincts:
+        texte = texte.replace(caractere, _echappement(caractere))
+    return texte
+
+
+def _flottant(valeur):
+    valeur = float(valeur)
+    # orjson et repr() n'écrivent pas les exposants de la même façon
+    if valeur != 0 and not (1e-4 <= abs(valeur) < 1e16):
+        return FlottantStandard(valeur)
+    return valeur
+
+
+def _date(valeur):
+    return valeur.isoformat()
+
+
+def _liste_chaines(valeur):
+    return [str(element) for element in valeur]
+
+
+def _conversion(champ):
+    """Conversion identique au _serialize du champ, None si la valeur lue en base convient déjà"""
+    if isinstance(champ, fields.List) and isinstance(champ.inner, fields.String):
+        return _liste_chaines
+    if isinstance(champ, fields.DateTime) and champ.format in (None, 'iso'):
+        # orjson écrit les datetime en C, au même format qu'isoformat()
+        return None if orjson is not None else _date
+    if isinstance(champ, fields.Float):
+        return _flottant
+    if isinstance(champ, (fields.Integer, fields.String)):   # Email hérite de String
+        return None
+    raise TypeError(f"Champ {champ.__class__.__name__} non pris en charge par le sérialiseur rapide")
+
+
+class SerialiseurRapide:
+    """
+    Sérialiseur précompilé d'un schéma Marshmallow, pour des lignes de colonnes
+
+    Les champs du schéma sont résolus une seule fois en noms, colonnes et
+    conversions : les lectures chargent des tuples (pas d'instances ORM) et
+    produisent les dictionnaires de schema.dump. Seuls les champs qui en ont
+    besoin (flottants, listes, dates sans orjson) sont convertis : le résultat
+    est destiné à reponse_json, qui écrit les dates restantes en ISO 8601.
+    """
+
+    def __init__(self, schema, model, champs=None):
+        self.schema = schema
+        self.model = model
+        self.noms = []
+        self.colonnes = []
+        self.conversions = []   # (position, nom, conversion)
+        self._restreints = {}
+
+        dump_fields = [
+            (nom, champ) for nom, champ in schema.dump_fields.items()
+            if champs is None or (champ.data_key or nom) in champs
+        ]
+        for position, (nom, champ) in enumerate(dump_fields):
+            self.noms.append(champ.data_key or nom)
+            self.colonnes.append(getattr(model, champ.attribute or nom))
+            conversion = _conversion(champ)
+            if conversion is not None:
+                self.conversions.append((position, champ.data_key or nom, conversion))
+
+    def restreindre(self, champs):
+        """
+        Sérialiseur limité à `champs` (None = tous), mis en cache : seules
+        leurs colonnes sont lues en base
+        """
+        if champs is None:
+            return self
+        cle = tuple(champs)
+        if cle not in self._restreints:
+            self._restreints[cle] = SerialiseurRapide(self.schema, self.model, cle)
+        return self._restreints[cle]
+
+    def colonnes_requete(self, *obligatoires):
+        """
+        Colonnes à sélectionner : celles du schéma, puis les colonnes
+        obligatoires absentes (pagination, ETag), ignorées par dump
+        """
+        presentes = {colonne.key for colonne in self.colonnes}
+        return self.colonnes + [colonne for colonne in obligatoires if colonne.key not in presentes]
+
+    def dump_un(self, ligne):
+        resultat = dict(zip(self.noms, ligne))
+        for position, nom, conversion in self.conversions:
+            valeur = ligne[position]
+            if valeur is not None:
+                resultat[nom] = conversion(valeur)
+        return resultat
+
+    def dump(self, lignes):
+        return [self.dump_un(ligne) for ligne in lignes]
+
+
+def _defaut(valeur):
+    # Dates laissées natives par SerialiseurRapide : même forme que DateTime
+    if isinstance(valeur, datetime):
+        return valeur.isoformat()
+    return current_app.json.default(valeur)
+
+
+def _reponse_standard(fournisseur, donnees, indente):
+    # Même sortie que fournisseur.response(), dates ISO comprises
+    arguments = {"indent": 2} if indente else {"separators": (",", ":")}
+    return current_app.response_class(
+        f"{fournisseur.dumps(donnees, default=_defaut, **arguments)}\n", mimetype=fournisseur.mimetype
+    )
+
+
+def reponse_json(donnees):
+    """
+    Équivalent de jsonify(donnees), octet pour octet, encodé avec orjson si installé
+    (clés triées, séparateurs compacts, échappement ASCII, saut de ligne final)
+    """
+    fournisseur = current_app.json
+    indente = (fournisseur.compact is None and current_app.debug) or fournisseur.compact is False
+
+    if orjson is None or indente or not fournisseur.sort_keys or not fournisseur.ensure_ascii:
+        return _reponse_standard(fournisseur, donnees, indente)
+
+    try:
+        texte = orjson.dumps(donnees, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+    except TypeError:
+        # FlottantStandard, type inconnu d'orjson ou entier hors 64 bits : encodeur standard
+        return _reponse_standard(fournisseur, donnees, indente)
+
+    if not texte.isascii() or '\x7f' in texte:
+        texte = echapper_ascii(texte)
+
+    return current_app.response_class(texte + "\n", mimetype=fournisseur.mimetype)
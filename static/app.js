@@ -8,6 +8,9 @@ let candidatsCache = [];
 let offresCache = [];
 let pendingAction = null;
 
+// Colonnes affichées dans la liste des candidats (la bio n'est pas transférée)
+const CHAMPS_LISTE_CANDIDATS = ['id', 'nom', 'email', 'diplome'];
+
 // ============================================
 // Vérification de la connexion API
 // ============================================
@@ -16,7 +19,7 @@ async function checkApiStatus() {
     const statusText = document.getElementById('api-status-text');
     
     try {
-        const response = await fetch(`${API_URL}/candidates`);
+        const response = await fetch(`${API_URL}/candidates?limit=1`);
         const data = await response.json();
         
         if (response.ok && data.success) {
@@ -35,6 +38,54 @@ async function checkApiStatus() {
     return false;
 }
 
+// ============================================
+// Chargement d'une liste paginée (next_cursor)
+// ============================================
+async function fetchToutesLesPages(chemin, cle, champs = null) {
+    let items = [];
+    let cursor = null;
+    let result;
+    
+    // champs : liste de ?fields= pour ne recevoir que les colonnes affichées
+    const fields = champs ? `&fields=${champs.join(',')}` : '';
+    
+    do {
+        const params = (cursor ? `?limit=200&cursor=${encodeURIComponent(cursor)}` : '?limit=200') + fields;
+        const response = await fetch(`${API_URL}/${chemin}${params}`);
+        result = await response.json();
+        
+        if (!response.ok || !result.success) return result;
+        
+        items = items.concat(result[cle] || []);
+        cursor = result.next_cursor;
+    } while (cursor);
+    
+    result[cle] = items;
+    return result;
+}
+
+// ============================================
+// Candidats d'une offre, toutes les pages (?page=)
+// ============================================
+async function fetchCandidatsOffre(offreId, champs) {
+    let candidats = [];
+    let page = 1;
+    let result;
+    
+    do {
+        const response = await fetch(`${API_URL}/offers/${offreId}/candidates?limit=200&page=${page}&fields=${champs.join(',')}`);
+        result = await response.json();
+        
+        if (!response.ok || !result.success) return result;
+        
+        candidats = candidats.concat(result.candidats);
+        page += 1;
+    } while (result.candidats.length === 200);
+    
+    result.candidats = candidats;
+    return result;
+}
+
 // ============================================
 // Affichage des notifications Toast
 // ============================================
@@ -147,12 +198,11 @@ async function chargerCandidats() {
     `;
     
     try {
-        const response = await fetch(`${API_URL}/candidates`);
-        const result = await response.json();
+        const result = await fetchToutesLesPages('candidates', 'candidats', CHAMPS_LISTE_CANDIDATS);
         
         console.log('Candidats response:', result);
         
-        if (response.ok && result.success) {
+        if (result.success) {
             candidatsCache = result.candidats || [];
             const count = candidatsCache.length;
             
@@ -299,12 +349,11 @@ async function chargerOffres() {
     `;
     
     try {
-        const response = await fetch(`${API_URL}/offers`);
-        const result = await response.json();
+        const result = await fetchToutesLesPages('offers', 'offres');
         
         console.log('Offres response:', result);
         
-        if (response.ok && result.success) {
+        if (result.success) {
             offresCache = result.offres || [];
             const count = offresCache.length;
             
@@ -395,8 +444,7 @@ async function chargerOptionsAnalyse() {
     // Charger candidats si pas en cache
     if (candidatsCache.length === 0) {
         try {
-            const res = await fetch(`${API_URL}/candidates`);
-            const data = await res.json();
+            const data = await fetchToutesLesPages('candidates', 'candidats', CHAMPS_LISTE_CANDIDATS);
             if (data.success) candidatsCache = data.candidats || [];
         } catch (e) {}
     }
@@ -404,8 +452,7 @@ async function chargerOptionsAnalyse() {
     // Charger offres si pas en cache
     if (offresCache.length === 0) {
         try {
-            const res = await fetch(`${API_URL}/offers`);
-            const data = await res.json();
+            const data = await fetchToutesLesPages('offers', 'offres');
             if (data.success) offresCache = data.offres || [];
         } catch (e) {}
     }
@@ -536,10 +583,9 @@ async function voirCandidatures() {
     }
     
     try {
-        const response = await fetch(`${API_URL}/offers/${offreId}/candidates`);
-        const result = await response.json();
+        const result = await fetchCandidatsOffre(offreId, ['id', 'nom', 'email']);
         
-        if (response.ok && result.success) {
+        if (result.success) {
             if (result.candidats.length === 0) {
                 liste.innerHTML = '<p class="text-gray-400 text-center py-8">Aucune candidature</p>';
                 return;
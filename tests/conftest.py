@@ -0,0 +1,139 @@
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+import pytest
+
+# Config lit l'environnement à l'import : valeurs de test fixées avant tout import de l'application
+_DOSSIER = tempfile.mkdtemp(prefix='smartrecruit-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DOSSIER, 'defaut.db')}"
+os.environ['TFIDF_INDEX_PATH'] = os.path.join(_DOSSIER, 'tfidf.npz')
+os.environ['APP_ENV'] = 'development'
+os.environ['GEMINI_API_KEY'] = ''             # jamais d'appel réseau : scoring local
+os.environ['AI_SCORING_DETERMINISTE'] = 'true'
+os.environ['QUERY_BUDGET_MODE'] = 'raise'     # dépassement de @budget_requetes -> exception
+os.environ['OFFER_STATS_CACHE_TTL'] = '0'
+os.environ['SKILL_RETRO_INDEX_THREAD'] = 'false'   # rétro-indexation lancée par les tests
+
+COMPETENCES = ['Python', 'Flask', 'Docker', 'SQL', 'Java', 'React', 'Linux', 'Kubernetes', 'AWS', 'Git']
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Application sur une base SQLite vide, propre au test"""
+    from app import create_app
+    from models import db
+
+    application = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "TESTING": True
+    })
+    yield application
+    with application.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def moteur(app, tmp_path, monkeypatch):
+    """Moteur TF-IDF vierge, persisté dans le dossier du test"""
+    from config import Config
+    from services.tfidf_engine import tfidf_engine
+
+    monkeypatch.setattr(Config, 'TFIDF_INDEX_PATH', str(tmp_path / 'tfidf.npz'))
+    tfidf_engine.__init__()
+    yield tfidf_engine
+    tfidf_engine.__init__()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def ajouter_donnees(debut, fin):
+    """
+    Candidats [debut, fin), offres [debut / 10 + 1, fin / 10] et deux
+    candidatures par candidat, dont une sur l'offre 1 : le nombre de
+    candidats de l'offre 1 suit le volume (contexte d'application requis)
+    """
+    from sqlalchemy import insert
+    from models import db
+    from models.candidat import Candidat
+    from models.offre_emploi import OffreEmploi
+    from models.candidature import Candidature
+    from services.skill_index_service import SkillIndexService
+
+    hasard = random.Random(debut)
+    origine = datetime(2024, 1, 1)
+
+    db.session.execute(insert(Candidat), [
+        {
+            "id": i,
+            "nom": f"Candidat {i}",
+            "email": f"candidat{i}@exemple.com",
+            "bio": f"Développeur {' '.join(hasard.sample(COMPETENCES, 3))} depuis {i % 10 + 1} ans",
+            "diplome": "Master en Informatique",
+            "date_inscription": origine + timedelta(minutes=i),
+            "updated_at": origine + timedelta(minutes=i)
+        }
+        for i in range(debut, fin)
+    ])
+    offres = range(debut // 10 + 1, fin // 10 + 1)
+    db.session.execute(insert(OffreEmploi), [
+        {
+            "id": i,
+            "titre": f"Offre {i}",
+            "description": "Poste de développeur dans une équipe produit",
+            "competences": hasard.sample(COMPETENCES, 3),
+            "salaire": 300000 + i * 1000,
+            "date_creation": origine + timedelta(hours=i),
+            "updated_at": origine + timedelta(hours=i)
+        }
+        for i in offres
+    ])
+    candidatures = set()
+    for i in range(debut, fin):
+        candidatures.add((i, 1))
+        candidatures.add((i, hasard.randint(1, fin // 10)))
+    db.session.execute(insert(Candidature), [
+        {"candidat_id": c, "offre_id": o, "date_depot": origine + timedelta(minutes=c), "updated_at": origine}
+        for c, o in sorted(candidatures)
+    ])
+    db.session.commit()
+
+    SkillIndexService.indexer_candidats(list(range(debut, fin)))
+    SkillIndexService.indexer_offres(list(offres))
+    SkillIndexService.retro_indexer_en_attente()
+
+
+@pytest.fixture
+def volume(app):
+    """
+    volume(total) : porte la base à `total` candidats (total / 10 offres),
+    à appeler avec N puis 10N pour comparer une mesure entre les deux volumes
+    """
+    actuel = {"candidats": 0}
+
+    def porter_a(total):
+        with app.app_context():
+            ajouter_donnees(actuel["candidats"] + 1, total + 1)
+        actuel["candidats"] = total
+
+    return porter_a
+
+
+@pytest.fixture
+def compter(app, client):
+    """compter(methode, url, corps) : (instructions SQL, réponse) d'un appel"""
+    from models import db
+    from services.utils.query_budget import compter_requetes
+
+    def mesurer(methode, url, corps=None):
+        with app.app_context():
+            engine = db.engine
+        with compter_requetes(engine) as requetes:
+            reponse = client.open(url, method=methode, json=corps)
+        return len(requetes), reponse
+
+    return mesurer
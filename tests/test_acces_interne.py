@@ -0,0 +1,41 @@
+import pytest
+from app import create_app
+
+ROUTES = [
+    ('GET', '/api/internal/db/pool'),
+    ('POST', '/api/internal/db/pool/reset'),
+    ('GET', '/metrics'),
+    ('DELETE', '/api/ai/cache'),
+    ('POST', '/api/ai/breaker/reset'),
+    ('POST', '/api/ai/tfidf/rebuild'),
+]
+
+
+def client_avec(tmp_path, **config):
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'interne.db'}",
+        "TESTING": True,
+        **config
+    }).test_client()
+
+
+@pytest.mark.parametrize('methode,url', ROUTES)
+def test_desactivees_en_production_sans_jeton(tmp_path, methode, url):
+    client = client_avec(tmp_path, APP_ENV='production', INTERNAL_STATS_TOKEN='')
+    assert client.open(url, method=methode).status_code == 404
+
+
+@pytest.mark.parametrize('methode,url', ROUTES)
+def test_jeton_exige_quand_defini(tmp_path, methode, url):
+    client = client_avec(tmp_path, APP_ENV='production', INTERNAL_STATS_TOKEN='secret')
+
+    assert client.open(url, method=methode).status_code == 403
+    assert client.open(url, method=methode, headers={'X-Internal-Token': 'autre'}).status_code == 403
+    assert client.open(url, method=methode, headers={'X-Internal-Token': 'secret'}).status_code == 200
+    assert client.open(url, method=methode, headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+
+@pytest.mark.parametrize('methode,url', ROUTES)
+def test_libres_en_developpement_sans_jeton(tmp_path, methode, url):
+    client = client_avec(tmp_path, APP_ENV='development', INTERNAL_STATS_TOKEN='')
+    assert client.open(url, method=methode).status_code == 200
@@ -0,0 +1,83 @@
+import time
+import pytest
+from services.ai_service import analysis_cache
+from services.analysis_cache import AnalysisCache
+
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    analysis_cache.vider()
+    yield
+    analysis_cache.vider()
+
+
+def analyser(client, offre_id=1, candidat_id=1):
+    reponse = client.post(f'/api/offers/{offre_id}/analyze-match', json={"candidat_id": candidat_id})
+    assert reponse.status_code == 200
+    return reponse.get_json()["analyse"]
+
+
+def compteurs():
+    stats = analysis_cache.stats()
+    return stats["hits"], stats["misses"]
+
+
+def test_hit_apres_miss(volume, client):
+    volume(10)
+    hits, misses = compteurs()
+
+    premiere = analyser(client)
+    seconde = analyser(client)
+
+    assert compteurs() == (hits + 1, misses + 1)
+    assert premiere == seconde
+    assert analysis_cache.stats()["taille"] == 1
+
+
+@pytest.mark.parametrize('url,corps', [
+    ('/api/candidates/1', {"bio": "Développeur Kubernetes et AWS depuis douze ans"}),
+    ('/api/offers/1', {"titre": "Ingénieur Plateforme"}),
+])
+def test_invalidation_a_la_modification(volume, client, url, corps):
+    volume(20)
+    analyser(client, 1, 1)
+    analyser(client, 1, 2)
+    analyser(client, 2, 3)
+    invalidations = analysis_cache.stats()["invalidations"]
+
+    assert client.put(url, json=corps).status_code == 200
+
+    # Candidat 1 : une analyse purgée ; offre 1 : deux
+    purgees = 1 if 'candidates' in url else 2
+    assert analysis_cache.stats()["invalidations"] == invalidations + purgees
+    assert analysis_cache.stats()["taille"] == 3 - purgees
+
+    hits, misses = compteurs()
+    analyser(client, 1, 1)
+    assert compteurs() == (hits, misses + 1)
+
+
+def test_modification_sans_champ_analyse_conserve_le_cache(volume, client):
+    volume(10)
+    analyser(client)
+
+    client.put('/api/candidates/1', json={"nom": "Nouveau Nom"})
+
+    assert analysis_cache.stats()["taille"] == 1
+
+
+def test_expiration_et_eviction_lru():
+    cache = AnalysisCache(max_size=2, ttl=0.05)
+    cache.set("a", {"score": 1}, offre_id=1, candidat_id=1)
+    cache.set("b", {"score": 2}, offre_id=1, candidat_id=2)
+    cache.get("a")
+    cache.set("c", {"score": 3}, offre_id=2, candidat_id=3)
+
+    # "b", le moins récemment lu, est évincé
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["taille"] == 1
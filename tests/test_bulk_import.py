@@ -0,0 +1,92 @@
+import json
+import pytest
+from config import Config
+from models import db
+from models.candidat import Candidat
+
+
+def candidat(numero, **champs):
+    return {
+        "nom": f"Candidat {numero}",
+        "email": f"candidat{numero}@exemple.fr",
+        "bio": "Développeur Python depuis cinq ans",
+        "diplome": "Master",
+        **champs
+    }
+
+
+def emails(app):
+    with app.app_context():
+        return sorted(email for (email,) in db.session.query(Candidat.email))
+
+
+def test_import_json(app, client):
+    reponse = client.post('/api/candidates/bulk', json=[candidat(1), candidat(2)])
+    corps = reponse.get_json()
+
+    assert reponse.status_code == 201
+    assert corps["crees"] == 2 and corps["erreurs"] == []
+    assert emails(app) == ["candidat1@exemple.fr", "candidat2@exemple.fr"]
+
+
+def test_import_ndjson(app, client):
+    flux = "\n".join([json.dumps(candidat(1)), "", "{pas du json", json.dumps(candidat(2))])
+    reponse = client.post('/api/candidates/bulk', data=flux, content_type='application/x-ndjson')
+    corps = reponse.get_json()
+
+    assert reponse.status_code == 201
+    assert corps["crees"] == 2
+    assert corps["erreurs"] == [{"ligne": 2, "erreurs": "JSON invalide"}]
+    assert len(emails(app)) == 2
+
+
+def test_erreurs_de_validation_par_ligne(app, client):
+    lignes = [candidat(1), candidat(2, email="invalide"), candidat(3, bio="court"), candidat(4)]
+    corps = client.post('/api/candidates/bulk', json=lignes).get_json()
+
+    assert corps["crees"] == 2
+    assert [erreur["ligne"] for erreur in corps["erreurs"]] == [1, 2]
+    assert "email" in corps["erreurs"][0]["erreurs"]
+    assert "bio" in corps["erreurs"][1]["erreurs"]
+    assert emails(app) == ["candidat1@exemple.fr", "candidat4@exemple.fr"]
+
+
+def test_doublons_dans_le_lot_et_en_base(app, client):
+    client.post('/api/candidates/bulk', json=[candidat(1)])
+
+    corps = client.post('/api/candidates/bulk', json=[candidat(1), candidat(2), candidat(2)]).get_json()
+
+    assert corps["crees"] == 1
+    assert corps["erreurs"] == [
+        {"ligne": 0, "erreurs": {"email": ["Déjà utilisé en base"]}},
+        {"ligne": 2, "erreurs": {"email": ["Doublon dans le lot"]}},
+    ]
+    assert emails(app) == ["candidat1@exemple.fr", "candidat2@exemple.fr"]
+
+
+def test_limite_de_lignes(app, client, monkeypatch):
+    monkeypatch.setattr(Config, 'API_MAX_BULK_ROWS', 2)
+
+    reponse = client.post('/api/candidates/bulk', json=[candidat(1), candidat(2), candidat(3)])
+
+    assert reponse.status_code == 400
+    assert reponse.get_json()["error"] == "Maximum 2 lignes par import"
+    assert emails(app) == []
+
+
+def test_corps_invalide(client):
+    reponse = client.post('/api/candidates/bulk', json={"nom": "Pas un tableau"})
+
+    assert reponse.status_code == 400
+
+
+def test_insertion_sans_returning_multi_lignes(app, client, monkeypatch):
+    """Bases sans RETURNING multi-lignes (MySQL) : une insertion par ligne, mêmes ids"""
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, 'insert_executemany_returning', False)
+
+    corps = client.post('/api/candidates/bulk', json=[candidat(1), candidat(2)]).get_json()
+
+    assert corps["crees"] == 2
+    with app.app_context():
+        assert sorted(corps["ids"]) == sorted(id for (id,) in db.session.query(Candidat.id))
@@ -0,0 +1,84 @@
+import json
+import pytest
+from models import db
+from services.utils.query_budget import compter_requetes
+
+
+@pytest.fixture
+def requetes_sql(app, client):
+    """requetes_sql(url) : (instructions SQL exécutées, réponse) d'un GET"""
+    def executer(url):
+        with app.app_context():
+            engine = db.engine
+        with compter_requetes(engine) as requetes:
+            reponse = client.get(url)
+            reponse.get_data()
+        return requetes, reponse
+
+    return executer
+
+
+def lue(colonne, requetes):
+    return any(colonne in requete for requete in requetes if requete.lstrip().upper().startswith('SELECT'))
+
+
+@pytest.mark.parametrize('url,cle,champs,non_lue', [
+    ('/api/candidates?fields=id,nom', 'candidats', ['id', 'nom'], 'candidats.bio'),
+    ('/api/candidates/search?q=python&fields=id,email', 'candidats', ['email', 'id'], 'candidats.bio'),
+    ('/api/offers?fields=id,titre', 'offres', ['id', 'titre'], 'offres_emploi.description'),
+    ('/api/offers/1/candidates?fields=id,nom,score', 'candidats', ['id', 'nom', 'score'], 'candidats.bio'),
+])
+def test_projection_des_listes(volume, requetes_sql, url, cle, champs, non_lue):
+    volume(20)
+    requetes, reponse = requetes_sql(url)
+
+    lignes = reponse.get_json()[cle]
+    assert lignes
+    assert all(sorted(ligne) == sorted(champs) for ligne in lignes)
+    # Colonne non demandée : jamais lue en base
+    assert not lue(non_lue, requetes)
+
+
+@pytest.mark.parametrize('url,cle,champs,non_lue', [
+    ('/api/candidates/3?fields=nom,diplome', 'candidat', ['diplome', 'nom'], 'candidats.bio'),
+    ('/api/offers/1?fields=titre,salaire', 'offre', ['salaire', 'titre'], 'offres_emploi.description'),
+])
+def test_projection_du_detail(volume, requetes_sql, url, cle, champs, non_lue):
+    volume(20)
+    requetes, reponse = requetes_sql(url)
+
+    assert sorted(reponse.get_json()[cle]) == champs
+    assert not lue(non_lue, requetes)
+
+
+def test_projection_de_l_export(volume, requetes_sql):
+    volume(20)
+    requetes, reponse = requetes_sql('/api/export/candidates?format=ndjson&fields=id,email')
+
+    lignes = [json.loads(ligne) for ligne in reponse.get_data(as_text=True).splitlines()]
+    assert len(lignes) == 20
+    assert all(sorted(ligne) == ['email', 'id'] for ligne in lignes)
+    assert not lue('candidats.bio', requetes)
+
+
+def test_sans_fields_tous_les_champs(volume, client):
+    volume(20)
+    candidat = client.get('/api/candidates/3').get_json()['candidat']
+
+    assert {'id', 'nom', 'email', 'bio', 'diplome'} <= set(candidat)
+
+
+@pytest.mark.parametrize('url', [
+    '/api/candidates?fields=id,mot_de_passe',
+    '/api/candidates?fields=,',
+    '/api/offers/1?fields=inconnu',
+    '/api/offers/1/candidates?fields=bio,salaire',
+    '/api/export/candidates?fields=inconnu',
+])
+def test_champ_inconnu(volume, client, url):
+    volume(20)
+    reponse = client.get(url)
+
+    assert reponse.status_code == 400
+    assert reponse.get_json()["success"] is False
+
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+import pytest
+import requests
+import services.ai_service
+import services.circuit_breaker
+from services.ai_service import AIService
+from services.circuit_breaker import CircuitBreaker, FERME, OUVERT, SEMI_OUVERT
+
+OFFRE = SimpleNamespace(
+    id=1, titre="Développeur Python", description="API Flask et conteneurs",
+    competences=["Python", "Flask"], salaire=400000
+)
+CANDIDAT = SimpleNamespace(id=1, nom="Awa Diop", bio="Développeuse Python depuis six ans", diplome="Master")
+
+REPONSE_GEMINI = {"candidates": [{"content": {"parts": [{"text": '{"score": 80, "justification": "Bon profil"}'}]}}]}
+
+
+class SessionFactice:
+    """Réponses Gemini successives : code HTTP, (code, en-têtes) ou exception"""
+
+    def __init__(self, *reponses):
+        self.reponses = list(reponses)
+        self.appels = 0
+
+    def post(self, url, json=None, timeout=None):
+        self.appels += 1
+        reponse = self.reponses.pop(0)
+        if isinstance(reponse, Exception):
+            raise reponse
+        code, entetes = reponse if isinstance(reponse, tuple) else (reponse, {})
+        return SimpleNamespace(status_code=code, headers=entetes, json=lambda: REPONSE_GEMINI)
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    """Temps monotone du disjoncteur, avancé à la main"""
+    temps = {"maintenant": 1000.0}
+    monkeypatch.setattr(services.circuit_breaker.time, 'monotonic', lambda: temps["maintenant"])
+    return temps
+
+
+@pytest.fixture
+def disjoncteur(monkeypatch, horloge):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30,
+                             quota_cooldown=60, auth_cooldown=3600, nom="gemini")
+    monkeypatch.setattr(services.ai_service, 'gemini_breaker', breaker)
+    monkeypatch.setattr(AIService, 'gemini_configure', staticmethod(lambda: True))
+    return breaker
+
+
+def appeler(monkeypatch, *reponses):
+    session = SessionFactice(*reponses)
+    monkeypatch.setattr(services.ai_service, 'get_session', lambda: session)
+    return AIService._analyser(OFFRE, CANDIDAT, deterministe=True), session
+
+
+def test_403_ouvre_pour_le_delai_d_authentification(monkeypatch, disjoncteur, horloge):
+    analyse, _ = appeler(monkeypatch, 403)
+
+    assert analyse["source"] != "gemini-ai"
+    assert disjoncteur.etat == OUVERT
+    assert disjoncteur.stats()["derniere_erreur"]["type"] == "auth"
+
+    # Circuit ouvert : fallback sans appel réseau
+    _, session = appeler(monkeypatch)
+    assert session.appels == 0
+
+    horloge["maintenant"] += 3599
+    assert disjoncteur.etat == OUVERT
+    horloge["maintenant"] += 1
+    assert disjoncteur.etat == SEMI_OUVERT
+
+
+@pytest.mark.parametrize('reponse,duree', [(429, 60), ((429, {"Retry-After": "5"}), 5)])
+def test_429_ouvre_pour_le_quota_ou_retry_after(monkeypatch, disjoncteur, horloge, reponse, duree):
+    appeler(monkeypatch, reponse)
+
+    assert disjoncteur.etat == OUVERT
+    horloge["maintenant"] += duree - 1
+    assert disjoncteur.etat == OUVERT
+    horloge["maintenant"] += 1
+    assert disjoncteur.etat == SEMI_OUVERT
+
+
+def test_timeouts_ouvrent_au_seuil_puis_essai_semi_ouvert(monkeypatch, disjoncteur, horloge):
+    appeler(monkeypatch, requests.Timeout())
+    assert disjoncteur.etat == FERME
+
+    appeler(monkeypatch, requests.Timeout())
+    assert disjoncteur.etat == OUVERT
+    assert disjoncteur.stats()["ouvertures"] == 1
+
+    # Après recovery_timeout : un essai ; échec -> rouvert aussitôt
+    horloge["maintenant"] += 30
+    _, session = appeler(monkeypatch, requests.ConnectionError())
+    assert session.appels == 1
+    assert disjoncteur.etat == OUVERT
+
+    # Essai réussi -> fermé, résultat Gemini
+    horloge["maintenant"] += 30
+    analyse, _ = appeler(monkeypatch, 200)
+    assert analyse["source"] == "gemini-ai"
+    assert disjoncteur.etat == FERME
+    assert disjoncteur.stats()["echecs_consecutifs"] == 0
+
+
+def test_un_seul_essai_en_semi_ouvert(disjoncteur, horloge):
+    disjoncteur.echec("auth")
+    horloge["maintenant"] += 3600
+
+    assert disjoncteur.autoriser() is True
+    assert disjoncteur.autoriser() is False
+    assert disjoncteur.stats()["refuses"] == 1
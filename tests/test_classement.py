@@ -0,0 +1,55 @@
+import pytest
+
+N = 30
+
+
+def classer(client, **corps):
+    return client.post('/api/offers/1/rank-candidates', json=corps)
+
+
+def test_classement_par_score_decroissant(volume, client):
+    volume(N)
+    corps = classer(client, per_page=100).get_json()
+
+    scores = [ligne["score"] for ligne in corps["classement"]]
+    assert scores == sorted(scores, reverse=True)
+    assert [ligne["rang"] for ligne in corps["classement"]] == list(range(1, N + 1))
+    assert corps["nombre_candidats"] == corps["total_classes"] == N
+    assert sorted(ligne["candidat"]["id"] for ligne in corps["classement"]) == list(range(1, N + 1))
+
+
+def test_meme_score_que_l_analyse_unitaire(volume, client):
+    """Le lot est scoré comme analyze-match, candidat par candidat"""
+    volume(N)
+    classement = classer(client, per_page=5).get_json()["classement"]
+
+    for ligne in classement:
+        analyse = client.post('/api/offers/1/analyze-match', json={
+            "candidat_id": ligne["candidat"]["id"]
+        }).get_json()["analyse"]
+        assert analyse["score"] == ligne["score"]
+
+
+def test_top_et_pages(volume, client):
+    volume(N)
+    complet = classer(client, per_page=100).get_json()["classement"]
+
+    page_1 = classer(client, top=15, per_page=10).get_json()
+    page_2 = classer(client, top=15, per_page=10, page=2).get_json()
+
+    assert page_1["total_classes"] == 15
+    assert [ligne["rang"] for ligne in page_2["classement"]] == list(range(11, 16))
+    assert page_1["classement"] + page_2["classement"] == complet[:15]
+
+
+@pytest.mark.parametrize('corps', [
+    {"top": 0}, {"page": "deux"}, {"per_page": 101}, {"moteur": "inconnu"}, {"deterministe": "peut-etre"}
+])
+def test_parametres_invalides(volume, client, corps):
+    volume(N)
+
+    assert classer(client, **corps).status_code == 400
+
+
+def test_offre_inconnue(client):
+    assert client.post('/api/offers/999/rank-candidates', json={}).status_code == 404
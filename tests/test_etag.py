@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import event
+from models import db
+
+
+def etag(client, url):
+    reponse = client.get(url)
+    assert reponse.status_code == 200
+    return reponse.headers['ETag']
+
+
+@pytest.mark.parametrize('url', ['/api/candidates?limit=5', '/api/offers?limit=5'])
+def test_304_sans_parcourir_la_table(app, volume, client, url):
+    volume(50)
+    valeur = etag(client, url)
+
+    instructions = []
+    with app.app_context():
+        engine = db.engine
+
+    def enregistrer(conn, cursor, statement, parameters, context, executemany):
+        instructions.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", enregistrer)
+    try:
+        reponse = client.get(url, headers={'If-None-Match': valeur})
+    finally:
+        event.remove(engine, "before_cursor_execute", enregistrer)
+
+    assert reponse.status_code == 304
+    assert len(instructions) == 1
+    with engine.connect() as connexion:
+        plan = connexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {instructions[0][0]}", instructions[0][1]).all()
+    # Seules les recherches par index (SEARCH) sont permises : aucun SCAN de table ou d'index
+    assert not [ligne for ligne in plan if ligne[-1].startswith('SCAN') and ligne[-1] != 'SCAN CONSTANT ROW'], plan
+
+
+def test_etag_change_a_chaque_ecriture(volume, client):
+    volume(50)
+    url = '/api/candidates?limit=5'
+    vues = [etag(client, url)]
+
+    client.post('/api/candidates', json={
+        "nom": "Nouveau Candidat", "email": "nouveau@exemple.com",
+        "bio": "Développeur Python depuis cinq ans", "diplome": "Master en Informatique"
+    })
+    vues.append(etag(client, url))
+    client.put('/api/candidates/10', json={"bio": "Développeur Java depuis dix ans"})
+    vues.append(etag(client, url))
+    # Ni la dernière créée ni la dernière modifiée : seul le compteur de suppressions change
+    client.delete('/api/candidates/20')
+    vues.append(etag(client, url))
+
+    assert len(set(vues)) == len(vues)
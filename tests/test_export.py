@@ -0,0 +1,32 @@
+import tracemalloc
+import pytest
+
+N = 2000
+
+
+def pic_memoire_export(client, url):
+    """(octets reçus, pic tracemalloc) pendant la lecture du flux morceau par morceau"""
+    tracemalloc.start()
+    try:
+        reponse = client.get(url, buffered=False)
+        assert reponse.status_code == 200
+        recus = sum(len(morceau) for morceau in reponse.response)
+        reponse.close()
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return recus, pic
+
+
+@pytest.mark.parametrize('format_export', ['ndjson', 'csv'])
+def test_memoire_constante_quand_la_table_grandit(volume, client, format_export):
+    url = f'/api/export/candidates?format={format_export}'
+
+    volume(N)
+    recus_n, pic_n = pic_memoire_export(client, url)
+    volume(10 * N)
+    recus_10n, pic_10n = pic_memoire_export(client, url)
+
+    # Dix fois plus de données envoyées, mais toujours un lot de lignes en mémoire
+    assert recus_10n > 9 * recus_n
+    assert pic_10n < 1.5 * pic_n
@@ -0,0 +1,103 @@
+import queue
+import time
+import pytest
+from config import Config
+from services.analysis_jobs import (
+    BACKEND_BASE, BACKEND_MEMOIRE, ECHEC, FileBase, FileMemoire, verifier_backend
+)
+
+
+def test_memoire_refuse_avec_plusieurs_workers(monkeypatch):
+    monkeypatch.setattr(Config, 'JOBS_BACKEND', BACKEND_MEMOIRE)
+    verifier_backend(1)
+    with pytest.raises(ValueError, match="JOBS_BACKEND=memoire avec 4 workers"):
+        verifier_backend(4)
+
+    monkeypatch.setattr(Config, 'JOBS_BACKEND', BACKEND_BASE)
+    verifier_backend(4)
+
+
+def test_nouvelle_tentative_file_pleine():
+    """La relance ne bloque pas sur une file pleine : le job passe en échec"""
+    file_jobs = FileMemoire(workers=1, taille_file=1)
+    job = {
+        "id": "a", "statut": "en_attente", "empreinte": "e", "erreur": "Base indisponible",
+        "tentatives": 1, "finished_at": None
+    }
+    file_jobs._jobs["a"] = job
+    file_jobs._actifs["e"] = "a"
+    file_jobs._file.put_nowait("occupe")
+
+    file_jobs._relancer(job)
+
+    assert job["statut"] == ECHEC
+    assert "file des analyses pleine" in job["erreur"]
+    assert "e" not in file_jobs._actifs
+    assert file_jobs.stats()["echecs"] == 1
+    assert file_jobs._file.get_nowait() == "occupe"
+    with pytest.raises(queue.Empty):
+        file_jobs._file.get_nowait()
+
+
+@pytest.mark.parametrize('chemin,corps', [
+    ('/api/offers/1/analyze-match?async=1', {"candidat_id": 1}),
+    ('/api/offers/1/analyze-batch?async=1', {"candidat_ids": list(range(1, 21))}),
+])
+def test_mise_en_file_base_dans_son_budget(app, volume, compter, monkeypatch, chemin, corps):
+    """Mise en file dans analysis_jobs : budget asynchrone de la route (mode raise)"""
+    monkeypatch.setitem(app.extensions, 'file_jobs', FileBase())
+    volume(50)
+
+    requetes, reponse = compter('POST', chemin, corps)
+
+    assert reponse.status_code == 202
+    assert requetes > 2
+
+
+def app_base(tmp_path, **config):
+    from app import create_app
+    from models import db
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'jobs.db'}",
+        "TESTING": True,
+        "JOBS_BACKEND": BACKEND_BASE,
+        "JOBS_POLL_INTERVAL": 0.05,
+        **config
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_configuration_de_create_app(tmp_path):
+    """La file est construite par init_app depuis app.config, pas depuis Config"""
+    app = app_base(tmp_path, JOBS_QUEUE_SIZE=7, JOBS_WEB_THREADS=0)
+
+    file_jobs = app.extensions['file_jobs']
+    assert isinstance(file_jobs, FileBase)
+    assert file_jobs.taille_file == 7
+    assert file_jobs.consommateurs == 0
+
+
+def test_consommateur_du_processus_web(tmp_path, monkeypatch):
+    """JOBS_BACKEND=base : un thread du processus web exécute les jobs soumis"""
+    import services.analysis_jobs
+
+    monkeypatch.setattr(services.analysis_jobs, 'executer', lambda *args: {"resultats": []})
+    app = app_base(tmp_path, JOBS_WEB_THREADS=1)
+    client = app.test_client()
+
+    with app.app_context():
+        job, _ = app.extensions['file_jobs'].soumettre(1, [1])
+
+    # Première requête du processus : démarrage des consommateurs
+    assert client.get(f"/api/jobs/{job['id']}").status_code == 200
+    for _ in range(100):
+        statut = client.get(f"/api/jobs/{job['id']}").get_json()["job"]["statut"]
+        if statut not in ("en_attente", "en_cours"):
+            break
+        time.sleep(0.05)
+
+    assert statut == "termine"
+    assert app.extensions['file_jobs'].executes == 1
@@ -0,0 +1,65 @@
+from models import db
+from models.candidat import Candidat
+from models.match_score import MatchScore
+from models.offre_emploi import OffreEmploi
+from services.ai_service import AIService
+from services.match_score_service import MatchScoreService
+
+
+def scores(app, **filtre):
+    """{candidat_id: (score, input_hash, computed_at)} des scores persistés"""
+    with app.app_context():
+        return {
+            ligne.candidat_id: (ligne.score, ligne.input_hash, ligne.computed_at)
+            for ligne in MatchScore.query.filter_by(**filtre)
+        }
+
+
+def test_score_ecrit_a_la_candidature(app, client):
+    client.post('/api/offers', json={
+        "titre": "Développeur Python", "description": "Équipe produit, API Flask et conteneurs",
+        "competences": ["Python", "Flask", "Docker"], "salaire": 400000
+    })
+    client.post('/api/candidates', json={
+        "nom": "Awa Diop", "email": "awa@exemple.fr",
+        "bio": "Développeuse Python et Flask depuis six ans", "diplome": "Master"
+    })
+
+    reponse = client.post('/api/apply', json={"candidat_id": 1, "offre_id": 1})
+
+    assert reponse.status_code == 201
+    persistes = scores(app)
+    with app.app_context():
+        attendu = AIService._fallback_analysis(
+            db.session.get(OffreEmploi, 1), db.session.get(Candidat, 1), deterministe=True
+        )
+    assert list(persistes) == [1]
+    assert persistes[1][0] == attendu["score"]
+
+
+def test_recalcul_ignore_les_scores_a_jour(app, volume):
+    volume(20)
+    with app.app_context():
+        MatchScoreService.recalculer_tout()
+    avant = scores(app, offre_id=1)
+
+    with app.app_context():
+        assert MatchScoreService.recalculer_offre(db.session.get(OffreEmploi, 1)) == 0
+    assert scores(app, offre_id=1) == avant
+
+
+def test_recalcul_a_la_modification_d_un_champ_analyse(app, client, volume):
+    volume(20)
+    with app.app_context():
+        MatchScoreService.recalculer_tout()
+    avant = scores(app, offre_id=1)
+
+    # Champ non analysé : aucune ligne réécrite
+    client.put('/api/candidates/1', json={"nom": "Nouveau Nom"})
+    assert scores(app, offre_id=1) == avant
+
+    # Compétences de l'offre : toutes ses lignes prennent une nouvelle empreinte
+    client.put('/api/offers/1', json={"competences": ["Rust", "Go"]})
+    apres = scores(app, offre_id=1)
+    assert apres.keys() == avant.keys()
+    assert all(apres[id][1] != avant[id][1] for id in avant)
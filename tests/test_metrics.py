@@ -0,0 +1,84 @@
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+
+def echantillons(client):
+    """{(nom, labels triés): valeur} des métriques exposées par /metrics"""
+    reponse = client.get('/metrics')
+    assert reponse.status_code == 200
+    assert reponse.mimetype == 'text/plain'
+    return {
+        (echantillon.name, tuple(sorted(echantillon.labels.items()))): echantillon.value
+        for famille in text_string_to_metric_families(reponse.get_data(as_text=True))
+        for echantillon in famille.samples
+    }
+
+
+def valeur(mesures, nom, **labels):
+    return mesures.get((nom, tuple(sorted(labels.items()))), 0)
+
+
+def delta(avant, apres, nom, **labels):
+    return valeur(apres, nom, **labels) - valeur(avant, nom, **labels)
+
+
+DETAIL = {"blueprint": "candidat", "endpoint": "/api/candidates/<int:id>", "method": "GET"}
+
+
+def test_requetes_par_route_et_statut(volume, client):
+    volume(10)
+    avant = echantillons(client)
+
+    client.get('/api/candidates/1')
+    client.get('/api/candidates/2')
+    client.get('/api/candidates/999')
+    apres = echantillons(client)
+
+    # Libellé de la règle, pas de l'URL : une seule série pour tous les ids
+    assert delta(avant, apres, 'smartrecruit_http_requests_total', status='200', **DETAIL) == 2
+    assert delta(avant, apres, 'smartrecruit_http_requests_total', status='404', **DETAIL) == 1
+    assert delta(avant, apres, 'smartrecruit_http_request_duration_seconds_count', **DETAIL) == 3
+    assert valeur(apres, 'smartrecruit_http_requests_in_progress', **DETAIL) == 0
+
+
+def test_instructions_sql_par_requete(volume, client):
+    volume(10)
+    labels = {"blueprint": "candidat", "endpoint": "/api/candidates/<int:id>"}
+    avant = echantillons(client)
+
+    client.get('/api/candidates/1')
+    apres = echantillons(client)
+
+    # Détail d'un candidat : une instruction (@budget_requetes(1))
+    assert delta(avant, apres, 'smartrecruit_http_sql_statements_count', **labels) == 1
+    assert delta(avant, apres, 'smartrecruit_http_sql_statements_sum', **labels) == 1
+    assert delta(avant, apres, 'smartrecruit_http_sql_duration_seconds_count', **labels) == 1
+
+
+def test_analyses_par_source(volume, client):
+    volume(10)
+    avant = echantillons(client)
+
+    client.post('/api/offers/1/rank-candidates', json={})
+    apres = echantillons(client)
+
+    assert delta(avant, apres, 'smartrecruit_ai_analyses_total', source='algorithme-local') == 10
+
+
+def test_metrics_ne_se_mesure_pas(client):
+    echantillons(client)
+    mesures = echantillons(client)
+
+    assert not any(dict(labels).get('endpoint') == '/metrics' for _, labels in mesures)
+
+
+def test_desactive(tmp_path):
+    from app import create_app
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'metrics.db'}",
+        "TESTING": True,
+        "METRICS_ENABLED": False
+    })
+
+    assert app.test_client().get('/metrics').status_code == 404
@@ -0,0 +1,64 @@
+import pytest
+
+N = 50
+
+# Variantes de GET /api/offers/<id>/candidates (offre 1 : un candidat par candidat créé)
+URLS = [
+    '/api/offers/1/candidates',
+    '/api/offers/1/candidates?tri=score&ordre=asc',
+    '/api/offers/1/candidates?fields=id,nom,score&score_min=10',
+    '/api/offers/1/candidates?page=2&limit=20',
+    '/api/offers/1/candidates?total=true',
+]
+
+
+@pytest.mark.parametrize('url', URLS)
+def test_nombre_requetes_independant_du_nombre_de_candidats(volume, compter, url):
+    volume(N)
+    requetes_n, reponse_n = compter('GET', url)
+    volume(10 * N)
+    requetes_10n, reponse_10n = compter('GET', url)
+
+    assert reponse_n.status_code == reponse_10n.status_code == 200
+    assert requetes_n == requetes_10n
+
+
+def test_liste_complete_par_pages(volume, client):
+    volume(N)
+    vus = []
+    page = 1
+    while True:
+        corps = client.get(f'/api/offers/1/candidates?limit=20&page={page}&fields=id').get_json()
+        if not corps["candidats"]:
+            break
+        vus += [candidat["id"] for candidat in corps["candidats"]]
+        page += 1
+
+    assert "nombre_candidats" not in corps
+    assert sorted(vus) == list(range(1, N + 1))
+
+
+def test_total_sur_demande(volume, compter):
+    """COUNT(*) uniquement avec ?total=true : une instruction de moins sinon"""
+    volume(N)
+    requetes, reponse = compter('GET', '/api/offers/1/candidates')
+    requetes_total, reponse_total = compter('GET', '/api/offers/1/candidates?total=true')
+
+    assert "nombre_candidats" not in reponse.get_json()
+    assert reponse_total.get_json()["nombre_candidats"] == N
+    assert requetes_total == requetes + 1
+
+
+@pytest.mark.parametrize('parametres,erreur', [
+    ('page=abc', "page doit être un entier"),
+    ('page=0', "page doit être positif"),
+    ('score_min=haut', "score_min doit être un entier"),
+    ('tri=nom', "tri doit valoir"),
+    ('ordre=haut', "tri doit valoir"),
+])
+def test_parametres_invalides(volume, client, parametres, erreur):
+    volume(N)
+    reponse = client.get(f'/api/offers/1/candidates?{parametres}')
+
+    assert reponse.status_code == 400
+    assert erreur in reponse.get_json()["error"]
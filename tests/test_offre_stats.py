@@ -0,0 +1,124 @@
+from collections import Counter
+import pytest
+import services.analysis_cache
+from models.candidature import Candidature
+from models.match_score import MatchScore
+from models.offre_emploi import OffreEmploi
+from services.match_score_service import MatchScoreService
+from services.offre_stats_service import TRANCHES_SCORE, stats_cache
+
+N = 40
+PERIODE = 'depuis=2023-12-31&jusqu_a=2024-01-02'
+
+
+@pytest.fixture
+def donnees(app, volume):
+    """N candidats, N / 10 offres, candidatures du 2024-01-01 et scores calculés"""
+    volume(N)
+    with app.app_context():
+        MatchScoreService.recalculer_tout()
+        candidatures = [(c.candidat_id, c.offre_id) for c in Candidature.query]
+        scores = {(m.candidat_id, m.offre_id): m.score for m in MatchScore.query}
+        titres = {o.id: o.titre for o in OffreEmploi.query}
+    return candidatures, scores, titres
+
+
+def distribution(scores):
+    attendu = dict.fromkeys(TRANCHES_SCORE, 0)
+    for score in scores:
+        attendu[TRANCHES_SCORE[min(score // 10, len(TRANCHES_SCORE) - 1)]] += 1
+    return attendu
+
+
+def test_statistiques_globales(client, donnees):
+    candidatures, scores, titres = donnees
+
+    stats = client.get(f'/api/offers/stats?{PERIODE}&top=3').get_json()["stats"]
+
+    par_offre = Counter(offre for _, offre in candidatures)
+    assert stats["offres"] == len(titres)
+    assert stats["candidatures"] == len(candidatures)
+    assert stats["candidats_ayant_postule"] == N
+    assert stats["candidatures_par_offre"] == round(len(candidatures) / len(titres), 2)
+    assert stats["top_offres"] == [
+        {"id": offre, "titre": titres[offre], "candidatures": nombre}
+        for offre, nombre in sorted(par_offre.items(), key=lambda item: (-item[1], item[0]))[:3]
+    ]
+    assert stats["candidatures_par_jour"] == [
+        {"date": "2023-12-31", "candidatures": 0},
+        {"date": "2024-01-01", "candidatures": len(candidatures)},
+        {"date": "2024-01-02", "candidatures": 0},
+    ]
+    # Salaires de 301 000 à 304 000 FCFA : une seule tranche
+    tranches = {tranche["tranche"]: tranche for tranche in stats["tranches_salaire"]}
+    assert tranches["300000-500000"] == {
+        "tranche": "300000-500000", "offres": len(titres), "candidatures": len(candidatures)
+    }
+    assert stats["scores_calcules"] == len(scores)
+    assert stats["score_moyen"] == round(sum(scores.values()) / len(scores), 1)
+    assert stats["distribution_scores"] == distribution(scores.values())
+
+
+def test_statistiques_d_une_offre(client, donnees):
+    candidatures, scores, titres = donnees
+
+    stats = client.get(f'/api/offers/2/stats?{PERIODE}').get_json()["stats"]
+
+    scores_offre = [score for (_, offre), score in scores.items() if offre == 2]
+    assert stats["offre"] == {
+        "id": 2, "titre": titres[2], "salaire": 302000, "tranche_salaire": "300000-500000"
+    }
+    assert stats["candidatures"] == sum(offre == 2 for _, offre in candidatures)
+    assert stats["scores_calcules"] == len(scores_offre)
+    assert stats["distribution_scores"] == distribution(scores_offre)
+    assert client.get('/api/offers/999/stats').status_code == 404
+
+
+@pytest.mark.parametrize('parametres', ['depuis=hier', 'depuis=2024-02-01&jusqu_a=2024-01-01',
+                                        'depuis=2020-01-01&jusqu_a=2024-01-01', 'top=0'])
+def test_parametres_invalides(client, parametres):
+    assert client.get(f'/api/offers/stats?{parametres}').status_code == 400
+
+
+@pytest.fixture
+def cache_actif(monkeypatch):
+    """Cache des statistiques activé (TTL 0 dans les tests) sur une horloge avancée à la main"""
+    temps = {"maintenant": 1000.0}
+    monkeypatch.setattr(services.analysis_cache.time, 'monotonic', lambda: temps["maintenant"])
+    monkeypatch.setattr(stats_cache, 'ttl', 60)
+    stats_cache.vider()
+    yield temps
+    stats_cache.vider()
+
+
+def test_cache_ttl(client, compter, donnees, cache_actif):
+    url = f'/api/offers/stats?{PERIODE}'
+    requetes, premiere = compter('GET', url)
+    assert requetes == 1
+
+    client.post('/api/candidates', json={
+        "nom": "Awa Diop", "email": "awa@exemple.fr", "bio": "Développeuse Python", "diplome": "Master"
+    })
+    client.post('/api/apply', json={"candidat_id": N + 1, "offre_id": 1})
+
+    # Dans le TTL : valeurs en cache, aucune instruction SQL
+    requetes, seconde = compter('GET', url)
+    assert requetes == 0
+    assert seconde.get_json() == premiere.get_json()
+
+    cache_actif["maintenant"] += 60
+    requetes, troisieme = compter('GET', url)
+    assert requetes == 1
+    assert troisieme.get_json()["stats"]["candidatures"] == premiere.get_json()["stats"]["candidatures"] + 1
+
+
+def test_cache_invalide_a_la_modification_de_l_offre(client, compter, donnees, cache_actif):
+    url = f'/api/offers/1/stats?{PERIODE}'
+    compter('GET', url)
+    assert compter('GET', url)[0] == 0
+
+    client.put('/api/offers/1', json={"titre": "Ingénieur Données"})
+
+    requetes, reponse = compter('GET', url)
+    assert requetes == 1
+    assert reponse.get_json()["stats"]["offre"]["titre"] == "Ingénieur Données"
@@ -0,0 +1,89 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import insert
+from config import Config
+from models import db
+from models.candidat import Candidat
+from services.utils.pagination import PaginationError, decoder_curseur, encoder_curseur
+
+
+def parcourir(client, url, cle, limite):
+    """Toutes les pages d'une liste en suivant next_cursor"""
+    vus, curseur, pages = [], None, 0
+    while True:
+        suite = f"&cursor={curseur}" if curseur else ""
+        corps = client.get(f"{url}?limit={limite}{suite}").get_json()
+        vus += corps[cle]
+        pages += 1
+        curseur = corps["next_cursor"]
+        if curseur is None:
+            return vus, pages
+
+
+def test_aller_retour_du_curseur():
+    date = datetime(2024, 3, 1, 12, 30, 15, 123456)
+
+    assert decoder_curseur(encoder_curseur(date, 42)) == (date, 42)
+    assert decoder_curseur(encoder_curseur(None, 7)) == (None, 7)
+    with pytest.raises(PaginationError):
+        decoder_curseur("pas-un-curseur")
+
+
+@pytest.mark.parametrize('url,cle,total', [
+    ('/api/candidates', 'candidats', 45),
+    ('/api/offers', 'offres', 4),
+])
+def test_parcours_complet_par_curseur(volume, client, url, cle, total):
+    volume(45)
+
+    vus, pages = parcourir(client, url, cle, 3)
+
+    ids = [ligne["id"] for ligne in vus]
+    assert sorted(ids) == list(range(1, total + 1))
+    # (date DESC, id DESC) : les ids suivent les dates de création
+    assert ids == sorted(ids, reverse=True)
+    # Dernière page complète : pas de page vide en plus
+    assert pages == -(-total // 3)
+
+
+def test_dates_identiques_sans_doublon_ni_oubli(app, client):
+    """Égalité de date : départage par l'id, aucune ligne sautée entre deux pages"""
+    meme_date = datetime(2024, 1, 1)
+    with app.app_context():
+        db.session.execute(insert(Candidat), [
+            {"id": i, "nom": f"Candidat {i}", "email": f"c{i}@exemple.fr", "bio": "Développeur Python",
+             "diplome": "Master", "date_inscription": meme_date, "updated_at": meme_date}
+            for i in range(1, 11)
+        ])
+        db.session.commit()
+
+    vus, _ = parcourir(client, '/api/candidates', 'candidats', 4)
+
+    assert [ligne["id"] for ligne in vus] == list(range(10, 0, -1))
+
+
+def test_ajout_entre_deux_pages(volume, client):
+    """Une ligne créée pendant le parcours ne décale pas les pages suivantes"""
+    volume(20)
+    premiere = client.get('/api/candidates?limit=5').get_json()
+    client.post('/api/candidates', json={
+        "nom": "Nouveau Candidat", "email": "nouveau@exemple.fr",
+        "bio": "Développeur Python depuis deux ans", "diplome": "Licence"
+    })
+
+    seconde = client.get(f"/api/candidates?limit=5&cursor={premiere['next_cursor']}").get_json()
+
+    assert [ligne["id"] for ligne in seconde["candidats"]] == [15, 14, 13, 12, 11]
+
+
+def test_limites_et_total(volume, client, monkeypatch):
+    volume(20)
+    monkeypatch.setattr(Config, 'API_MAX_PAGE_SIZE', 8)
+
+    corps = client.get('/api/candidates?limit=500&total=true').get_json()
+    assert corps["limit"] == 8 and len(corps["candidats"]) == 8
+    assert corps["total"] == 20
+    assert "total" not in client.get('/api/candidates').get_json()
+
+    for parametres in ('limit=0', 'limit=abc', 'cursor=xyz'):
+        assert client.get(f'/api/candidates?{parametres}').status_code == 400
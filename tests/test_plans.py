@@ -0,0 +1,108 @@
+"""
+Plans d'exécution des routes de lecture sur une base créée par les migrations
+
+Chaque SELECT émis par une route passe par EXPLAIN QUERY PLAN (SQLite) ;
+le test échoue si une requête parcourt une table, ou tout un index sans
+que la pagination ne l'arrête. Les exports et imports en masse, qui lisent
+volontairement toute une table, ne sont pas vérifiés.
+"""
+import os
+import re
+import pytest
+from sqlalchemy import event
+from tests.conftest import ajouter_donnees
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CANDIDATS = 2000
+
+# Routes vérifiées ({offre}, {candidat} remplacés par des identifiants existants)
+ROUTES = [
+    ('GET', '/api/candidates'),
+    ('GET', '/api/candidates?limit=20&fields=id,nom'),
+    ('GET', '/api/candidates/{candidat}'),
+    ('GET', '/api/candidates/search?q=python'),
+    ('GET', '/api/candidates/{candidat}/recommended-offers'),
+    ('GET', '/api/offers'),
+    ('GET', '/api/offers?limit=20&fields=id,titre'),
+    ('GET', '/api/offers/{offre}'),
+    ('GET', '/api/offers/{offre}/candidates'),
+    ('GET', '/api/offers/{offre}/candidates?tri=score'),
+    ('GET', '/api/offers/{offre}/suggested-candidates'),
+    ('GET', '/api/offers/{offre}/stats?depuis=2024-01-01&jusqu_a=2024-01-31'),
+    ('POST', '/api/offers/{offre}/rank-candidates'),
+]
+
+SCAN_RE = re.compile(r'^SCAN (\w+)')
+LIMIT_RE = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+
+
+def scans_complets(connexion, requete, parametres):
+    """
+    Parcours complets d'après EXPLAIN QUERY PLAN
+
+    - SCAN <table>, avec ou sans index (même couvrant) : refusé, sauf si
+      l'index donne l'ordre d'une requête avec LIMIT (pagination, arrêt
+      après la page) sans tri temporaire
+    - tables virtuelles FTS5 (MATCH) et SCAN CONSTANT ROW (SELECT sans FROM) : acceptés
+    """
+    plan = connexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {requete}", parametres).fetchall()
+    details = [ligne[-1] for ligne in plan]
+    borne = LIMIT_RE.search(requete) is not None and not any('TEMP B-TREE' in d for d in details)
+
+    scans = []
+    for detail in details:
+        if not SCAN_RE.match(detail) or 'VIRTUAL TABLE' in detail or detail == 'SCAN CONSTANT ROW':
+            continue
+        if 'INDEX' in detail and borne:
+            continue
+        scans.append(detail)
+    return plan, scans
+
+
+@pytest.fixture(scope='module')
+def app_migree(tmp_path_factory):
+    """Schéma créé par alembic upgrade head (sans create_all), puis données"""
+    from alembic import command
+    from alembic.config import Config as AlembicConfig
+    from app import create_app
+    from models import db
+
+    url = f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    alembic_cfg = AlembicConfig(os.path.join(RACINE, 'alembic.ini'))
+    alembic_cfg.attributes['url'] = url
+    command.upgrade(alembic_cfg, 'head')
+
+    application = create_app({"SQLALCHEMY_DATABASE_URI": url, "DB_AUTO_CREATE": False, "TESTING": True})
+    with application.app_context():
+        ajouter_donnees(1, CANDIDATS + 1)
+    yield application
+    with application.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.mark.parametrize('methode,route', ROUTES)
+def test_aucun_parcours_complet(app_migree, methode, route):
+    from models import db
+
+    with app_migree.app_context():
+        engine = db.engine
+    requetes = []
+
+    def capturer(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')) and not executemany:
+            requetes.append((statement, parameters))
+
+    url = route.format(offre=CANDIDATS // 20, candidat=CANDIDATS // 2)
+    event.listen(engine, 'before_cursor_execute', capturer)
+    try:
+        reponse = app_migree.test_client().open(url, method=methode, json={} if methode == 'POST' else None)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capturer)
+
+    assert reponse.status_code < 400
+    assert requetes
+    with engine.connect() as connexion:
+        for requete, parametres in requetes:
+            plan, scans = scans_complets(connexion, requete, parametres)
+            assert not scans, f"{' '.join(requete.split())}\n" + "\n".join(ligne[-1] for ligne in plan)
@@ -0,0 +1,104 @@
+import pytest
+from flask import jsonify, request
+from sqlalchemy import text
+from models import db
+from services.tfidf_engine import TfidfEngine, obtenir_moteur, reconstruire_moteur
+from services.utils.query_budget import BudgetRequetesDepasse, budget_requetes, hors_budget, passer_en_asynchrone
+
+N = 50
+
+# Routes contrôlées ({candidat} : identifiant présent dès N ; offre 1 : un candidat sur deux y postule)
+ROUTES = [
+    ('GET', '/api/candidates', None),
+    ('GET', '/api/candidates?total=1&limit=100', None),
+    ('GET', '/api/candidates/{candidat}', None),
+    ('GET', '/api/candidates/search?q=python&limit=50', None),
+    ('GET', '/api/candidates/{candidat}/recommended-offers', None),
+    ('GET', '/api/offers', None),
+    ('GET', '/api/offers?total=1&limit=100', None),
+    ('GET', '/api/offers/1', None),
+    ('GET', '/api/offers/1/candidates', None),
+    ('GET', '/api/offers/1/candidates?tri=score&fields=id,nom,score', None),
+    ('GET', '/api/offers/1/suggested-candidates?limit=50', None),
+    ('GET', '/api/offers/1/similar-candidates?limit=50', None),
+    ('GET', '/api/offers/stats', None),
+    ('GET', '/api/offers/1/stats', None),
+    ('POST', '/api/offers/1/analyze-match', {"candidat_id": 1}),
+    ('POST', '/api/offers/1/analyze-batch', {"candidat_ids": list(range(1, 21))}),
+    ('POST', '/api/offers/1/rank-candidates', {"top": 20}),
+]
+
+
+@pytest.mark.parametrize('methode,chemin,corps', ROUTES)
+def test_requetes_independantes_du_volume(app, volume, compter, moteur, methode, chemin, corps):
+    """Même nombre d'instructions SQL à N et 10N, dans le budget de la route (mode raise)"""
+    url = chemin.format(candidat=N // 2)
+
+    volume(N)
+    if TfidfEngine.disponible():
+        with app.app_context():
+            obtenir_moteur()
+    requetes_n, reponse_n = compter(methode, url, corps)
+
+    volume(10 * N)
+    if TfidfEngine.disponible():
+        with app.app_context():
+            reconstruire_moteur()
+    requetes_10n, reponse_10n = compter(methode, url, corps)
+
+    assert reponse_n.status_code < 400 and reponse_10n.status_code < 400
+    assert requetes_n == requetes_10n
+
+
+@pytest.fixture
+def app_budget(app):
+    """Routes de contrôle du garde-fou, ajoutées avant la première requête"""
+    @app.route('/test/budget/<int:n>')
+    @budget_requetes(2)
+    def requetes_budget(n):
+        for _ in range(n):
+            db.session.execute(text("SELECT 1"))
+        return jsonify({"success": True})
+
+    @app.route('/test/hors-budget')
+    @budget_requetes(1)
+    def requetes_hors_budget():
+        db.session.execute(text("SELECT 1"))
+        with hors_budget():
+            for _ in range(5):
+                db.session.execute(text("SELECT 1"))
+        return jsonify({"success": True})
+
+    @app.route('/test/asynchrone/<int:n>')
+    @budget_requetes(1, asynchrone=3)
+    def requetes_asynchrone(n):
+        if request.args.get('async'):
+            passer_en_asynchrone()
+        for _ in range(n):
+            db.session.execute(text("SELECT 1"))
+        return jsonify({"success": True})
+
+    return app
+
+
+def test_mode_raise_depassement(app_budget):
+    client = app_budget.test_client()
+
+    assert client.get('/test/budget/2').status_code == 200
+    with pytest.raises(BudgetRequetesDepasse, match="3 instructions SQL pour un budget de 2"):
+        client.get('/test/budget/3')
+
+
+def test_hors_budget_non_compte(app_budget):
+    assert app_budget.test_client().get('/test/hors-budget').status_code == 200
+
+
+def test_budget_asynchrone_distinct(app_budget):
+    client = app_budget.test_client()
+
+    assert client.get('/test/asynchrone/3?async=1').status_code == 200
+    with pytest.raises(BudgetRequetesDepasse, match="4 instructions SQL pour un budget de 3"):
+        client.get('/test/asynchrone/4?async=1')
+    # Chemin synchrone : budget de la route, pas celui de la mise en file
+    with pytest.raises(BudgetRequetesDepasse, match="2 instructions SQL pour un budget de 1"):
+        client.get('/test/asynchrone/2')
@@ -0,0 +1,24 @@
+from services.search_service import SearchService
+
+
+def test_recherche_plein_texte(volume, client):
+    volume(50)
+    corps = client.get('/api/candidates/search?q=docker&limit=100&fields=id,bio').get_json()
+
+    assert corps["success"] is True
+    assert corps["total"] == len(corps["candidats"]) > 0
+    assert all('docker' in candidat["bio"].lower() for candidat in corps["candidats"])
+
+
+def test_repli_ilike_meme_resultat_que_le_plein_texte(app, volume):
+    volume(50)
+    with app.app_context():
+        ids_fts, total_fts = SearchService._rechercher_sqlite('Docker SQL', 100, 1)
+        ids_ilike, total_ilike = SearchService._rechercher_ilike('Docker SQL', 100, 1)
+        page_2, _ = SearchService._rechercher_ilike('Docker SQL', 5, 2)
+
+        assert total_ilike == total_fts > 0
+        assert ids_ilike == sorted(ids_fts)
+        assert page_2 == ids_ilike[5:10]
+        # % et _ sont cherchés littéralement
+        assert SearchService._rechercher_ilike('100%', 100, 1) == ([], 0)
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import inspect, text
+from models import db
+from services.seed_service import SeedService
+
+
+def etat_index(app):
+    """(index secondaires par table, table FTS5 présente)"""
+    with app.app_context():
+        inspecteur = inspect(db.engine)
+        index = {
+            table: sorted(ix["name"] for ix in inspecteur.get_indexes(table) if not ix["unique"])
+            for table in ('candidats', 'offres_emploi', 'candidatures')
+        }
+        fts = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidats_fts'"
+        )).scalar() is not None
+    return index, fts
+
+
+def test_chargement(app):
+    avant = etat_index(app)
+
+    with app.app_context():
+        stats = SeedService.peupler(200, 20, index=False)
+
+    assert stats["lignes"]["candidats"] == 200
+    assert stats["lignes"]["offres_emploi"] == 20
+    assert etat_index(app) == avant
+
+
+def test_index_recrees_apres_echec(app, monkeypatch):
+    avant = etat_index(app)
+    inserer = SeedService.inserer
+
+    def inserer_puis_echouer(connexion, table, *args):
+        if table == 'candidatures':
+            raise RuntimeError("Disque plein")
+        return inserer(connexion, table, *args)
+
+    monkeypatch.setattr(SeedService, 'inserer', staticmethod(inserer_puis_echouer))
+    with app.app_context(), pytest.raises(RuntimeError):
+        SeedService.peupler(200, 20, index=False)
+
+    assert etat_index(app) == avant
+    assert all(avant[0].values()) and avant[1]
+    with app.app_context():
+        # Lignes du chargement interrompu annulées
+        assert db.session.execute(text("SELECT count(*) FROM candidats")).scalar() == 0
@@ -0,0 +1,149 @@
+import time
+from sqlalchemy import select
+from models import db
+from models.offre_emploi import OffreEmploi
+from models.competence import Competence, CandidatCompetence, OffreCompetence
+from services.skill_index_service import SkillIndexService
+from services.utils.query_budget import compter_requetes
+from tests.conftest import ajouter_donnees
+
+ECRITURES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def index_candidats(app):
+    with app.app_context():
+        return set(db.session.execute(select(CandidatCompetence.terme, CandidatCompetence.candidat_id)).all())
+
+
+def test_suggestions_en_lecture_seule(app, volume, client):
+    volume(50)
+    with app.app_context():
+        # Compétence écrite hors API, donc absente du vocabulaire : elle ne couvre personne
+        db.session.execute(OffreEmploi.__table__.update().where(OffreEmploi.id == 2).values(competences=["Cobol"]))
+        db.session.commit()
+        engine = db.engine
+
+    with compter_requetes(engine) as requetes:
+        reponse = client.get('/api/offers/2/suggested-candidates')
+
+    assert reponse.status_code == 200
+    assert reponse.get_json()["candidats"] == []
+    assert not [r for r in requetes if r.lstrip().upper().startswith(ECRITURES)]
+
+
+def en_attente(app):
+    with app.app_context():
+        return set(db.session.execute(select(Competence.terme).where(~Competence.retro_indexe)).scalars())
+
+
+def retro_indexer(app):
+    with app.app_context():
+        return SkillIndexService.retro_indexer_en_attente()
+
+
+def test_nouvelle_competence_retro_indexee_hors_requete(app, volume, client):
+    volume(50)
+    avant = index_candidats(app)
+
+    reponse = client.post('/api/offers', json={
+        "titre": "Ingénieur Plateforme", "description": "Plateforme interne et outillage",
+        "competences": ["ans"], "salaire": 500000
+    })
+    assert reponse.status_code == 201, reponse.get_json()
+    offre_id = reponse.get_json()["offre"]["id"]
+
+    # La requête enregistre le terme sans parcourir les bios
+    assert index_candidats(app) == avant
+    assert en_attente(app) == {'ans'}
+
+    assert retro_indexer(app) == 1
+    assert en_attente(app) == set()
+    nouveaux = index_candidats(app) - avant
+    assert {terme for terme, _ in nouveaux} == {'ans'}
+    assert len(nouveaux) == 50
+
+    reponse = client.get(f'/api/offers/{offre_id}/suggested-candidates?limit=100').get_json()
+    assert len(reponse["candidats"]) == 50
+    assert retro_indexer(app) == 0
+
+
+def test_nouvelle_competence_retro_indexee_a_la_modification(app, volume, client):
+    volume(50)
+    avant = index_candidats(app)
+
+    client.put('/api/offers/3', json={"titre": "Ingénieur Plateforme", "competences": ["ans"]})
+    assert index_candidats(app) == avant
+    retro_indexer(app)
+
+    nouveaux = index_candidats(app) - avant
+    assert {terme for terme, _ in nouveaux} == {'ans'}
+    assert len(nouveaux) == 50
+
+    reponse = client.get('/api/offers/3/suggested-candidates?limit=100').get_json()
+    assert len(reponse["candidats"]) == 50
+
+
+def test_mots_du_titre_hors_du_vocabulaire_des_bios(app, volume, client):
+    volume(50)
+    avant = index_candidats(app)
+
+    # "Développeur" figure dans toutes les bios : un mot de titre ne doit rien rétro-indexer
+    reponse = client.post('/api/offers', json={
+        "titre": "Développeur Confirmé", "description": "Poste de développeur back-end", "competences": ["Python"], "salaire": 400000
+    })
+    assert reponse.status_code == 201, reponse.get_json()
+
+    assert index_candidats(app) == avant
+    with app.app_context():
+        vocabulaire = dict(db.session.execute(select(Competence.terme, Competence.indexe_bios)).all())
+    assert vocabulaire['développeur'] is False
+    assert vocabulaire['python'] is True
+
+    # Devenu compétence d'une offre, le mot est rétro-indexé
+    client.put('/api/offers/1', json={"competences": ["Développeur"]})
+    assert en_attente(app) == {'développeur'}
+    retro_indexer(app)
+    assert len(index_candidats(app) - avant) == 50
+
+
+def test_thread_de_retro_indexation(tmp_path):
+    """SKILL_RETRO_INDEX_THREAD : le thread du processus traite la compétence après la réponse"""
+    from app import create_app
+
+    application = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'thread.db'}",
+        "TESTING": True,
+        "SKILL_RETRO_INDEX_THREAD": True
+    })
+    client = application.test_client()
+    with application.app_context():
+        ajouter_donnees(1, 51)
+
+    client.put('/api/offers/2', json={"competences": ["ans"]})
+
+    for _ in range(100):
+        if not en_attente(application):
+            break
+        time.sleep(0.05)
+    assert en_attente(application) == set()
+    with application.app_context():
+        couverts = db.session.query(CandidatCompetence).filter(CandidatCompetence.terme == 'ans').count()
+    assert couverts == 50
+
+
+def test_reconstruction_identique_a_l_index_incremental(app, volume):
+    volume(50)
+    with app.app_context():
+        offres_avant = set(db.session.execute(select(OffreCompetence.terme, OffreCompetence.offre_id)).all())
+        candidats_avant = set(db.session.execute(select(CandidatCompetence.terme, CandidatCompetence.candidat_id)).all())
+
+        db.session.execute(CandidatCompetence.__table__.delete())
+        db.session.execute(OffreCompetence.__table__.delete())
+        db.session.commit()
+
+        offres, candidats = SkillIndexService.reconstruire(db.session.connection())
+        db.session.commit()
+
+        assert (offres, candidats) == (5, 50)
+        assert set(db.session.execute(select(OffreCompetence.terme, OffreCompetence.offre_id)).all()) == offres_avant
+        assert set(db.session.execute(select(CandidatCompetence.terme, CandidatCompetence.candidat_id)).all()) == candidats_avant
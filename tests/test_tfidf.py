@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, update
+from config import Config
+from models import db
+from models.candidat import Candidat
+from services.ai_service import AIService
+from services.tfidf_engine import obtenir_moteur, tfidf_engine
+
+
+def ecrire_ailleurs(app):
+    """Écritures d'un autre worker : ni notifier_candidats ni notifier_suppression"""
+    with app.app_context():
+        db.session.execute(update(Candidat).where(Candidat.id == 1).values(
+            bio="Kubernetes Kubernetes", updated_at=datetime.utcnow()
+        ))
+        db.session.execute(delete(Candidat).where(Candidat.id == 2))
+        db.session.commit()
+
+
+def similaires(client):
+    corps = client.get('/api/offers/2/similar-candidates?limit=100').get_json()
+    return [candidat["id"] for candidat in corps["candidats"]]
+
+
+def test_chargement_rattrape_modifications_et_suppressions(app, volume, client, moteur):
+    volume(50)
+    with app.app_context():
+        obtenir_moteur()
+    ecrire_ailleurs(app)
+
+    # Redémarrage : le fichier sauvegardé est rechargé puis synchronisé avec la base
+    tfidf_engine.__init__()
+    with app.app_context():
+        obtenir_moteur()
+    client.put('/api/offers/2', json={"titre": "Kubernetes", "description": "Kubernetes", "competences": ["Kubernetes"]})
+
+    assert 2 not in tfidf_engine.ids_indexes()
+    assert similaires(client)[0] == 1
+
+
+def test_synchronisation_periodique_des_autres_workers(app, volume, client, moteur):
+    volume(50)
+    with app.app_context():
+        obtenir_moteur()
+    ecrire_ailleurs(app)
+    client.put('/api/offers/2', json={"titre": "Kubernetes", "description": "Kubernetes", "competences": ["Kubernetes"]})
+
+    # Avant l'échéance, la matrice reste en l'état
+    assert 2 in tfidf_engine.ids_indexes()
+
+    tfidf_engine.date_synchro -= timedelta(seconds=Config.TFIDF_SYNC_INTERVAL)
+    assert similaires(client)[0] == 1
+    assert 2 not in tfidf_engine.ids_indexes()
+
+
+def test_analyse_par_lot_en_un_seul_produit(app, volume, client, moteur, monkeypatch):
+    volume(50)
+    appels = []
+    analyses_tfidf = AIService._analyses_tfidf
+    monkeypatch.setattr(AIService, '_analyses_tfidf', staticmethod(
+        lambda offre, candidats: appels.append(len(candidats)) or analyses_tfidf(offre, candidats)
+    ))
+
+    corps = {"candidat_ids": list(range(1, 21)), "moteur": "tfidf"}
+    reponse = client.post('/api/offers/1/analyze-batch', json=corps)
+    assert reponse.status_code == 200
+    assert appels == [20]
+
+    # Deuxième appel : tout vient du cache
+    client.post('/api/offers/1/analyze-batch', json={**corps, "candidat_ids": list(range(1, 31))})
+    assert appels == [20, 10]